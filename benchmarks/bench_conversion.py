@@ -0,0 +1,52 @@
+import neonpandas as npd
+from benchmarks import generators
+
+## Conversion of frames into upload parameters (records & APOC rows). -----
+
+
+class ConvertToRecords:
+    params = (generators.SIZES, list(generators.PROPERTY_SHAPES))
+    param_names = ['rows', 'properties']
+    timeout = 600
+
+    def setup(self, n, properties):
+        generators.check_size(n)
+        self.df = generators.make_frame(n, properties)
+
+    def time_convert_to_records(self, n, properties):
+        npd.convert_to_records(self.df)
+
+    def peakmem_convert_to_records(self, n, properties):
+        npd.convert_to_records(self.df)
+
+
+class ConvertNodesToApoc:
+    params = (generators.SIZES, list(generators.LABEL_SHAPES), ['narrow', 'mixed'])
+    param_names = ['rows', 'labels', 'properties']
+    timeout = 600
+
+    def setup(self, n, labels, properties):
+        generators.check_size(n)
+        self.nf = generators.make_nodeframe(n, labels, properties)
+
+    def time_convert_nodes_to_apoc(self, n, labels, properties):
+        npd.convert_nodes_to_apoc(self.nf)
+
+    def peakmem_convert_nodes_to_apoc(self, n, labels, properties):
+        npd.convert_nodes_to_apoc(self.nf)
+
+
+class ConvertEdgesToApoc:
+    params = (generators.SIZES, ['narrow', 'mixed'])
+    param_names = ['rows', 'properties']
+    timeout = 600
+
+    def setup(self, n, properties):
+        generators.check_size(n)
+        self.ef = generators.make_edgeframe(n, properties=properties)
+
+    def time_convert_edges_to_apoc(self, n, properties):
+        npd.convert_edges_to_apoc(self.ef)
+
+    def peakmem_convert_edges_to_apoc(self, n, properties):
+        npd.convert_edges_to_apoc(self.ef)
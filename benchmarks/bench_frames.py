@@ -0,0 +1,77 @@
+import neonpandas as npd
+from neonpandas.frames import styling
+from benchmarks import generators
+
+## Building & transforming NodeFrames / EdgeFrames, and styling. -----
+
+
+class NodeFrameSetLabels:
+    params = (generators.SIZES, list(generators.LABEL_SHAPES))
+    param_names = ['rows', 'labels']
+    timeout = 600
+
+    def setup(self, n, labels):
+        generators.check_size(n)
+        self.df = generators.make_frame(n, 'narrow')
+        self.df['kind'] = generators.make_labels(n, labels)
+
+    def time_set_labels(self, n, labels):
+        npd.NodeFrame(self.df, lbl_col='kind', labels={'Node'})
+
+    def peakmem_set_labels(self, n, labels):
+        npd.NodeFrame(self.df, lbl_col='kind', labels={'Node'})
+
+
+class EdgeFrameSetNodeColumns:
+    params = (generators.SIZES, list(generators.LABEL_SHAPES))
+    param_names = ['rows', 'labels']
+    timeout = 600
+
+    def setup(self, n, labels):
+        generators.check_size(n)
+        self.data = generators.make_edge_data(n, labels=labels)
+
+    def time_set_node_columns(self, n, labels):
+        npd.EdgeFrame(self.data, rel_col='rel', start_id='id', end_id='id',
+                      start_lbl_col='start_kind', end_lbl_col='end_kind')
+
+    def peakmem_set_node_columns(self, n, labels):
+        npd.EdgeFrame(self.data, rel_col='rel', start_id='id', end_id='id',
+                      start_lbl_col='start_kind', end_lbl_col='end_kind')
+
+
+class EdgeFrameToNodeFrame:
+    params = (generators.SIZES, [0.25, 1.0])
+    param_names = ['rows', 'nodes_per_edge']
+    timeout = 600
+
+    def setup(self, n, nodes_per_edge):
+        generators.check_size(n)
+        self.ef = generators.make_edgeframe(n, num_nodes=max(int(n * nodes_per_edge), 1))
+
+    def time_to_nodeframe(self, n, nodes_per_edge):
+        self.ef.to_nodeframe()
+
+    def peakmem_to_nodeframe(self, n, nodes_per_edge):
+        self.ef.to_nodeframe()
+
+
+class Styling:
+    # styling works on displayed rows, but label colors are ranked over the column
+    params = (generators.SIZES, list(generators.LABEL_SHAPES))
+    param_names = ['rows', 'labels']
+    timeout = 600
+
+    def setup(self, n, labels):
+        generators.check_size(n)
+        self.nf = generators.make_nodeframe(n, labels, 'narrow')
+        self.ef = generators.make_edgeframe(n, labels=labels)
+
+    def time_get_label_colors(self, n, labels):
+        styling.get_label_colors(self.nf['labels'])
+
+    def time_color_edgeframe_nodes(self, n, labels):
+        styling.color_edgeframe_nodes(self.ef[self.ef.start_col])
+
+    def time_style_node_labels(self, n, labels):
+        styling.style_node_labels(self.nf['labels'])
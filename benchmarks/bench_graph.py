@@ -0,0 +1,91 @@
+import asyncio
+import neonpandas as npd
+from benchmarks import generators
+from benchmarks.fake_driver import FakeDriver, AsyncFakeDriver
+
+## Full upload paths of `Graph` & `AsyncGraph` against the in-process fake
+## driver: conversion, batching, statement generation & transaction
+## handling, without network or database time. -----
+
+GRAPH_SIZES = generators.SIZES[:3]
+
+
+def fake_graph(driver:FakeDriver, **kwargs) -> npd.Graph:
+    return npd.Graph('bolt://localhost:7687', None, driver=driver, **kwargs)
+
+
+class GraphCreateNodes:
+    params = (GRAPH_SIZES, ['apoc', 'cypher'], [1, 4])
+    param_names = ['rows', 'engine', 'workers']
+    timeout = 600
+
+    def setup(self, n, engine, workers):
+        generators.check_size(n)
+        self.nf = generators.make_nodeframe(n, 'few', 'mixed')
+        self.driver = FakeDriver(measure=False)
+        self.graph = fake_graph(self.driver)
+
+    def time_create_nodes(self, n, engine, workers):
+        self.graph.create_nodes(self.nf, engine=engine, workers=workers, create_indexes=False)
+
+    def peakmem_create_nodes(self, n, engine, workers):
+        self.graph.create_nodes(self.nf, engine=engine, workers=workers, create_indexes=False)
+
+
+class GraphCreateEdges:
+    params = (GRAPH_SIZES, [False, True], [1, 4])
+    param_names = ['rows', 'two_phase', 'workers']
+    timeout = 600
+
+    def setup(self, n, two_phase, workers):
+        generators.check_size(n)
+        self.ef = generators.make_edgeframe(n)
+        self.driver = FakeDriver(measure=False)
+        self.graph = fake_graph(self.driver)
+
+    def time_create_edges(self, n, two_phase, workers):
+        self.graph.create_edges(self.ef, two_phase=two_phase, workers=workers, create_indexes=False)
+
+    def peakmem_create_edges(self, n, two_phase, workers):
+        self.graph.create_edges(self.ef, two_phase=two_phase, workers=workers, create_indexes=False)
+
+
+class AsyncGraphCreateNodes:
+    params = (GRAPH_SIZES, [1, 4])
+    param_names = ['rows', 'concurrency']
+    timeout = 600
+
+    def setup(self, n, concurrency):
+        generators.check_size(n)
+        self.nf = generators.make_nodeframe(n, 'few', 'mixed')
+
+    def time_create_nodes(self, n, concurrency):
+        asyncio.run(self._create_nodes(concurrency))
+
+    async def _create_nodes(self, concurrency):
+        graph = npd.AsyncGraph('bolt://localhost:7687', None, concurrency=concurrency,
+                               driver=AsyncFakeDriver(FakeDriver(measure=False)))
+        await graph.create_nodes(self.nf, create_indexes=False)
+
+
+class UploadPayload:
+    """Statements & bytes sent per upload (tracked, not timed)."""
+    params = (GRAPH_SIZES[:2], ['apoc', 'cypher', 'columnar'])
+    param_names = ['rows', 'engine']
+
+    def setup(self, n, engine):
+        self.nf = generators.make_nodeframe(n, 'few', 'mixed')
+
+    def _upload(self, engine) -> FakeDriver:
+        driver = FakeDriver()
+        fake_graph(driver).create_nodes(self.nf, engine=engine, create_indexes=False)
+        return driver
+
+    def track_payload_bytes(self, n, engine):
+        return self._upload(engine).payload_size
+    track_payload_bytes.unit = 'bytes'
+
+    def track_query_count(self, n, engine):
+        return self._upload(engine).query_count
+    track_query_count.unit = 'queries'
+
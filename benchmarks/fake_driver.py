@@ -0,0 +1,225 @@
+import threading
+from neo4j import SummaryCounters
+from neonpandas.utils.metrics_tools import payload_size
+
+#### In-process stand-in for the neo4j driver ####
+## Implements the part of the driver interface `Graph` & `AsyncGraph` use
+## (sessions, managed transactions, `run`, results & summaries) without a
+## database. Every statement is recorded with its row count and estimated
+## Bolt payload size, so upload paths can be timed & profiled offline.
+## Transactions are never committed or rolled back; nothing is stored.
+
+
+## Statements -----
+def statement_rows(params:dict) -> int:
+    """Rows sent with a statement: length of its longest list parameter
+    (or list in a map parameter, as in columnar payloads)."""
+    rows = 0
+    for v in params.values():
+        if isinstance(v, dict):
+            rows = max(rows, statement_rows(v))
+        elif isinstance(v, list):
+            rows = max(rows, len(v))
+    return rows
+
+
+## Driver objects -----
+class FakeStatement:
+    """A statement run on the fake driver."""
+    def __init__(self, query:str, params:dict, rows:int, size:int):
+        self.query = query
+        self.params = params
+        self.rows = rows
+        self.size = size
+
+    def __repr__(self):
+        return '<FakeStatement {} rows, {} bytes>'.format(self.rows, self.size)
+
+
+class FakeResult:
+    """Result & summary in one: `consume()` returns the result itself."""
+    # server timings (ms); the fake server takes no time
+    result_available_after = 0
+    result_consumed_after = 0
+
+    def __init__(self, records:list, counters:dict, profile:dict=None):
+        self.records = records
+        self.counters = SummaryCounters(counters)
+        self.profile = profile
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def fetch(self, n:int) -> list:
+        records, self.records = self.records[:n], self.records[n:]
+        return records
+
+    def keys(self) -> list:
+        return (list(self.records[0].keys()) if self.records else [])
+
+    def consume(self):
+        self.records = []
+        return self
+
+
+class FakeTransaction:
+    def __init__(self, driver:'FakeDriver'):
+        self.driver = driver
+
+    def run(self, query:str, params:dict=None, **kwargs):
+        return self.driver._run(query, {**(params or {}), **kwargs})
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, driver:'FakeDriver', **config):
+        self.driver = driver
+        self.config = config
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def run(self, query:str, params:dict=None, **kwargs):
+        return self.driver._run(query, {**(params or {}), **kwargs})
+
+    def begin_transaction(self, **config) -> FakeTransaction:
+        return FakeTransaction(self.driver)
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(FakeTransaction(self.driver), *args, **kwargs)
+
+    def execute_read(self, work, *args, **kwargs):
+        return work(FakeTransaction(self.driver), *args, **kwargs)
+
+
+class FakeDriver:
+    """Records statements instead of sending them. `respond(query, params)`
+    may return the records of a statement (default: none); `counters(query,
+    rows)` its summary counters (default: one node created per row). With
+    `keep_params=False` only query counts & sizes are kept, so memory use
+    reflects the upload path rather than the recording."""
+    def __init__(self, respond=None, counters=None, keep_params:bool=False, measure:bool=True):
+        self.respond = respond
+        self.counters = counters
+        self.keep_params = keep_params
+        self.measure = measure
+        self.statements = []
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<FakeDriver {} statements, {} rows, {} bytes>'.format(
+            self.query_count, self.row_count, self.payload_size)
+
+    def session(self, **config) -> FakeSession:
+        with self._lock:
+            self.sessions += 1
+        return FakeSession(self, **config)
+
+    def close(self):
+        pass
+
+    def reset(self):
+        with self._lock:
+            self.statements = []
+            self.sessions = 0
+
+    def _run(self, query:str, params:dict) -> FakeResult:
+        rows = statement_rows(params)
+        size = (payload_size(query) + payload_size(params) if self.measure else 0)
+        with self._lock:
+            self.statements.append(FakeStatement(query, (params if self.keep_params else None), rows, size))
+        records = (self.respond(query, params) if self.respond is not None else None) or []
+        counters = (self.counters(query, rows) if self.counters is not None else {'nodes-created': rows})
+        # PROFILE gives a single-operator plan; the fake has no planner
+        profile = ({'operatorType': 'ProduceResults', 'rows': rows, 'dbHits': 0, 'children': []}
+                   if query.lstrip().upper().startswith('PROFILE') else None)
+        return FakeResult(list(records), counters, profile)
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def row_count(self) -> int:
+        return sum(s.rows for s in self.statements)
+
+    @property
+    def payload_size(self) -> int:
+        return sum(s.size for s in self.statements)
+
+    def query_counts(self) -> dict:
+        """Number of statements run per distinct query."""
+        counts = {}
+        for s in self.statements:
+            counts[s.query] = counts.get(s.query, 0) + 1
+        return counts
+
+
+## Awaitable wrappers around the fake driver -----
+class AsyncFakeResult:
+    def __init__(self, result):
+        self.result = result
+
+    def __aiter__(self):
+        return self._records()
+
+    async def _records(self):
+        for record in self.result:
+            yield record
+
+    async def consume(self):
+        return self.result.consume()
+
+
+class AsyncFakeTransaction:
+    def __init__(self, tx):
+        self.tx = tx
+
+    async def run(self, query, params=None, **kwargs):
+        return AsyncFakeResult(self.tx.run(query, params, **kwargs))
+
+
+class AsyncFakeSession:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.session.close()
+
+    async def run(self, query, params=None, **kwargs):
+        return AsyncFakeResult(self.session.run(query, params, **kwargs))
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await work(AsyncFakeTransaction(self.session), *args, **kwargs)
+
+    execute_read = execute_write
+
+
+class AsyncFakeDriver:
+    """Asyncio interface over a FakeDriver."""
+    def __init__(self, driver:'FakeDriver'):
+        self.driver = driver
+
+    def session(self, **config):
+        return AsyncFakeSession(self.driver.session(**config))
+
+    async def close(self):
+        pass
@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import pandas as pd
+import neonpandas as npd
+
+#### Synthetic NodeFrames & EdgeFrames for benchmarks ####
+## Frames are generated from a seeded random state, so every run of a
+## benchmark sees the same data. Sizes above NEONPANDAS_BENCH_MAX_ROWS
+## (default 1e7) are skipped, to keep quick local runs quick.
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+MAX_ROWS = int(float(os.environ.get('NEONPANDAS_BENCH_MAX_ROWS', 10 ** 7)))
+
+# label shapes: (number of distinct labels, labels per node)
+LABEL_SHAPES = {
+    'single': (1, 1),
+    'few': (4, 1),
+    'multi': (8, 3),
+}
+
+# property shapes: column name -> dtype kind
+PROPERTY_SHAPES = {
+    'narrow': {'value': 'float'},
+    'mixed': {'value': 'float', 'count': 'int', 'name': 'str', 'flag': 'bool'},
+    'temporal': {'value': 'float', 'created': 'datetime', 'elapsed': 'timedelta'},
+    'wide': {'p{}'.format(i): ('float' if i % 2 else 'int') for i in range(20)},
+}
+
+
+def check_size(n:int):
+    """Skips (raises NotImplementedError, asv's skip signal) sizes above
+    the configured maximum."""
+    if n > MAX_ROWS:
+        raise NotImplementedError("{} rows is above NEONPANDAS_BENCH_MAX_ROWS.".format(n))
+
+def make_labels(n:int, shape:str='few', seed:int=0) -> list:
+    """Label sets of `n` nodes."""
+    num_labels, per_node = LABEL_SHAPES[shape]
+    rng = np.random.default_rng(seed)
+    names = np.array(['Label{}'.format(i) for i in range(num_labels)], dtype=object)
+    if per_node == 1:
+        return [{lbl} for lbl in names[rng.integers(0, num_labels, n)]]
+    sets = [set(names[rng.choice(num_labels, per_node, replace=False)]) for _ in range(64)]
+    return [sets[i] for i in rng.integers(0, len(sets), n)]
+
+def make_properties(n:int, shape:str='mixed', seed:int=0) -> dict:
+    """Property columns of `n` rows."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, kind in PROPERTY_SHAPES[shape].items():
+        if kind == 'float':
+            columns[name] = rng.random(n)
+        elif kind == 'int':
+            columns[name] = rng.integers(0, 10 ** 6, n)
+        elif kind == 'str':
+            columns[name] = pd.Series(rng.integers(0, 10 ** 5, n)).map('name_{}'.format).to_numpy(dtype=object)
+        elif kind == 'bool':
+            columns[name] = rng.random(n) < 0.5
+        elif kind == 'datetime':
+            columns[name] = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10 ** 8, n), unit='s')
+        elif kind == 'timedelta':
+            columns[name] = pd.to_timedelta(rng.integers(0, 10 ** 6, n), unit='ms')
+    return columns
+
+def make_frame(n:int, properties:str='mixed', seed:int=0) -> pd.DataFrame:
+    """Plain DataFrame of `n` rows with an `id` column and property columns."""
+    data = {'id': np.arange(n)}
+    data.update(make_properties(n, properties, seed))
+    return pd.DataFrame(data)
+
+def make_nodeframe(n:int, labels:str='few', properties:str='mixed', seed:int=0) -> npd.NodeFrame:
+    """NodeFrame of `n` nodes with unique `id` keys."""
+    df = make_frame(n, properties, seed)
+    df['kind'] = make_labels(n, labels, seed)
+    return npd.NodeFrame(df, id_col='id', lbl_col='kind')
+
+def make_edge_data(n:int, num_nodes:int=None, labels:str='few', properties:str='narrow',
+                   rel_types:int=3, seed:int=0) -> pd.DataFrame:
+    """Plain DataFrame of `n` edges between `num_nodes` nodes (default n / 4),
+    with start/end key columns, label columns & a relationship type column."""
+    num_nodes = (max(n // 4, 1) if num_nodes is None else num_nodes)
+    rng = np.random.default_rng(seed)
+    num_labels = LABEL_SHAPES[labels][0]
+    node_labels = np.array(['Label{}'.format(i) for i in range(num_labels)], dtype=object)[np.arange(num_nodes) % num_labels]
+    start, end = rng.integers(0, num_nodes, n), rng.integers(0, num_nodes, n)
+    data = {'start': start, 'end': end,
+            'start_kind': node_labels[start], 'end_kind': node_labels[end],
+            'rel': np.array(['REL_{}'.format(i) for i in range(rel_types)], dtype=object)[rng.integers(0, rel_types, n)]}
+    data.update(make_properties(n, properties, seed + 1))
+    return pd.DataFrame(data)
+
+def make_edgeframe(n:int, num_nodes:int=None, labels:str='few', properties:str='narrow',
+                   rel_types:int=3, seed:int=0) -> npd.EdgeFrame:
+    """EdgeFrame of `n` edges with node columns keyed on `id`."""
+    data = make_edge_data(n, num_nodes, labels, properties, rel_types, seed)
+    return npd.EdgeFrame(data, rel_col='rel', start_id='id', end_id='id',
+                         start_lbl_col='start_kind', end_lbl_col='end_kind')
@@ -1,11 +1,18 @@
+import numpy as np
 import pandas as pd 
 from pandas import DataFrame
 from neonpandas.graph import node
 from neonpandas.utils import df_tools 
+from neonpandas.utils import io_tools
+from neonpandas.utils import admin_tools
 from neonpandas.frames import nodeframe
+from neonpandas.series import node_series
 from neonpandas.frames import styling
 
 class EdgeFrame(DataFrame):
+    # attributes carried over to slices (e.g. upload batches)
+    _metadata = ['rel_col', 'start_col', 'end_col', 'start_id', 'end_id']
+
     def __init__(self, data, rel_col:str=None, 
                 start_col:str='start', end_col:str='end', 
                 start_id:str=None, end_id:str=None,
@@ -29,8 +36,7 @@ class EdgeFrame(DataFrame):
         
         if any([labels, start_lbls, end_lbls, start_lbl_col, end_lbl_col]):
             # transform start & end columns (and any input label information)
-            # into Node columns. 
-            # TODO: These colums will be a defined Series type.
+            # into Node columns (NodeArray-backed).
             self.set_node_columns(labels, start_lbls, end_lbls, start_lbl_col, end_lbl_col)
 
     def show(self, num_rows:int=10):
@@ -70,12 +76,9 @@ class EdgeFrame(DataFrame):
 
         for _dir, _id, _dir_lbls, _dir_lbl_col, _idx  in edge_inputs:
             # check against labels inputs
-            if _dir_lbls is not None and labels is None:
-                _lbl_set = _dir_lbls 
-            elif labels is not None and _dir_lbls is None:
-                _lbl_set = labels 
-            else:
+            if _dir_lbls is not None and labels is not None:
                 raise ValueError("Do not provide input for both 'labels' & '{}'.".format(_dir))
+            _lbl_set = (_dir_lbls if _dir_lbls is not None else labels)
 
             # merge labels and set as column in edgeframe
             _lbls = df_tools.merge_labels(self, _dir_lbl_col, _lbl_set)
@@ -85,8 +88,8 @@ class EdgeFrame(DataFrame):
             else:
                 self[_dir_lbl_col] = _lbls
 
-            # transform id and labels columns into single node columns
-            self[_dir] = self.apply(lambda x: node.Node(x[_dir_lbl_col], _id, x[_dir], var=_dir[0]), axis=1)
+            # transform id and labels columns into single (columnar) node columns
+            self[_dir] = node_series.NodeArray.from_columns(self[_dir_lbl_col], _id, self[_dir], var=_dir[0])
             self.drop(columns=[_dir_lbl_col], inplace=True)
 
             ## keeping this here!!!
@@ -131,15 +134,71 @@ class EdgeFrame(DataFrame):
                 return False
         return True
 
-    def to_nodeframe(self, id_col:str='node', labels:set=None):
+    def to_admin_import(self, directory:str, prefix:str='relationships', chunksize:int=1000000,
+                        compress:bool=False, workers:int=4, include_nodes:bool=False, space:str=None):
+        """Writes the EdgeFrame as header & data files for the offline
+        `neo4j-admin database import` tool: `:START_ID`/`:END_ID` from the
+        endpoint keys (in the ID space of each endpoint's primary label,
+        or `space`)
+        and `:TYPE` from the relationship column. With `include_nodes`,
+        node files for the unique endpoints are written too. Returns an
+        AdminImport; `check()` verifies every endpoint's ID space has nodes."""
+        if not self.ready_for_upload():
+            raise ValueError("Edgeframe is not yet ready for upload to Neo4j Graph.")
+        files = admin_tools.write_relationships(self, directory, prefix=prefix, chunksize=chunksize,
+                                                compress=compress, workers=workers, space=space)
+        if include_nodes:
+            for i, nf in enumerate(self._endpoint_frames()):
+                files = files + nf.to_admin_import(directory, prefix='{}_nodes_{}'.format(prefix, i),
+                                                   chunksize=chunksize, compress=compress, workers=workers,
+                                                   space=space)
+        return files
+
+    def _endpoint_frames(self) -> list:
+        """Unique endpoint nodes as one NodeFrame per key name."""
+        nodes = self.to_nodeframe()
+        keys = [c for c in nodes.columns if c != 'labels']
+        return [nodeframe.NodeFrame(nodes.loc[nodes[key].notna(), ['labels', key]], id_col=key) for key in keys]
+
+    def node_arrays(self) -> tuple:
+        """Returns the (start, end) NodeArrays behind the node columns."""
+        return (node_series.NodeArray.coerce(self[self.start_col]),
+                node_series.NodeArray.coerce(self[self.end_col]))
+
+    def label_colors(self) -> dict:
+        """Label to display color map over start & end nodes, shared by
+        both node columns in `show`."""
+        counts = {}
+        for nodes in self.node_arrays():
+            codes = nodes.label_codes
+            sizes = np.bincount(codes[codes >= 0], minlength=len(nodes.label_sets))
+            for lbls, n in zip(nodes.label_sets, sizes.tolist()):
+                for lbl in lbls:
+                    counts[lbl] = counts.get(lbl, 0) + n
+        return styling.label_color_map(pd.Series(counts, dtype='int64'))
+
+    def to_nodeframe(self, id_col:str=None, labels:set=None):
         """Transforms pair-columned EdgeFrame into NodeFrame
-        containing all unique nodes found in start & end columns."""
-        edges_df = pd.DataFrame(self)
-        melted_edges = pd.melt(edges_df[[self.start_col, self.end_col]],
-                    var_name='direction', value_name=id_col).drop(columns=['direction'])
-        nodes = melted_edges.drop_duplicates(subset=[id_col]).reset_index(drop=True)
-        return NodeFrame(nodes, id_col=id_col, labels=labels)
+        containing all unique nodes found in start & end columns.
+        The NodeFrame has a labels column and one column per node key;
+        `id_col` renames the key column (when start & end share a key)."""
+        start, end = self.node_arrays()
+        nodes = node_series.NodeArray._concat_same_type([start, end]).unique()
+        data = nodes.to_frame()
+        keys = [c for c in data.columns if c != 'labels']
+        if id_col is not None and len(keys) == 1:
+            data = data.rename(columns={keys[0]: id_col})
+        else:
+            id_col = keys[0]
+        return nodeframe.NodeFrame(data, id_col=id_col, lbl_col='labels', labels=labels)
 
 def load_edgeframe(filepath:str, *args, **kwargs) -> EdgeFrame:
     data = pd.read_csv(filepath)
-    return EdgeFrame(data, *args, **kwargs)
\ No newline at end of file
+    return EdgeFrame(data, *args, **kwargs)
+
+def iter_edgeframes(filepath:str, chunksize:int=100000, start_chunk:int=0, file_format:str=None,
+                    read_kwargs:dict=None, *args, **kwargs):
+    """Reads a CSV or Parquet file in chunks of `chunksize` rows, yielding
+    one EdgeFrame per chunk (built with the given EdgeFrame arguments)."""
+    for chunk in io_tools.read_chunks(filepath, chunksize, start_chunk, file_format, **(read_kwargs or {})):
+        yield EdgeFrame(chunk, *args, **kwargs)
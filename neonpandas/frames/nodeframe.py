@@ -1,9 +1,20 @@
 import pandas as pd 
 from pandas import DataFrame
 from neonpandas.utils import df_tools 
+from neonpandas.utils import io_tools
+from neonpandas.utils import admin_tools
+from neonpandas.series.label_series import LabelArray, LabelDtype, LabelIndex
 from neonpandas.frames import styling
 
 class NodeFrame(DataFrame):
+    # attributes carried over to slices (e.g. upload batches)
+    _metadata = ['id_col']
+    # per-frame caches, not carried over to slices (their rows differ)
+    _internal_names = DataFrame._internal_names + ['_label_index', '_label_colors']
+    _internal_names_set = set(_internal_names)
+    _label_index = None
+    _label_colors = None
+
     def __init__(self, data, id_col:str=None, lbl_col:str=None, labels:set=None):
         super(NodeFrame, self).__init__(data)
 
@@ -34,28 +45,72 @@ class NodeFrame(DataFrame):
         return
     
     def set_labels(self, lbl_col:str=None, labels:set=None):
-        if lbl_col is not None and labels is None:
-            assert lbl_col in self.columns
-            _lbls = self[lbl_col].apply(lambda x: df_tools.conform_to_set(x))
-        elif lbl_col is not None and labels is not None:
-            assert lbl_col in self.columns
-            _lbls = self[lbl_col].apply(lambda x: df_tools.conform_to_set(labels).union(df_tools.conform_to_set(x)))
-        elif lbl_col is None and labels is not None:
-            labels = df_tools.conform_to_set(labels)
-            _lbls = [labels for i in range(len(self))]
-        else:
-            raise ValueError("Must provide either 'labels' or 'column' as input for attribute type.")
+        """Builds the `labels` column (a LabelArray of bitmask-encoded
+        label sets) from a column of labels and/or a fixed label set."""
+        _lbls = df_tools.merge_labels(self, lbl_col, labels)
         if lbl_col in self:
             self.drop(columns=[lbl_col], inplace=True)
         self.insert(0, 'labels', _lbls)
         return
 
+    ## Label index -----
+    def label_index(self, lbls_col:str='labels') -> LabelIndex:
+        """Inverted index of the labels column (row positions per label and
+        label set). Built on first use and rebuilt once the column changes."""
+        labels = LabelArray.coerce(self[lbls_col])
+        if self._label_index is None or not self._label_index.is_current(labels):
+            self._label_index = LabelIndex(labels)
+            self._label_colors = None
+        return self._label_index
+
+    def by_label(self, labels, lbls_col:str='labels') -> 'NodeFrame':
+        """Nodes carrying a label (or all of a set of labels), in row order."""
+        return self.iloc[self.label_index(lbls_col).positions(labels)]
+
+    def label_counts(self, lbls_col:str='labels') -> pd.Series:
+        """Number of nodes carrying each label."""
+        return self.label_index(lbls_col).label_counts()
+
+    def label_groups(self, lbls_col:str='labels') -> list:
+        """(sorted label tuple, NodeFrame) per distinct label set."""
+        return [(lbls, self.iloc[pos]) for lbls, pos in self.label_index(lbls_col).groups()]
+
+    def label_colors(self, lbls_col:str='labels') -> dict:
+        """Label to display color map used by `show`; the same for as long
+        as the labels column is unchanged."""
+        index = self.label_index(lbls_col)
+        if self._label_colors is None:
+            self._label_colors = styling.label_color_map(index.label_counts())
+        return self._label_colors
+
     def ready_for_upload(self) -> bool:
-        """Check if NodeFrame is ready for upload to Neo4j Graph."""
-        return (True if 'labels' in self else False)
+        """Check if NodeFrame is ready for upload to Neo4j Graph, i.e.
+        has a `labels` column of label sets (see `set_labels`)."""
+        return ('labels' in self and isinstance(self['labels'].dtype, LabelDtype))
+
+    def to_admin_import(self, directory:str, id_col:str=None, prefix:str='nodes',
+                        chunksize:int=1000000, compress:bool=False, workers:int=4, space:str=None):
+        """Writes the NodeFrame as header & data files for the offline
+        `neo4j-admin database import` tool, one group per label set with
+        the id column (default: `id_col`) as `:ID`, in the ID space of the
+        set's primary label (the one carried by most rows) or `space`, as
+        relationship endpoints refer to. Returns an AdminImport; its `command()` gives the
+        import command line (combine with an EdgeFrame's export using `+`)."""
+        if not self.ready_for_upload():
+            raise ValueError("Nodes DataFrame must contain a 'labels' column of label sets. Use NeonPandas preprocessing first.")
+        id_col = (getattr(self, 'id_col', None) if id_col is None else id_col)
+        return admin_tools.write_nodes(self, directory, id_col, prefix=prefix, chunksize=chunksize,
+                                       compress=compress, workers=workers, space=space)
 
 
 def load_nodeframe(filepath:str, *args, **kwargs) -> NodeFrame:
     """Read neonpandas NodeFrame from csv file."""
     df = pd.read_csv(filepath)
     return NodeFrame(df, *args, **kwargs)
+
+def iter_nodeframes(filepath:str, chunksize:int=100000, start_chunk:int=0, file_format:str=None,
+                    read_kwargs:dict=None, *args, **kwargs):
+    """Reads a CSV or Parquet file in chunks of `chunksize` rows, yielding
+    one NodeFrame per chunk (built with the given NodeFrame arguments)."""
+    for chunk in io_tools.read_chunks(filepath, chunksize, start_chunk, file_format, **(read_kwargs or {})):
+        yield NodeFrame(chunk, *args, **kwargs)
@@ -1,7 +1,9 @@
 import random
-from collections import Counter 
+import pandas as pd
 from neonpandas.frames.nodeframe import NodeFrame
 from neonpandas.frames.edgeframe import EdgeFrame
+from neonpandas.series.node_series import NodeArray
+from neonpandas.series.label_series import LabelArray
 
 ## Stylings for Node & Edge Frame classes. Provide
 ## visual aspects for exposing neonpandas conventions.
@@ -52,44 +54,62 @@ edgeframe_node_css = '''
 
 
 def style_nodeframe(nf:NodeFrame, num_rows:int=10):
-    """Main function for styling NodeFrame when printed."""
+    """Main function for styling NodeFrame when printed. Label colors come
+    from the whole frame (`NodeFrame.label_colors`), so they are the same
+    whichever rows are shown."""
     return nf.head(num_rows).style.apply(
-        style_node_labels, subset=['labels']
+        style_node_labels, subset=['labels'], color_map=nf.label_colors()
         ).set_caption(
             'NodeFrame'
         )
 
 def style_edgeframe(ef:EdgeFrame, num_rows:int=10):
-    """Main function for styling EdgeFrame when printed."""
-    return ef.head(num_rows).style.apply(
+    """Main function for styling EdgeFrame when printed. Start & end node
+    columns are colored by label, with one color map for both."""
+    styled = ef.head(num_rows).style.apply(
         style_rel_types, subset=ef.rel_col
-    ).set_caption(
+    )
+    if ef._has_formatted_nodes():
+        styled = styled.apply(color_edgeframe_nodes, subset=[ef.start_col, ef.end_col],
+                              color_map=ef.label_colors())
+    return styled.set_caption(
         'EdgeFrame'
     )
 
-def get_first_lbl(x:set, sorted_lbls):
-    lbl_orders = {lbl: sorted_lbls[lbl] for lbl in x}
-    return min(lbl_orders, key=lbl_orders.get)
-
-def get_label_colors(data):
-    print('!!! this is what the data to `get_label_colors()` looks like !!!!')
-    print(data)
-    print('----------------\n')
-    lbl_counts = Counter([i for sublist in data for i in sublist])
-    sorted_lbls = [k for k, v in sorted(lbl_counts.items(), key=lambda item: item[1])]
-    sorted_lbls = {sorted_lbls[i]: i for i in range(len(sorted_lbls))}
+def label_color_map(label_counts:pd.Series) -> dict:
+    """Maps each label to a Bolt color. Labels are ranked from least to
+    most frequent (ties by name), so rarer labels stand out and the map
+    does not depend on row order; the map's order is the ranking."""
+    counts = label_counts[label_counts > 0]
+    ranked = sorted(counts.index, key=lambda lbl: (counts[lbl], lbl))
     _colors = get_bolt_colors()
-    lbl_color_map = {lbl: _colors[i % len(_colors)] for i,lbl in enumerate(sorted_lbls.keys())}
-    lbl_colors = [lbl_color_map[get_first_lbl(x, sorted_lbls)] for x in data]
-    return lbl_colors
-
-def style_node_labels(data):
-    lbl_colors = get_label_colors(data)
+    return {lbl: _colors[i % len(_colors)] for i, lbl in enumerate(ranked)}
+
+def label_set_color(lbls, color_map:dict) -> str:
+    """Color of a label set: the color of its lowest ranked label."""
+    ranked = [lbl for lbl in color_map if lbl in lbls]
+    return (color_map[ranked[0]] if ranked else '')
+
+def get_label_colors(data, color_map:dict=None) -> list:
+    """Color per row of a labels column, looked up once per distinct label
+    set. Without `color_map`, one is built from the column itself."""
+    lbls = LabelArray.coerce(data)
+    if color_map is None:
+        color_map = label_color_map(lbls.label_counts())
+    codes, masks = pd.factorize(lbls.masks)
+    set_colors = [label_set_color(lbls.mask_to_set(m), color_map) for m in masks]
+    return [set_colors[c] for c in codes.tolist()]
+
+def style_node_labels(data, color_map:dict=None):
+    lbl_colors = get_label_colors(data, color_map)
     return [node_label_css.format(lbl_color=lbl_color) for lbl_color in lbl_colors]
 
 def style_rel_types(data, color:str='#A4AAB5'):
     return [rel_type_css.format(rel_color=color) for x in data]
 
-def color_edgeframe_nodes(data):
-    lbl_colors = get_label_colors([n.labels for n in data])
-    return [edgeframe_node_css.format(lbl_color=lbl_color) for lbl_color in lbl_colors]
+def color_edgeframe_nodes(data, color_map:dict=None):
+    nodes = NodeArray.coerce(data)
+    if color_map is None:
+        color_map = label_color_map(LabelArray.coerce(nodes.labels()).label_counts())
+    set_colors = [label_set_color(lbls, color_map) for lbls in nodes.label_sets] + ['']
+    return [edgeframe_node_css.format(lbl_color=set_colors[c]) for c in nodes.label_codes.tolist()]
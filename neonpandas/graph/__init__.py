@@ -1,3 +1,4 @@
 from .queries import *
 from .neo import *
 from .node import *
+from .async_neo import *
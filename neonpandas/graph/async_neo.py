@@ -0,0 +1,271 @@
+import time
+import asyncio
+import pandas as pd
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import TransientError
+from neonpandas.utils import df_tools
+from neonpandas.utils import batch_tools
+from neonpandas.utils import schema_tools
+from neonpandas.utils import metrics_tools
+from neonpandas.graph import queries
+from neonpandas.graph.neo import BaseGraph
+from neonpandas.frames.nodeframe import NodeFrame
+from neonpandas.frames.edgeframe import EdgeFrame
+
+## Asyncio version of `Graph`. Uploads keep up to `concurrency` batches in
+## flight, each on a session of its own, while the next batch of every lane
+## is converted in a worker thread, so conversion overlaps with writes and
+## the event loop is never blocked.
+
+
+class AsyncGraph(BaseGraph):
+    def __init__(self, uri:str, auth:tuple, encrypted:bool=False, statement_cache_size:int=256,
+                 concurrency:int=4, max_connection_pool_size:int=100,
+                 connection_acquisition_timeout:float=60.0, driver=None, metrics=None,
+                 measure_payload:bool=False, **config):
+        self.uri = uri
+        if driver is None:
+            driver = AsyncGraphDatabase.driver(uri=self.uri, auth=auth, encrypted=encrypted,
+                                               max_connection_pool_size=max_connection_pool_size,
+                                               connection_acquisition_timeout=connection_acquisition_timeout,
+                                               **config)
+        self.driver = driver
+        self.concurrency = concurrency
+        self.statement_cache = queries.StatementCache(maxsize=statement_cache_size)
+        self._indexed = None
+        self._constrained = None
+        # instrumentation (see `Graph`)
+        self.metrics = metrics
+        self.measure_payload = measure_payload
+
+    async def close(self):
+        await self.driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def read(self, query:str, params:dict={}) -> list:
+        """Runs a query in a managed read transaction and returns its records."""
+        async with self.driver.session() as session:
+            return await self._execute(session, self._records, query, params, read=True)
+
+    async def run(self, query:str, params:dict={}) -> list:
+        """Runs a query in a managed write transaction and returns its records."""
+        async with self.driver.session() as session:
+            return await self._execute(session, self._records, query, params)
+
+    async def _records(self, tx, query:str, params:dict={}) -> list:
+        """Unit of work returning all records of a query."""
+        result = await tx.run(query, params)
+        return [record async for record in result]
+
+    async def _write(self, tx, query:str, params:dict={}):
+        result = await tx.run(query, params)
+        return await result.consume()
+
+    async def _execute(self, session, work, query:str, params:dict={}, read:bool=False,
+                       max_retries:int=3, retry_delay:float=0.1):
+        """Runs `work` in a managed transaction, retrying transient errors with backoff."""
+        execute = (session.execute_read if read else session.execute_write)
+        for attempt in range(max_retries + 1):
+            try:
+                return await execute(work, query, params)
+            except TransientError:
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(retry_delay * 2 ** attempt)
+
+    async def _execute_write(self, session, query:str, params:dict={},
+                             max_retries:int=3, retry_delay:float=0.1):
+        """Runs a write statement, returning its result summary."""
+        return await self._execute(session, self._write, query, params,
+                                   max_retries=max_retries, retry_delay=retry_delay)
+
+    def _next_statement(self, statements) -> tuple:
+        """Next statement of an iterator (None when exhausted) and its
+        payload size, when measured. Runs in a worker thread."""
+        statement = next(statements, None)
+        if statement is None or not self.measure_payload:
+            return statement, None
+        return statement, metrics_tools.payload_size(statement[2])
+
+    async def _write_lane(self, statements, progress:batch_tools.UploadProgress, max_retries:int=3,
+                          stop:asyncio.Event=None):
+        """Writes a lane of batches in order on one session. The next batch
+        is converted in a thread while the current one is being written, so
+        the 'convert' timing is only the time spent waiting for it. Once
+        `stop` is set, no further batch is started; batches being written
+        finish, so every commit is recorded in the progress."""
+        if stop is not None and stop.is_set():
+            return progress
+        statements = iter(statements)
+        pending = asyncio.ensure_future(asyncio.to_thread(self._next_statement, statements))
+        try:
+            async with self.driver.session() as session:
+                while True:
+                    if stop is not None and stop.is_set():
+                        return progress
+                    batch_started = time.perf_counter()
+                    statement, size = await pending
+                    if statement is None:
+                        return progress
+                    pending = asyncio.ensure_future(asyncio.to_thread(self._next_statement, statements))
+                    batch, query, params, rows = statement
+                    converted = time.perf_counter()
+                    try:
+                        summary = await self._execute_write(session, query, params, max_retries=max_retries)
+                    except Exception as e:
+                        raise batch_tools.BatchUploadError(batch, e) from e
+                    written = time.perf_counter()
+                    timings = {'convert': converted - batch_started, 'write': written - converted,
+                               'server': metrics_tools.server_seconds(summary)}
+                    progress.update(batch, rows, written - batch_started,
+                                    batch_tools.summary_counters(summary), timings, size)
+        finally:
+            pending.cancel()
+
+    async def _write_rounds(self, rounds:list, progress:batch_tools.UploadProgress,
+                            max_retries:int=3, skip=()) -> batch_tools.UploadProgress:
+        """Writes rounds of lanes. At most `concurrency` lanes of a round run at
+        once (further lanes wait for a slot); rounds run one after the other.
+        The first failure stops the other lanes after their current batch;
+        batches committed meanwhile are listed on the raised error's `skip`
+        (with `skip`, those committed by an earlier attempt)."""
+        slots = asyncio.Semaphore(self.concurrency)
+        stop = asyncio.Event()
+
+        async def lane(statements):
+            async with slots:
+                try:
+                    return await self._write_lane(statements, progress, max_retries, stop)
+                except Exception:
+                    stop.set()
+                    raise
+
+        for lanes in rounds:
+            tasks = [asyncio.ensure_future(lane(statements)) for statements in lanes]
+            if not tasks:
+                continue
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if errors:
+                raise batch_tools.resume_error(errors, progress, skip)
+        return progress
+
+    async def indexes(self, refresh:bool=False) -> set:
+        """(label, key) pairs covered by a single-property node index or
+        uniqueness constraint. Cached after the first lookup."""
+        if self._indexed is None or refresh:
+            self._indexed, self._constrained = self._index_pairs(await self.read(queries.show_indexes_query()))
+        return self._indexed
+
+    async def constraints(self, refresh:bool=False) -> set:
+        """(label, key) pairs covered by a uniqueness constraint."""
+        await self.indexes(refresh)
+        return self._constrained
+
+    async def ensure_indexes(self, pairs:set, unique:bool=False, wait:bool=True, timeout:int=300) -> set:
+        """Creates an index (or uniqueness constraint) for each (label, key)
+        pair not already indexed. With `unique`, only existing constraints
+        count and a plain index on a pair raises a RuntimeError. Returns the
+        pairs that were created."""
+        await self.indexes()
+        missing = self._missing_indexes(pairs, unique)
+        for label, key in sorted(missing):
+            try:
+                await self.run(queries.create_index_query(label, key, unique=unique))
+            except Exception as e:
+                raise RuntimeError("Error creating index on :{}({}).".format(label, key)) from e
+        if missing and wait:
+            await self.read(queries.await_indexes_query(), {'timeout': timeout})
+        self._indexed.update(missing)
+        if unique:
+            self._constrained.update(missing)
+        return missing
+
+    async def create_nodes(self, nf:NodeFrame, batch_size:int=None, start_batch:int=0,
+                           verbose:bool=False, callback=None, max_retries:int=3,
+                           engine:str='apoc', create_indexes:bool=True,
+                           unique:bool=False, skip_batches=None) -> batch_tools.UploadProgress:
+        """Awaitable version of `Graph.create_nodes`; batches are dealt out
+        across `concurrency` lanes written at the same time."""
+        if not nf.ready_for_upload():
+            raise ValueError("Nodes DataFrame must contain a 'labels' column of label sets. Use NeonPandas preprocessing first.")
+        if create_indexes:
+            await self.ensure_indexes(schema_tools.node_index_pairs(nf), unique=unique)
+        parts = self._node_parts(nf, engine)
+        progress = batch_tools.UploadProgress(len(nf), self._count_batches(parts, batch_size),
+                                              start=start_batch, verbose=verbose, callback=callback)
+        lanes = [self._statements(parts, batch_size, start_batch, lane=w, lanes=self.concurrency, skip=skip_batches)
+                 for w in range(self.concurrency)]
+        return self._report('create_nodes', await self._write_rounds([lanes], progress, max_retries,
+                                                                     skip=(skip_batches or ())))
+
+    async def create_edges(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                           verbose:bool=False, callback=None, max_retries:int=3,
+                           engine:str='apoc', create_indexes:bool=True,
+                           unique:bool=False, skip_batches=None) -> batch_tools.UploadProgress:
+        """Awaitable version of `Graph.create_edges`. Edges are partitioned
+        into rounds of node-disjoint lanes, so batches in flight at the same
+        time never merge on the same start or end node."""
+        if not ef.ready_for_upload():
+            raise ValueError("Edgeframe is not yet ready for upload to Neo4j Graph.")
+        if create_indexes:
+            await self.ensure_indexes(schema_tools.edge_index_pairs(ef), unique=unique)
+        if self.concurrency <= 1:
+            parts = self._edge_parts(ef, engine)
+            rounds = [[self._statements(parts, batch_size, start_batch, skip=skip_batches)]]
+            total = self._count_batches(parts, batch_size)
+        else:
+            rounds, total = await asyncio.to_thread(self._edge_rounds, ef, self.concurrency,
+                                                    batch_size, start_batch, engine, False, skip_batches)
+        progress = batch_tools.UploadProgress(len(ef), total, start=start_batch,
+                                              verbose=verbose, callback=callback)
+        return self._report('create_edges', await self._write_rounds(rounds, progress, max_retries,
+                                                                     skip=(skip_batches or ())))
+
+    async def match_nodes(self, labels:set={}, properties:dict={}, limit:int=None, *args, **kwargs) -> NodeFrame:
+        """Awaitable version of `Graph.match_nodes`."""
+        async with self.driver.session() as session:
+            columns = await self._execute(session, self._node_columns, self._match_statement(labels, properties, limit),
+                                          queries.node_match_params(properties, limit), read=True)
+        return NodeFrame(columns.to_frame(), *args, **kwargs)
+
+    async def _node_columns(self, tx, query:str, params:dict={}) -> df_tools.NodeColumns:
+        """Unit of work collecting returned labels & properties column-wise."""
+        result = await tx.run(query, params)
+        columns = df_tools.NodeColumns()
+        async for record in result:
+            columns.append(record['labels'], record['properties'])
+        return columns
+
+    async def existing_keys(self, keys, on:str, labels={}, batch_size:int=10000) -> list:
+        """Awaitable version of `Graph.existing_keys`; up to `concurrency`
+        key batches are checked at once."""
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def check(query, params):
+            async with slots:
+                return [record['key'] for record in await self.read(query, params)]
+
+        found = await asyncio.gather(*[check(query, params) for query, params
+                                       in self._key_batches(keys, on, labels, batch_size)])
+        return [key for batch in found for key in batch]
+
+    async def _exists_mask(self, df, on:str, labels={}, batch_size:int=10000) -> pd.Series:
+        if on not in df:
+            raise ValueError("Column '{}' not in DataFrame.".format(on))
+        return df[on].isin(await self.existing_keys(df[on], on, labels, batch_size))
+
+    async def semi_join(self, df, on:str, labels={}, batch_size:int=10000) -> NodeFrame:
+        """Rows of `df` whose `on` value exists on a node with the given labels."""
+        df = df.loc[await self._exists_mask(df, on, labels, batch_size)]
+        return (df if isinstance(df, NodeFrame) else NodeFrame(df))
+
+    async def anti_join(self, df, on:str, labels={}, batch_size:int=10000) -> NodeFrame:
+        """Rows of `df` whose `on` value does not exist on any node with the given labels."""
+        df = df.loc[~await self._exists_mask(df, on, labels, batch_size)]
+        return (df if isinstance(df, NodeFrame) else NodeFrame(df))
@@ -1,68 +1,1009 @@
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, READ_ACCESS
+from neo4j.exceptions import TransientError
 from neonpandas.utils import df_tools
 from neonpandas.utils import apoc_tools
+from neonpandas.utils import batch_tools
+from neonpandas.utils import static_tools
+from neonpandas.utils import schema_tools
+from neonpandas.utils import sync_tools
+from neonpandas.utils import cypher_tools
+from neonpandas.utils import metrics_tools
+from neonpandas.utils import columnar_tools
 from neonpandas.graph import queries
+from neonpandas.frames import nodeframe
+from neonpandas.frames import edgeframe
 from neonpandas.frames.nodeframe import NodeFrame
 from neonpandas.frames.edgeframe import EdgeFrame
 
-class Graph:
-    def __init__(self, uri:str, auth:tuple, encrypted: bool=False):
+class BaseGraph:
+    """Statement planning shared by `Graph` and `AsyncGraph`: splitting
+    frames into upload parts and batches, and building cached statements.
+    Subclasses set `statement_cache` and `metrics`."""
+
+    def _emit(self, metrics:dict):
+        """Passes an operation's metrics to the metrics callback, if any."""
+        if self.metrics is not None:
+            self.metrics(metrics)
+
+    def _report(self, operation:str, progress:batch_tools.UploadProgress) -> batch_tools.UploadProgress:
+        self._emit(progress.metrics(operation))
+        return progress
+
+    def _profile_statement(self, frame, batch_size:int=None, batch:int=0, engine:str='apoc') -> tuple:
+        """The (batch, query, params, rows) statement of one upload batch of
+        a NodeFrame or EdgeFrame."""
+        parts = self._frame_parts(frame, engine)
+        statement = next(self._statements(parts, batch_size, batch), None)
+        if statement is None:
+            raise ValueError("Batch {} is out of range ({} batches).".format(batch, self._count_batches(parts, batch_size)))
+        return statement
+
+    def payload_sizes(self, frame, batch_size:int=None, engines=('apoc', 'columnar')) -> pd.DataFrame:
+        """Estimated bytes sent (statements & parameters, as PackStream) to
+        upload a NodeFrame or EdgeFrame with each engine, relative to the
+        first. Runs the conversion only; nothing is sent."""
+        sizes = []
+        for engine in engines:
+            batches = size = 0
+            for _, query, params, _ in self._statements(self._frame_parts(frame, engine), batch_size):
+                batches += 1
+                size += metrics_tools.payload_size(query) + metrics_tools.payload_size(params)
+            sizes.append({'engine': engine, 'batches': batches, 'payload_bytes': size,
+                          'bytes_per_row': size / max(len(frame), 1)})
+        sizes = pd.DataFrame(sizes).set_index('engine')
+        sizes['ratio'] = sizes['payload_bytes'] / sizes['payload_bytes'].iloc[0]
+        return sizes
+
+    def _statements(self, parts:list, batch_size:int=None, start_batch:int=0,
+                    offset:int=0, lane:int=0, lanes:int=1, skip=()):
+        """Lazily yields upload statements for a list of (frame, query, key, convert)
+        parts, converting one chunk at a time. Batches are numbered across parts
+        from `offset`; with `lanes`, only every lanes-th batch (starting at
+        `lane`) is yielded. Batches in `skip` (committed already) are left out."""
+        skip = set(skip or ())
+        for frame, query, key, convert in parts:
+            for batch, chunk in batch_tools.iter_batches(frame, batch_size, start=max(0, start_batch - offset)):
+                if (batch + offset) % lanes == lane and batch + offset not in skip:
+                    yield batch + offset, query, {key: convert(chunk)}, len(chunk)
+            offset += batch_tools.num_batches(frame, batch_size)
+
+    def _count_batches(self, parts:list, batch_size:int=None) -> int:
+        return sum(batch_tools.num_batches(frame, batch_size) for frame, _, _, _ in parts)
+
+    def _frame_parts(self, frame, engine:str='apoc') -> list:
+        if isinstance(frame, EdgeFrame):
+            return self._edge_parts(frame, engine)
+        return self._node_parts(frame, engine)
+
+    def _node_parts(self, nf:NodeFrame, engine:str='apoc') -> list:
+        """Splits a NodeFrame into (frame, query, key, convert) upload parts."""
+        if engine == 'apoc':
+            return [(nf, queries.apoc_node_create(), 'nodes', apoc_tools.convert_nodes_to_apoc)]
+        elif engine == 'columnar':
+            return [(nf, queries.columnar_node_create(), 'nodes', columnar_tools.convert_nodes_to_columns)]
+        elif engine == 'cypher':
+            return [(group, self.statement_cache.get('create_nodes', lbls, build=lambda: queries.node_create_query(lbls)),
+                     'nodes', static_tools.convert_nodes_to_cypher)
+                    for lbls, group in static_tools.group_nodes(nf)]
+        else:
+            raise ValueError("Unknown engine '{}'. Use 'apoc', 'cypher' or 'columnar'.".format(engine))
+
+    def _edge_parts(self, ef:EdgeFrame, engine:str='apoc', match_endpoints:bool=False) -> list:
+        """Splits an EdgeFrame into (frame, query, key, convert) upload parts.
+        With `match_endpoints`, the static statements MATCH (rather than MERGE)
+        start & end nodes, which must already exist."""
+        if match_endpoints:
+            return [(group, self._edge_statement(group_key, match_endpoints=True), 'edges',
+                     static_tools.convert_edges_to_cypher)
+                    for group_key, group in static_tools.group_edges(ef)]
+        elif engine == 'apoc':
+            return [(ef, queries.apoc_edge_create(), 'edges', apoc_tools.convert_edges_to_apoc)]
+        elif engine == 'columnar':
+            return [(ef, queries.columnar_edge_create(), 'edges', columnar_tools.convert_edges_to_columns)]
+        elif engine == 'cypher':
+            return [(group, self._edge_statement(group_key), 'edges', static_tools.convert_edges_to_cypher)
+                    for group_key, group in static_tools.group_edges(ef)]
+        else:
+            raise ValueError("Unknown engine '{}'. Use 'apoc', 'cypher' or 'columnar'.".format(engine))
+
+    def _edge_statement(self, group_key:tuple, match_endpoints:bool=False) -> str:
+        if match_endpoints:
+            return self.statement_cache.get('create_edges_match', keys=group_key,
+                                            build=lambda: queries.edge_match_query(*group_key))
+        return self.statement_cache.get('create_edges', keys=group_key,
+                                        build=lambda: queries.edge_merge_query(*group_key))
+
+    def _endpoint_parts(self, ef:EdgeFrame) -> list:
+        """Upload parts merging each distinct endpoint node of an EdgeFrame once."""
+        return [(group, self.statement_cache.get('merge_nodes', lbls, (key,),
+                                                 build=lambda: queries.node_merge_query(lbls, key)),
+                 'nodes', static_tools.convert_endpoints_to_cypher)
+                for (lbls, key), group in static_tools.group_endpoints(ef)]
+
+    def _node_write_parts(self, nf:NodeFrame, operation:str, key:str) -> list:
+        """Splits a NodeFrame into label-grouped (frame, query, key, convert)
+        parts upserting, updating or deleting nodes identified by `key`."""
+        build, convert = {
+            'upsert_nodes': (lambda lbls: queries.node_upsert_query(lbls, key, replace=False),
+                             static_tools.convert_nodes_to_cypher),
+            'update_nodes': (lambda lbls: queries.node_update_query(lbls, key),
+                             static_tools.convert_nodes_to_cypher),
+            'delete_nodes': (lambda lbls: queries.node_delete_query(lbls, key),
+                             lambda chunk: chunk[key].tolist()),
+        }[operation]
+        return [(group, self.statement_cache.get(operation, lbls, (key,), build=lambda: build(lbls)), 'nodes', convert)
+                for lbls, group in static_tools.group_nodes(nf)]
+
+    def _edge_write_parts(self, ef:EdgeFrame, operation:str) -> list:
+        """Splits an EdgeFrame into grouped (frame, query, key, convert) parts
+        upserting, updating or deleting relationships by their endpoints."""
+        if operation == 'upsert_edges':
+            return self._edge_parts(ef, 'cypher')
+        build, convert = {
+            'update_edges': (queries.edge_update_query, static_tools.convert_edges_to_cypher),
+            'delete_edges': (queries.edge_delete_query, static_tools.convert_edge_keys_to_cypher),
+        }[operation]
+        return [(group, self.statement_cache.get(operation, keys=group_key, build=lambda: build(*group_key)),
+                 'edges', convert)
+                for group_key, group in static_tools.group_edges(ef)]
+
+    def _match_statement(self, labels, properties:dict, limit:int=None) -> str:
+        return self.statement_cache.get('match_nodes', labels, (tuple(properties), bool(limit)),
+                                        build=lambda: queries.node_match_query(labels, properties, limit=limit))
+
+    def _edge_rounds(self, ef:EdgeFrame, workers:int, batch_size:int=None, start_batch:int=0,
+                     engine:str='apoc', match_endpoints:bool=False, skip=()) -> tuple:
+        """Rounds of node-disjoint lanes of edge statements, for `workers`
+        concurrent writers, and the total number of batches. The frame is
+        split into upload parts once and each part's rows are dealt out to
+        the lanes of each round, so every lane sends `batch_size` statements
+        per part. When that would leave each writer more statements than a
+        serial upload sends (small frames, many static groups), a single
+        lane is returned instead."""
+        parts = self._edge_parts(ef, engine, match_endpoints=match_endpoints)
+        slots = [batch_tools.edge_slots(frame, workers) for frame, _, _, _ in parts]
+        total = self._count_batches(parts, batch_size)
+        counts = np.concatenate([np.bincount(s) for s in slots if len(s)] or [np.zeros(0, dtype=np.int64)])
+        counts = counts[counts > 0]
+        if (counts.size if batch_size is None else np.ceil(counts / batch_size).sum()) > workers * total:
+            return [[self._statements(parts, batch_size, start_batch, skip=skip)]], total
+        lane_parts = {}
+        for (frame, query, key, convert), part_slots in zip(parts, slots):
+            for slot, pos in pd.Series(part_slots).groupby(part_slots).indices.items():
+                lane_parts.setdefault(slot, []).append((frame.iloc[pos], query, key, convert))
+        rounds, offset, last = [], 0, None
+        for slot in sorted(lane_parts):
+            if slot // workers != last:
+                rounds.append([])
+                last = slot // workers
+            rounds[-1].append(self._statements(lane_parts[slot], batch_size, start_batch, offset, skip=skip))
+            offset += self._count_batches(lane_parts[slot], batch_size)
+        return rounds, offset
+
+    def _index_pairs(self, records) -> tuple:
+        """(label, key) pairs from SHOW INDEXES records: all indexed pairs and
+        the pairs whose index is owned by a (uniqueness) constraint."""
+        indexed, constrained = set(), set()
+        for record in records:
+            if record['entityType'] == 'NODE' and record['labelsOrTypes'] and len(record['properties']) == 1:
+                pairs = {(lbl, record['properties'][0]) for lbl in record['labelsOrTypes']}
+                indexed.update(pairs)
+                if record.get('owningConstraint'):
+                    constrained.update(pairs)
+        return indexed, constrained
+
+    def _missing_indexes(self, pairs:set, unique:bool=False) -> set:
+        """The pairs still needing an index (or, if `unique`, a uniqueness
+        constraint). Raises if a plain index would block a constraint."""
+        if not unique:
+            return set(pairs) - self._indexed
+        missing = set(pairs) - self._constrained
+        blocked = missing & self._indexed
+        if blocked:
+            raise RuntimeError("Uniqueness constraints can't be created over existing plain indexes on {}. "
+                               "Drop the indexes first.".format(
+                                   ', '.join(':{}({})'.format(lbl, key) for lbl, key in sorted(blocked))))
+        return missing
+
+    def _key_batches(self, keys, on:str, labels={}, batch_size:int=10000):
+        """Yields (query, params) statements checking de-duplicated,
+        non-null keys for existence, `batch_size` keys at a time."""
+        keys = pd.Series(keys).dropna().drop_duplicates()
+        query = self.statement_cache.get('existing_keys', labels, (on,),
+                                         build=lambda: queries.bulk_key_exists_query(field=on, labels=labels))
+        for _, batch in batch_tools.iter_batches(keys, batch_size):
+            yield query, {'keys': batch.tolist()}
+
+
+class Graph(BaseGraph):
+    """Connection to a Neo4j database. Every operation runs on a short-lived
+    session from the driver's connection pool, in managed transactions, so
+    one Graph can be shared between threads. Use as a context manager (or
+    call `close`) to close the pool. An existing `driver` (or any object
+    with the driver's session interface) can be passed instead of connecting.
+
+    `metrics` is called with a flat dict for every query & upload: rows,
+    seconds, server-side seconds and write counters, plus, for uploads,
+    batches and seconds per phase (convert, write, server). With
+    `measure_payload`, uploads also estimate the bytes sent per batch.
+
+    With a `result_cache` (a `ResultCache`), `match_nodes` frames are cached.
+    Uploads that only create nodes or merge edge endpoints (`create_nodes`,
+    `create_edges`, `upsert_edges`, `sync_edges`) invalidate the entries
+    their new nodes' label sets could appear in. Writes to existing nodes
+    (`upsert_nodes`, `update_nodes`, `delete_nodes`, `sync_nodes`) clear the
+    whole cache, since those nodes may carry any other labels. Writes made
+    with `run` or by other clients are not seen, so pick a `ttl` that
+    suits, or call `result_cache.clear()`."""
+    def __init__(self, uri:str, auth:tuple, encrypted: bool=False, statement_cache_size:int=256,
+                 max_connection_pool_size:int=100, connection_acquisition_timeout:float=60.0,
+                 fetch_size:int=1000, max_retries:int=3, database:str=None, driver=None,
+                 metrics=None, measure_payload:bool=False, result_cache:queries.ResultCache=None,
+                 **config):
         self.uri = uri
-        self.driver = GraphDatabase.driver(uri=self.uri, auth=auth, encrypted=encrypted)
-        self.session = self.driver.session()
-        
+        if driver is None:
+            driver = GraphDatabase.driver(uri=self.uri, auth=auth, encrypted=encrypted,
+                                          max_connection_pool_size=max_connection_pool_size,
+                                          connection_acquisition_timeout=connection_acquisition_timeout,
+                                          **config)
+        self.driver = driver
+        # defaults for sessions & transactions opened per operation
+        self.fetch_size = fetch_size
+        self.max_retries = max_retries
+        self.database = database
+        # generated statement templates, reused across calls
+        self.statement_cache = queries.StatementCache(maxsize=statement_cache_size)
+        # (label, key) pairs known to be indexed; looked up on first use
+        self._indexed = None
+        self._constrained = None
+        # instrumentation
+        self.metrics = metrics
+        self.measure_payload = measure_payload
+        # cached `match_nodes` frames (opt-in)
+        self.result_cache = result_cache
+
     def close(self):
         self.driver.close()
 
-    def run(self, query:str, params:dict={}):
-        result = self.session.run(query, params)
-        return result
+    def __enter__(self):
+        return self
 
-    def create_nodes(self, nf:NodeFrame):
-        """Create Nodes in Neo4j from input Pandas Dataframe."""
-        if nf.ready_for_upload():
-            # prepare data for apoc
-            apoc_nodes = apoc_tools.convert_nodes_to_apoc(nf)
-            self.run(queries.apoc_node_create(), {'nodes': apoc_nodes})
-        else:
-            # TODO: This check will be more robust with introduction of LabelSeries
-            raise ValueError("Nodes DataFrame must contain 'labels' column. Use NeonPandas preprocessing first.")
-        return
-
-    def create_edges(self, ef:EdgeFrame):
-        if ef.ready_for_upload():
-            # prepare data for apoc
-            apoc_edges = apoc_tools.convert_edges_to_apoc(ef)
-            self.run(queries.apoc_edge_create(), {'edges': apoc_edges})
+    def __exit__(self, *exc):
+        self.close()
+
+    def session(self, **kwargs):
+        """Opens a new session with the Graph's fetch size & database.
+        Sessions are not thread-safe; close them (or use `with`) after use."""
+        kwargs.setdefault('fetch_size', self.fetch_size)
+        if self.database is not None:
+            kwargs.setdefault('database', self.database)
+        return self.driver.session(**kwargs)
+
+    @contextmanager
+    def _invalidating(self, frame=None):
+        """Invalidates cached results once a write finishes or fails (batches
+        before a failure are committed). With `frame`, for writes that only
+        create nodes with the frame's label sets (merged nodes that already
+        exist are left unchanged), only entries those nodes could appear in
+        are dropped; without, the whole cache is."""
+        try:
+            yield
+        finally:
+            if self.result_cache is not None:
+                self.result_cache.invalidate(None if frame is None else schema_tools.label_sets(frame))
+
+    def read(self, query:str, params:dict={}) -> list:
+        """Runs a query in a managed read transaction and returns its records."""
+        return self._query('read', query, params)
+
+    def run(self, query:str, params:dict={}) -> list:
+        """Runs a query in a managed write transaction and returns its records.
+        Records are a list (not a `Result`); `df_tools.neo_nodes_to_df`
+        accepts them to collect returned nodes."""
+        return self._query('run', query, params)
+
+    def _query(self, operation:str, query:str, params:dict={}) -> list:
+        started = time.perf_counter()
+        with self.session() as session:
+            records, summary = self._execute(session, self._records, query, params, read=(operation == 'read'))
+        if self.metrics is not None:
+            metrics = {'operation': operation, 'query': query, 'rows': len(records),
+                       'seconds': time.perf_counter() - started,
+                       'server_seconds': metrics_tools.server_seconds(summary)}
+            metrics.update(batch_tools.summary_counters(summary))
+            self._emit(metrics)
+        return records
+
+    def _records(self, tx, query:str, params:dict={}) -> tuple:
+        """Unit of work returning all records of a query and its summary."""
+        result = tx.run(query, params)
+        records = list(result)
+        return records, result.consume()
+
+    def _write(self, tx, query:str, params:dict={}):
+        """Unit of work for managed write transactions."""
+        return tx.run(query, params).consume()
+
+    def _execute(self, session, work, query:str, params:dict={}, read:bool=False,
+                 autocommit:bool=False, max_retries:int=None, retry_delay:float=0.1):
+        """Runs `work` in a managed transaction, retrying transient errors
+        (e.g. deadlocks between concurrent batches) with backoff. Dropped
+        connections & leader switches are retried by the driver itself.
+        With `autocommit`, `work` runs on the session itself (an auto-commit
+        transaction, as `CALL {} IN TRANSACTIONS` requires); such statements
+        are retried in full, so they must be idempotent."""
+        max_retries = (self.max_retries if max_retries is None else max_retries)
+        execute = (session.execute_read if read else session.execute_write)
+        for attempt in range(max_retries + 1):
+            try:
+                if autocommit:
+                    return work(session, query, params)
+                return execute(work, query, params)
+            except TransientError:
+                if attempt == max_retries:
+                    raise
+                time.sleep(retry_delay * 2 ** attempt)
+
+    def _execute_write(self, session, query:str, params:dict={}, autocommit:bool=False,
+                        max_retries:int=None, retry_delay:float=0.1):
+        """Runs a write statement, returning its result summary."""
+        return self._execute(session, self._write, query, params, autocommit=autocommit,
+                             max_retries=max_retries, retry_delay=retry_delay)
+
+    def _write_batches(self, statements, progress:batch_tools.UploadProgress,
+                        session=None, max_retries:int=None, autocommit:bool=False,
+                        stop:threading.Event=None) -> batch_tools.UploadProgress:
+        """Commits each (batch, query, params, rows) statement in its own
+        managed write transaction (or, with `autocommit`, an auto-commit
+        one), recording progress as batches commit. Without `session`, a
+        session is opened for the duration of the upload. Once `stop` is
+        set (by a failed lane), no further batch is started."""
+        if session is None:
+            with self.session() as session:
+                return self._write_batches(statements, progress, session, max_retries, autocommit, stop)
+        statements = iter(statements)
+        while True:
+            if stop is not None and stop.is_set():
+                return progress
+            batch_started = time.perf_counter()
+            statement = next(statements, None)
+            if statement is None:
+                return progress
+            batch, query, params, rows = statement
+            converted = time.perf_counter()
+            size = (metrics_tools.payload_size(params) if self.measure_payload else None)
+            try:
+                summary = self._execute_write(session, query, params, autocommit=autocommit,
+                                              max_retries=max_retries)
+            except Exception as e:
+                raise batch_tools.BatchUploadError(batch, e) from e
+            written = time.perf_counter()
+            timings = {'convert': converted - batch_started, 'write': written - converted,
+                       'server': metrics_tools.server_seconds(summary)}
+            progress.update(batch, rows, written - batch_started,
+                            batch_tools.summary_counters(summary), timings, size)
+
+    def _write_lane(self, statements, progress:batch_tools.UploadProgress, max_retries:int=None,
+                    stop:threading.Event=None):
+        """Writes a sequence of batches on a session of its own (worker
+        thread). On failure, sets `stop` so the other lanes stop too."""
+        try:
+            return self._write_batches(statements, progress, max_retries=max_retries, stop=stop)
+        except Exception:
+            if stop is not None:
+                stop.set()
+            raise
+
+    def _write_parallel(self, rounds:list, progress:batch_tools.UploadProgress,
+                        workers:int, max_retries:int=None, skip=()) -> batch_tools.UploadProgress:
+        """Writes rounds of lanes over a pool of sessions. Lanes within a
+        round run concurrently; rounds run one after the other. The first
+        failure stops every lane; batches other lanes committed meanwhile
+        are listed on the raised error's `skip` (and in `skip`, those
+        committed by an earlier attempt), so a resume does not repeat them."""
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for lanes in rounds:
+                futures = [pool.submit(self._write_lane, lane, progress, max_retries, stop) for lane in lanes]
+                errors = [f.exception() for f in futures if f.exception() is not None]
+                if errors:
+                    raise batch_tools.resume_error(errors, progress, skip)
+        return progress
+
+    def create_nodes(self, nf:NodeFrame, batch_size:int=None, start_batch:int=0,
+                    verbose:bool=False, callback=None, workers:int=1,
+                    max_retries:int=None, engine:str='apoc', create_indexes:bool=True,
+                    unique:bool=False, skip_batches=None) -> batch_tools.UploadProgress:
+        """Create Nodes in Neo4j from input Pandas Dataframe.
+        
+        With `batch_size`, the NodeFrame is converted and written in bounded
+        chunks, each committed in its own write transaction. If a batch fails,
+        a BatchUploadError is raised; batches before it are committed and the
+        upload can be resumed by passing `start_batch`. With `workers` > 1,
+        batches are written concurrently over a pool of sessions; a failure
+        stops every lane, and later batches that committed in the meantime
+        are listed in the error's `skip`, to pass back as `skip_batches`.
+
+        `engine='cypher'` groups nodes by label set and sends a static
+        `UNWIND ... CREATE` per group instead of calling APOC per row.
+        `engine='columnar'` calls APOC as 'apoc' does, but sends each batch
+        as parallel property lists with the keys & label sets sent once
+        (compare with `payload_sizes`).
+
+        With `create_indexes`, any missing index (or uniqueness constraint,
+        with `unique`) on the id column of each label is created first."""
+        if not nf.ready_for_upload():
+            raise ValueError("Nodes DataFrame must contain a 'labels' column of label sets. Use NeonPandas preprocessing first.")
+        if create_indexes:
+            self.ensure_indexes(schema_tools.node_index_pairs(nf), unique=unique)
+        with self._invalidating(nf):
+            parts = self._node_parts(nf, engine)
+            progress = batch_tools.UploadProgress(len(nf), self._count_batches(parts, batch_size),
+                                                  start=start_batch, verbose=verbose, callback=callback)
+            if workers > 1:
+                # node creation takes no shared locks, so batches are dealt out across lanes
+                lanes = [self._statements(parts, batch_size, start_batch, lane=w, lanes=workers, skip=skip_batches)
+                         for w in range(workers)]
+                return self._report('create_nodes', self._write_parallel([lanes], progress, workers, max_retries,
+                                                                         skip=(skip_batches or ())))
+            # prepare data one chunk at a time
+            statements = self._statements(parts, batch_size, start_batch, skip=skip_batches)
+            return self._report('create_nodes', self._write_batches(statements, progress, max_retries=max_retries))
+
+    def create_edges(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                    verbose:bool=False, callback=None, workers:int=1,
+                    max_retries:int=None, engine:str='apoc', create_indexes:bool=True,
+                    unique:bool=False, two_phase:bool=False, skip_batches=None) -> batch_tools.UploadProgress:
+        """Create Relationships (and any missing endpoint Nodes) in Neo4j
+        from input EdgeFrame. Supports the same batching, resume and
+        engine options as `create_nodes` (including `skip_batches`); the
+        'cypher' engine groups edges by (start labels, relationship type,
+        end labels).
+        
+        With `workers` > 1, edges are partitioned into rounds of node-disjoint
+        lanes, so concurrent batches never merge on the same start or end node.
+        Frames too small to fill each lane's batches are written serially.
+
+        With `create_indexes`, endpoint merges are backed by an index on every
+        (label, start_id/end_id) pair, created first if missing.
+
+        With `two_phase`, the distinct endpoint nodes are merged once first,
+        then relationships are created per (start labels, type, end labels)
+        group by looking their endpoints up. The returned progress' `report`
+        gives nodes & relationships created versus matched. Phase one is
+        idempotent and is re-run in full when resuming with `start_batch`."""
+        if not ef.ready_for_upload():
+            raise ValueError("Edgeframe is not yet ready for upload to Neo4j Graph.")
+        if create_indexes:
+            self.ensure_indexes(schema_tools.edge_index_pairs(ef), unique=unique)
+        with self._invalidating(ef):
+            if two_phase:
+                return self._report('create_edges', self._create_edges_two_phase(
+                    ef, batch_size, start_batch, verbose, callback, workers, max_retries, skip_batches))
+            if workers <= 1:
+                parts = self._edge_parts(ef, engine)
+                progress = batch_tools.UploadProgress(len(ef), self._count_batches(parts, batch_size),
+                                                      start=start_batch, verbose=verbose, callback=callback)
+                # prepare data one chunk at a time
+                statements = self._statements(parts, batch_size, start_batch, skip=skip_batches)
+                return self._report('create_edges', self._write_batches(statements, progress, max_retries=max_retries))
+
+            rounds, total = self._edge_rounds(ef, workers, batch_size, start_batch, engine, skip=skip_batches)
+            progress = batch_tools.UploadProgress(len(ef), total, start=start_batch,
+                                                  verbose=verbose, callback=callback)
+            return self._report('create_edges', self._write_parallel(rounds, progress, workers, max_retries,
+                                                                     skip=(skip_batches or ())))
+
+    def _create_edges_two_phase(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                                verbose:bool=False, callback=None, workers:int=1,
+                                max_retries:int=None, skip_batches=None) -> batch_tools.UploadProgress:
+        # phase one: merge each distinct endpoint once
+        parts = self._endpoint_parts(ef)
+        endpoints = sum(len(frame) for frame, _, _, _ in parts)
+        node_progress = batch_tools.UploadProgress(endpoints, self._count_batches(parts, batch_size),
+                                                   verbose=verbose, callback=callback)
+        try:
+            if workers > 1:
+                # distinct nodes take no shared locks, so batches are dealt out across lanes
+                lanes = [self._statements(parts, batch_size, lane=w, lanes=workers) for w in range(workers)]
+                self._write_parallel([lanes], node_progress, workers, max_retries)
+            else:
+                self._write_batches(self._statements(parts, batch_size), node_progress, max_retries=max_retries)
+        except batch_tools.BatchUploadError as e:
+            # phase one is idempotent and re-run in full, so resume where phase two would
+            raise batch_tools.BatchUploadError(start_batch, e.error, skip=(skip_batches or ())) from e.error
+
+        # phase two: relationships between existing endpoints
+        if workers > 1:
+            rounds, total = self._edge_rounds(ef, workers, batch_size, start_batch, match_endpoints=True,
+                                              skip=skip_batches)
+            progress = batch_tools.UploadProgress(len(ef), total, start=start_batch,
+                                                  verbose=verbose, callback=callback)
+            self._write_parallel(rounds, progress, workers, max_retries, skip=(skip_batches or ()))
         else:
+            parts = self._edge_parts(ef, match_endpoints=True)
+            progress = batch_tools.UploadProgress(len(ef), self._count_batches(parts, batch_size),
+                                                  start=start_batch, verbose=verbose, callback=callback)
+            self._write_batches(self._statements(parts, batch_size, start_batch, skip=skip_batches), progress,
+                                max_retries=max_retries)
+
+        nodes_created = node_progress.counters['nodes_created']
+        rels_created = progress.counters['relationships_created']
+        progress.report = {
+            'endpoints': endpoints,
+            'nodes_created': nodes_created,
+            'nodes_matched': endpoints - nodes_created,
+            'relationships': progress.rows(),
+            'relationships_created': rels_created,
+            'relationships_matched': progress.rows() - rels_created,
+        }
+        for c, n in node_progress.counters.items():
+            progress.counters[c] += n
+        for p, t in node_progress.timings.items():
+            progress.timings[p] += t
+        progress.payload_bytes += node_progress.payload_bytes
+        return progress
+
+    ## Streaming from files -----
+    def _load(self, frames, upload, start_chunk:int=0, start_batch:int=0, skip_batches=None,
+              verbose:bool=False, **kwargs) -> batch_tools.UploadProgress:
+        progress = batch_tools.UploadProgress(0, 0, verbose=verbose)
+        for chunk, frame in enumerate(frames, start=start_chunk):
+            first = (chunk == start_chunk)
+            try:
+                progress.add(upload(frame, start_batch=(start_batch if first else 0),
+                                    skip_batches=(skip_batches if first else None), verbose=verbose, **kwargs))
+            except batch_tools.BatchUploadError as e:
+                raise batch_tools.BatchUploadError(e.batch, e.error, chunk=chunk, skip=e.skip,
+                                                   failed=e.failed) from e.error
+            if verbose:
+                print('chunk {}: {} rows uploaded'.format(chunk, len(frame)))
+        return progress
+
+    def load_nodes(self, filepath:str, chunksize:int=100000, start_chunk:int=0, start_batch:int=0,
+                   file_format:str=None, read_kwargs:dict=None, frame_kwargs:dict=None,
+                   **kwargs) -> batch_tools.UploadProgress:
+        """Streams nodes from a CSV or Parquet file into the graph. The file is
+        read `chunksize` rows at a time; each chunk is built into a NodeFrame
+        (with `frame_kwargs`, e.g. id_col & labels) and written with
+        `create_nodes` (with the remaining keyword arguments), so memory is
+        bounded by the chunk size. A failed upload can be resumed from the
+        `start_chunk` & `start_batch` given in the BatchUploadError (passing
+        its `skip` as `skip_batches`)."""
+        frames = nodeframe.iter_nodeframes(filepath, chunksize, start_chunk, file_format,
+                                           read_kwargs, **(frame_kwargs or {}))
+        return self._load(frames, self.create_nodes, start_chunk, start_batch, **kwargs)
+
+    def load_edges(self, filepath:str, chunksize:int=100000, start_chunk:int=0, start_batch:int=0,
+                   file_format:str=None, read_kwargs:dict=None, frame_kwargs:dict=None,
+                   **kwargs) -> batch_tools.UploadProgress:
+        """Streams edges from a CSV or Parquet file into the graph, as
+        `load_nodes` does for nodes. `frame_kwargs` build each chunk's
+        EdgeFrame (e.g. rel_col, start/end columns & ids, labels) and the
+        remaining keyword arguments go to `create_edges`."""
+        frames = edgeframe.iter_edgeframes(filepath, chunksize, start_chunk, file_format,
+                                           read_kwargs, **(frame_kwargs or {}))
+        return self._load(frames, self.create_edges, start_chunk, start_batch, **kwargs)
+
+    ## Incremental sync -----
+    def _sync(self, operation:str, parts:list, diff:sync_tools.SyncDiff, manifest:sync_tools.SyncManifest,
+              ids, hashes, identities, delete:bool=False, batch_size:int=None, verbose:bool=False,
+              callback=None, max_retries:int=None) -> batch_tools.UploadProgress:
+        """Writes upsert & delete parts, then records the new state in the
+        manifest. The manifest is only replaced once every batch committed,
+        so a failed sync is simply re-run. Without `delete`, removed rows
+        stay in the graph and so stay in the manifest, where a later sync
+        with `delete` finds them."""
+        progress = batch_tools.UploadProgress(sum(len(frame) for frame, _, _, _ in parts),
+                                              self._count_batches(parts, batch_size),
+                                              verbose=verbose, callback=callback)
+        self._write_batches(self._statements(parts, batch_size), progress, max_retries=max_retries)
+        if not delete and len(diff.removed) > 0:
+            ids = np.concatenate([ids, diff.removed['id'].to_numpy(dtype=np.int64)])
+            hashes = np.concatenate([hashes, diff.removed['hash'].to_numpy(dtype=np.int64)])
+            identities = pd.concat([identities, diff.removed[identities.columns]], ignore_index=True)
+        manifest.save(ids, hashes, identities)
+        progress.report = {
+            'inserted': int(diff.inserted.sum()),
+            'changed': int(diff.changed.sum()),
+            'unchanged': int(diff.unchanged().sum()),
+            'removed': len(diff.removed),
+            'deleted': (len(diff.removed) if delete else 0),
+        }
+        return self._report(operation, progress)
+
+    def sync_nodes(self, nf:NodeFrame, manifest:str, key:str=None, delete:bool=False,
+                   table:str='nodes', batch_size:int=None, verbose:bool=False, callback=None,
+                   max_retries:int=None, create_indexes:bool=True) -> batch_tools.UploadProgress:
+        """Incrementally syncs a NodeFrame to the graph. Rows are identified by
+        labels & `key` (default: the id column) and hashed; only rows that are
+        new or changed since the last sync recorded in the `manifest` SQLite
+        file are merged (replacing their properties). With `delete`, nodes
+        synced before but no longer in the frame are detach-deleted; without,
+        they are kept in the manifest until a sync with `delete` removes them."""
+        if not nf.ready_for_upload():
+            raise ValueError("Nodes DataFrame must contain a 'labels' column of label sets. Use NeonPandas preprocessing first.")
+        key = self._node_key(nf, key)
+        if create_indexes:
+            self.ensure_indexes(schema_tools.node_index_pairs(nf, key))
+
+        identities = sync_tools.node_identities(nf, key)
+        ids, hashes = sync_tools.row_hashes(identities), sync_tools.row_hashes(nf)
+        # the last row wins for nodes listed more than once
+        last = ~pd.Series(ids).duplicated(keep='last').to_numpy()
+        nf, identities, ids, hashes = nf.iloc[last], identities.loc[last], ids[last], hashes[last]
+        manifest = sync_tools.SyncManifest(manifest, table)
+        diff = sync_tools.diff_hashes(ids, hashes, manifest.load())
+
+        parts = [(group, self.statement_cache.get('sync_nodes', lbls, (key,),
+                                                  build=lambda: queries.node_upsert_query(lbls, key)),
+                  'nodes', static_tools.convert_nodes_to_cypher)
+                 for lbls, group in static_tools.group_nodes(nf.iloc[diff.upserts()])]
+        if delete:
+            for (lbls, id_key), group in diff.removed.groupby(['labels', 'key'], sort=False):
+                lbls = sync_tools.split_labels(lbls)
+                parts.append((group, self.statement_cache.get('delete_nodes', lbls, (id_key,),
+                                                              build=lambda: queries.node_delete_query(lbls, id_key)),
+                              'nodes', lambda chunk: chunk['value'].tolist()))
+        with self._invalidating():
+            return self._sync('sync_nodes', parts, diff, manifest, ids, hashes, identities, delete,
+                              batch_size, verbose, callback, max_retries)
+
+    def sync_edges(self, ef:EdgeFrame, manifest:str, delete:bool=False, table:str='edges',
+                   batch_size:int=None, verbose:bool=False, callback=None,
+                   max_retries:int=None, create_indexes:bool=True) -> batch_tools.UploadProgress:
+        """Incrementally syncs an EdgeFrame to the graph, as `sync_nodes` does
+        for nodes. Edges are identified by start node, type & end node; new or
+        changed edges are merged (replacing their properties) and, with
+        `delete`, edges synced before but no longer in the frame are deleted
+        (until then, they are kept in the manifest)."""
+        if not ef.ready_for_upload():
             raise ValueError("Edgeframe is not yet ready for upload to Neo4j Graph.")
-        return
+        if create_indexes:
+            self.ensure_indexes(schema_tools.edge_index_pairs(ef))
 
-    def create_node_constraints(self, constrs, labels:str='labels', prop_name:str='property'):
-        for c in df_tools.convert_to_records(constrs):
+        identities = sync_tools.edge_identities(ef)
+        ids, hashes = sync_tools.row_hashes(identities), sync_tools.row_hashes(ef)
+        last = ~pd.Series(ids).duplicated(keep='last').to_numpy()
+        ef, identities, ids, hashes = ef.iloc[last], identities.loc[last], ids[last], hashes[last]
+        manifest = sync_tools.SyncManifest(manifest, table)
+        diff = sync_tools.diff_hashes(ids, hashes, manifest.load())
+
+        parts = [(group, self.statement_cache.get('sync_edges', keys=group_key,
+                                                  build=lambda: queries.edge_merge_query(*group_key, replace=True)),
+                  'edges', static_tools.convert_edges_to_cypher)
+                 for group_key, group in static_tools.group_edges(ef.iloc[diff.upserts()])]
+        if delete:
+            columns = ['start_labels', 'start_key', 'rel', 'end_labels', 'end_key']
+            for (s, sk, rel, e, ek), group in diff.removed.groupby(columns, sort=False):
+                group_key = (sync_tools.split_labels(s), sk, rel, sync_tools.split_labels(e), ek)
+                parts.append((group, self.statement_cache.get('delete_edges', keys=group_key,
+                                                              build=lambda: queries.edge_delete_query(*group_key)),
+                              'edges', lambda chunk: [{'start_id': s, 'end_id': e} for s, e in
+                                                      zip(chunk['start_value'].tolist(), chunk['end_value'].tolist())]))
+        with self._invalidating(ef):
+            return self._sync('sync_edges', parts, diff, manifest, ids, hashes, identities, delete,
+                              batch_size, verbose, callback, max_retries)
+
+    ## Upserts, updates & deletes -----
+    def _node_key(self, nf:NodeFrame, key:str=None) -> str:
+        """Column identifying nodes (with their labels): `key`, or the id column."""
+        key = (getattr(nf, 'id_col', None) if key is None else key)
+        if key is None or key not in nf:
+            raise ValueError("Nodes require a key column; set the NodeFrame's id column or pass `key`.")
+        if nf[key].isna().any():
+            raise ValueError("Key column '{}' contains missing values.".format(key))
+        return key
+
+    def _write_parts(self, operation:str, parts:list, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Writes upsert, update or delete parts batch by batch. With
+        `server_batch_size`, every batch is sent as a single auto-commit
+        statement that the server commits in transactions of that many rows."""
+        if server_batch_size:
+            parts = [(frame, queries.in_transactions(query, server_batch_size), key, convert)
+                     for frame, query, key, convert in parts]
+        progress = batch_tools.UploadProgress(sum(len(frame) for frame, _, _, _ in parts),
+                                              self._count_batches(parts, batch_size),
+                                              start=start_batch, verbose=verbose, callback=callback)
+        statements = self._statements(parts, batch_size, start_batch)
+        return self._report(operation, self._write_batches(statements, progress, max_retries=max_retries,
+                                                           autocommit=bool(server_batch_size)))
+
+    def _write_nodes(self, operation:str, nf:NodeFrame, key:str=None, create_indexes:bool=True,
+                     unique:bool=False, **kwargs) -> batch_tools.UploadProgress:
+        if not nf.ready_for_upload():
+            raise ValueError("Nodes DataFrame must contain a 'labels' column of label sets. Use NeonPandas preprocessing first.")
+        key = self._node_key(nf, key)
+        if create_indexes:
+            self.ensure_indexes(schema_tools.node_index_pairs(nf, key), unique=unique)
+        # matched nodes may carry labels beyond the frame's
+        with self._invalidating():
+            return self._write_parts(operation, self._node_write_parts(nf, operation, key), **kwargs)
+
+    def _write_edges(self, operation:str, ef:EdgeFrame, create_indexes:bool=True,
+                     unique:bool=False, **kwargs) -> batch_tools.UploadProgress:
+        if not ef.ready_for_upload():
+            raise ValueError("Edgeframe is not yet ready for upload to Neo4j Graph.")
+        if create_indexes:
+            self.ensure_indexes(schema_tools.edge_index_pairs(ef), unique=unique)
+        with self._invalidating(ef):
+            return self._write_parts(operation, self._edge_write_parts(ef, operation), **kwargs)
+
+    def upsert_nodes(self, nf:NodeFrame, key:str=None, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Merges nodes on their labels & `key` (default: the id column):
+        missing nodes are created and existing ones get the frame's properties
+        set, keeping any others (missing values leave a property as it is).
+        Re-running or resuming an upsert never duplicates nodes.
+
+        Batching, resume & indexes work as in `create_nodes`. With
+        `server_batch_size`, each batch is sent as one auto-commit statement
+        the server commits in transactions of that many rows
+        (`CALL {} IN TRANSACTIONS`), so very large jobs can be sent in a few
+        large batches without holding one huge transaction."""
+        return self._write_nodes('upsert_nodes', nf, key, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    def update_nodes(self, nf:NodeFrame, key:str=None, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Sets the frame's properties on existing nodes, found by labels &
+        `key`, as `upsert_nodes` does; rows without a node are skipped."""
+        return self._write_nodes('update_nodes', nf, key, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    def delete_nodes(self, nf:NodeFrame, key:str=None, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Detach-deletes the nodes found by labels & `key`; only those two
+        columns of the frame are used. Batching as in `upsert_nodes`."""
+        return self._write_nodes('delete_nodes', nf, key, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    def upsert_edges(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Merges relationships on start node, type & end node (nodes by
+        labels & their start/end id), creating missing endpoints. Existing
+        relationships get the frame's properties set, keeping any others.
+        Batching & `server_batch_size` as in `upsert_nodes`."""
+        return self._write_edges('upsert_edges', ef, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    def update_edges(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Sets the frame's properties on existing relationships, as
+        `upsert_edges` does; rows without a relationship are skipped."""
+        return self._write_edges('update_edges', ef, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    def delete_edges(self, ef:EdgeFrame, batch_size:int=None, start_batch:int=0,
+                     verbose:bool=False, callback=None, max_retries:int=None,
+                     create_indexes:bool=True, unique:bool=False,
+                     server_batch_size:int=None) -> batch_tools.UploadProgress:
+        """Deletes the relationships of each row's type between its start &
+        end nodes; endpoint nodes are kept. Batching as in `upsert_nodes`."""
+        return self._write_edges('delete_edges', ef, create_indexes, unique, batch_size=batch_size,
+                                 start_batch=start_batch, verbose=verbose, callback=callback,
+                                 max_retries=max_retries, server_batch_size=server_batch_size)
+
+    ## Profiling -----
+    def profile(self, query:str, params:dict={}) -> metrics_tools.QueryProfile:
+        """Runs a query with PROFILE in an explicit transaction that is rolled
+        back, so writes are planned & executed but never committed. Returns
+        the plan with its database hits per operator."""
+        with self.session() as session:
+            tx = session.begin_transaction()
             try:
-                self.run(queries.create_constraint_query(c.get(labels), c.get(prop_name)))
-            except:
-                raise RuntimeError("Error creating constraint on attr {lbls}.".format(c.get(labels)))
-        return
-
-    def semi_join(self, df, on:str, labels={}) -> NodeFrame:
-        result = self.run(queries.bulk_node_exists_query(labels=labels, field=on), 
-                            {'nodes': df_tools.convert_to_records(df)})
-        df = df_tools.neo_nodes_to_df(result)
-        return NodeFrame(df)
+                result = tx.run('PROFILE ' + query, params)
+                records = list(result)
+                summary = result.consume()
+            finally:
+                tx.close()
+        return metrics_tools.QueryProfile(query, summary.profile, len(records),
+                                          batch_tools.summary_counters(summary),
+                                          metrics_tools.server_seconds(summary))
+
+    def profile_upload(self, frame, batch_size:int=None, batch:int=0, engine:str='apoc') -> metrics_tools.QueryProfile:
+        """Profiles one batch (`batch`, of `batch_size` rows) of a NodeFrame or
+        EdgeFrame upload without committing it. Its `rows` are the batch's rows."""
+        _, query, params, rows = self._profile_statement(frame, batch_size, batch, engine)
+        profile = self.profile(query, params)
+        profile.rows = rows
+        return profile
+
+    def indexes(self, refresh:bool=False) -> set:
+        """(label, key) pairs covered by a single-property node index or
+        uniqueness constraint. Cached after the first lookup."""
+        if self._indexed is None or refresh:
+            self._indexed, self._constrained = self._index_pairs(self.read(queries.show_indexes_query()))
+        return self._indexed
+
+    def constraints(self, refresh:bool=False) -> set:
+        """(label, key) pairs covered by a uniqueness constraint."""
+        self.indexes(refresh)
+        return self._constrained
+
+    def ensure_indexes(self, pairs:set, unique:bool=False, wait:bool=True, timeout:int=300) -> set:
+        """Creates an index (or uniqueness constraint) for each (label, key)
+        pair not already indexed, then waits for new indexes to come online.
+        With `unique`, only existing constraints count and a plain index on
+        a pair raises a RuntimeError. Returns the pairs that were created."""
+        self.indexes()
+        missing = self._missing_indexes(pairs, unique)
+        for label, key in sorted(missing):
+            try:
+                self.run(queries.create_index_query(label, key, unique=unique))
+            except Exception as e:
+                raise RuntimeError("Error creating index on :{}({}).".format(label, key)) from e
+        if missing and wait:
+            self.read(queries.await_indexes_query(), {'timeout': timeout})
+        self._indexed.update(missing)
+        if unique:
+            self._constrained.update(missing)
+        if missing and self.result_cache is not None:
+            self.result_cache.invalidate({frozenset([label]) for label, _ in missing})
+        return missing
+
+    def create_node_constraints(self, constrs, labels:str='labels', prop_name:str='property'):
+        """Creates uniqueness constraints from a frame with one row per
+        constraint (labels & property name columns), skipping existing ones."""
+        return self.ensure_indexes(schema_tools.constraint_pairs(constrs, labels, prop_name), unique=True)
+
+    def existing_keys(self, keys, on:str, labels={}, batch_size:int=10000) -> list:
+        """Returns the values in `keys` found as property `on` of nodes with
+        the given labels. Only de-duplicated, non-null keys are sent, in
+        batches of `batch_size`."""
+        found = []
+        for query, params in self._key_batches(keys, on, labels, batch_size):
+            found += [record['key'] for record in self.read(query, params)]
+        return found
+
+    def _exists_mask(self, df, on:str, labels={}, batch_size:int=10000) -> pd.Series:
+        if on not in df:
+            raise ValueError("Column '{}' not in DataFrame.".format(on))
+        return df[on].isin(self.existing_keys(df[on], on, labels, batch_size))
+
+    def semi_join(self, df, on:str, labels={}, batch_size:int=10000) -> NodeFrame:
+        """Rows of `df` whose `on` value exists on a node with the given labels."""
+        df = df.loc[self._exists_mask(df, on, labels, batch_size)]
+        return (df if isinstance(df, NodeFrame) else NodeFrame(df))
         
-    def anti_join(self, df, on:str, labels={}) -> NodeFrame:
-        y = self.semi_join(df, on, labels)
-        df = df_tools.anti_join(df, y[[on]], on=on)
-        return NodeFrame(df)
+    def anti_join(self, df, on:str, labels={}, batch_size:int=10000) -> NodeFrame:
+        """Rows of `df` whose `on` value does not exist on any node with the given labels."""
+        df = df.loc[~self._exists_mask(df, on, labels, batch_size)]
+        return (df if isinstance(df, NodeFrame) else NodeFrame(df))
 
     def match_nodes(self, labels:set={}, properties:dict={}, limit:int=None, *args, **kwargs) -> NodeFrame:
         """Analogous to cypher match query; currently only queries
         for nodes with matching labels and properties, with option 
         to limit number of results. Ability to match relationships
-        needs to be added later."""
-        result = self.run(queries.node_match_query(labels, properties, limit=limit))
-        df = df_tools.neo_nodes_to_df(result)
-        return NodeFrame(df, *args, **kwargs)
\ No newline at end of file
+        needs to be added later. With the Graph's `result_cache`, repeated
+        calls are answered from the cache."""
+        if self.result_cache is not None:
+            return self.result_cache.get('match_nodes', labels, (properties, limit, args, kwargs),
+                                         build=lambda: self._match_nodes(labels, properties, limit, *args, **kwargs))
+        return self._match_nodes(labels, properties, limit, *args, **kwargs)
+
+    def _match_nodes(self, labels:set={}, properties:dict={}, limit:int=None, *args, **kwargs) -> NodeFrame:
+        result = self.read(self._match_statement(labels, properties, limit),
+                          queries.node_match_params(properties, limit))
+        df = df_tools.node_records_to_df(result)
+        return NodeFrame(df, *args, **kwargs)
+
+    def _query_columns(self, query:str, params:dict={}, fetch_size:int=None,
+                       chunk_size:int=100000) -> tuple:
+        """Runs a query in a managed read transaction and returns (keys,
+        columns), with one list of values per returned field."""
+        with self.session(fetch_size=(fetch_size or self.fetch_size)) as session:
+            return self._execute(session, lambda tx, q, p: self._columns(tx, q, p, chunk_size),
+                                 query, params, read=True)
+
+    def _columns(self, tx, query:str, params:dict={}, chunk_size:int=100000) -> tuple:
+        """Unit of work returning (keys, columns). Records are transposed a
+        chunk at a time, so no per-record objects are kept."""
+        result = tx.run(query, params)
+        keys = list(result.keys())
+        columns = [[] for _ in keys]
+        records = result.fetch(chunk_size)
+        while records:
+            # records are tuples; slicing them as such skips Record.__iter__
+            rows = map(tuple.__getitem__, records, itertools.repeat(slice(None)))
+            for col, values in zip(columns, zip(*rows)):
+                col.extend(values)
+            records = result.fetch(chunk_size)
+        return keys, columns
+
+    def query_frame(self, query:str, params:dict={}, expand:list=None, fetch_size:int=None) -> pd.DataFrame:
+        """Runs a cypher query and returns its result as a DataFrame, with one
+        column per returned field. Map-valued fields (e.g. `properties(n)`)
+        in `expand` are split into one column per key; by default, every
+        field holding maps is expanded. Return scalars, lists & maps (e.g.
+        `labels(n)`, `properties(n)`) rather than whole nodes."""
+        keys, columns = self._query_columns(query, params, fetch_size)
+        if expand is None:
+            expand = [k for k, col in zip(keys, columns)
+                      if isinstance(next((v for v in col if v is not None), None), dict)]
+        return df_tools.columns_to_frame(keys, columns, expand)
+
+    def match_edges(self, start_labels:set=None, rel_type:str=None, end_labels:set=None,
+                    start_key:str=None, end_key:str=None, properties:dict={},
+                    rel_properties:list=None, limit:int=None, fetch_size:int=None) -> EdgeFrame:
+        """Analogous to `match_nodes`, for relationships. Returns an EdgeFrame
+        of relationships of `rel_type` (any, by default) between nodes with the
+        given labels and matching relationship `properties`. Endpoints are
+        identified by their `start_key`/`end_key` property, or by element id
+        (as `element_id`). With `rel_properties`, only those properties are
+        returned, skipping per-relationship property maps."""
+        query = self.statement_cache.get('match_edges', keys=(cypher_tools.normalize_labels(start_labels), rel_type,
+                                                              cypher_tools.normalize_labels(end_labels), start_key,
+                                                              end_key, tuple(properties),
+                                                              (tuple(rel_properties) if rel_properties is not None else None),
+                                                              bool(limit)),
+                                         build=lambda: queries.relationship_match_query(
+                                             start_labels, rel_type, end_labels, start_key, end_key,
+                                             properties, rel_properties, limit))
+        keys, columns = self._query_columns(query, queries.node_match_params(properties, limit), fetch_size)
+        if not keys:
+            # no records: keys may not be reported, so build empty columns
+            keys = queries.relationship_match_fields(rel_properties)
+            columns = [[] for _ in keys]
+        df = df_tools.columns_to_frame(keys, columns, expand=('properties',))
+        df = df.rename(columns={'start_id': 'start', 'end_id': 'end'})
+        return EdgeFrame(df, rel_col='rel_type', start_col='start', end_col='end',
+                         start_id=(start_key or 'element_id'), end_id=(end_key or 'element_id'),
+                         start_lbl_col='start_labels', end_lbl_col='end_labels')
+
+    def iter_nodes(self, labels:set={}, properties:dict={}, limit:int=None,
+                    chunk_size:int=10000, fetch_size:int=None, *args, **kwargs):
+        """Streaming version of `match_nodes`. Yields NodeFrame chunks of up to
+        `chunk_size` rows as records arrive, so memory stays bounded by the
+        chunk size. `fetch_size` sets how many records are pulled from the
+        server per batch.
+        Unlike other reads, records stream from an auto-commit query (a
+        managed transaction would hold every record until it returns).
+        Transient errors are retried with backoff until the first chunk is
+        yielded; after that they are raised, as chunks can't be taken back."""
+        query = self._match_statement(labels, properties, limit)
+        params = queries.node_match_params(properties, limit)
+        for attempt in range(self.max_retries + 1):
+            yielded = False
+            try:
+                with self.session(fetch_size=(fetch_size or self.fetch_size),
+                                  default_access_mode=READ_ACCESS) as session:
+                    columns = df_tools.NodeColumns()
+                    for record in session.run(query, params):
+                        columns.append(record['labels'], record['properties'])
+                        if len(columns) >= chunk_size:
+                            yielded = True
+                            yield NodeFrame(columns.to_frame(), *args, **kwargs)
+                            columns = df_tools.NodeColumns()
+                    if len(columns) > 0:
+                        yielded = True
+                        yield NodeFrame(columns.to_frame(), *args, **kwargs)
+                return
+            except TransientError:
+                if yielded or attempt == self.max_retries:
+                    raise
+                time.sleep(0.1 * 2 ** attempt)
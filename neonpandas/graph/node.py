@@ -1,3 +1,4 @@
+import numpy as np
 from pandas import Series
 from neonpandas.utils import cypher_tools
 from neonpandas.utils import df_tools
@@ -21,6 +22,14 @@ class Node:
         else:
             return False
 
+    def __hash__(self) -> int:
+        # equal nodes share key & value (their labels only need to overlap)
+        return hash((self.key, self.value))
+
+    def identity(self) -> tuple:
+        """(label frozenset, key, value): what a NodeRegistry interns."""
+        return (frozenset(self.labels), self.key, self.value)
+
     def shares_labels(self, node) -> bool:
         if isinstance(node.labels, set):
             return (True if self.labels.intersection(node.labels) else False)
@@ -37,21 +46,43 @@ class Node:
         key = (self.key if key is None else key)
         return {key: self.value}
 
-    def match(self, n_lbls:int=None, var:str=None) -> str:
-        print_val = ('"{}"'.format(self.value) if isinstance(self.value, str) else self.value)
-        _lbls = cypher_tools.format_labels(list(self.labels), n=n_lbls)
+    def match(self, n_lbls:int=None, var:str=None, param:str=None) -> str:
+        """Cypher pattern for this node. With `param`, the key value is a
+        `$param` placeholder (see `params`) rather than a literal."""
+        if param is not None:
+            print_val = '${}'.format(param)
+        else:
+            print_val = (cypher_tools.quote_string(self.value) if isinstance(self.value, str) else self.value)
+        _lbls = cypher_tools.format_labels(sorted(self.labels), n=n_lbls, escape=True)
         var = (self.var if var is None else var)
         _template = '({var}{lbls} {{{k}: {v}}})'
-        return _template.format(var=var, lbls=_lbls, k=self.key, v=print_val)
+        return _template.format(var=var, lbls=_lbls, k=cypher_tools.escape_name(self.key), v=print_val)
+
+    def params(self, param:str) -> dict:
+        """Query parameters for a pattern built with `match(param=...)`."""
+        return {param: self.value}
 
 
 def find_match(x:Node, nodes) -> Node:
-    for n in nodes:
-        if x == n:
-            return n
-    return x
+    """Returns the first of `nodes` equal to `x` (same id, a shared label),
+    or `x` itself. `nodes` can be a NodeRegistry (hashed lookup of its
+    interned nodes), a node column or a list of Nodes (one vectorized
+    comparison)."""
+    # node_series builds on this module
+    from neonpandas.series.node_series import NodeArray, NodeRegistry
+    if isinstance(nodes, NodeRegistry):
+        match = nodes.find(x)
+        return (x if match is None else match)
+    nodes = (nodes if hasattr(nodes, 'array') or isinstance(nodes, NodeArray) else list(nodes))
+    matches = np.flatnonzero(NodeArray.coerce(nodes) == x)
+    if len(matches) == 0:
+        return x
+    return (nodes[matches[0]] if isinstance(nodes, list) else NodeArray.coerce(nodes)[matches[0]])
 
 def contains_nodes(col:Series, num:int=3):
+    if str(col.dtype) == 'node':
+        # columnar NodeArray (see neonpandas.series.node_series)
+        return True
     for x in col[:num]:
         if not isinstance(x, Node):
             return False
@@ -1,20 +1,27 @@
+from collections import OrderedDict
+import threading
+import time
 import pandas as pd 
 import numpy as np 
 from neonpandas.utils import cypher_tools
 from neonpandas.utils import df_tools
 
 
-def create_neo_match(labels:set, key:str, value, var:str='n') -> str:
+def create_neo_match(labels:set, key:str, value, var:str='n', param:str=None) -> str:
     """Creates minimal Cypher node MATCH statement required for 
     matching to a specific node. Requires node labels, and key-value
-    pair for identification."""
-    if pd.isnull(labels):
+    pair for identification. With `param`, the value is replaced by a
+    `$param` placeholder (pass the value as a query parameter)."""
+    if not isinstance(labels, (set, frozenset, list, tuple)) and pd.isnull(labels):
         return np.nan
     else:
-        if isinstance(value, str):
-            value = '"{}"'.format(value)
+        if param is not None:
+            value = '${}'.format(param)
+        elif isinstance(value, str):
+            value = cypher_tools.quote_string(value)
         return '({var}{lbls} {{{k}: {v}}})'.format(
-            var=var, lbls=cypher_tools.format_labels(labels), k=key, v=value)
+            var=var, lbls=cypher_tools.format_labels(list(labels), escape=True),
+            k=cypher_tools.escape_name(key), v=value)
 
 def apoc_node_create(key:str='nodes', var:str='n') -> str:
     """Returns cypher query for creating bulk nodes via APOC"""
@@ -29,21 +36,101 @@ def create_constraint_query(labels, property_name:str) -> str:
     ASSERT n.{prop_name}
     IS UNIQUE""".format(lbls=cypher_tools.format_labels(labels), prop_name=property_name)
 
+def show_indexes_query() -> str:
+    """Returns query listing existing indexes (including constraint-backed ones)."""
+    return """SHOW INDEXES
+    YIELD name, type, entityType, labelsOrTypes, properties, state, owningConstraint"""
+
+def create_index_query(label:str, key:str, unique:bool=False) -> str:
+    """Returns query creating a single-property node index, or a
+    uniqueness constraint (which is backed by an index)."""
+    if unique:
+        return 'CREATE CONSTRAINT IF NOT EXISTS FOR (n:{lbl}) REQUIRE n.{key} IS UNIQUE'.format(
+            lbl=cypher_tools.escape_name(label), key=cypher_tools.escape_name(key))
+    return 'CREATE INDEX IF NOT EXISTS FOR (n:{lbl}) ON (n.{key})'.format(
+        lbl=cypher_tools.escape_name(label), key=cypher_tools.escape_name(key))
+
+def await_indexes_query() -> str:
+    """Returns query blocking until all indexes are online."""
+    return 'CALL db.awaitIndexes($timeout)'
+
+
+def node_columns(var:str='n') -> str:
+    """Returns node labels & properties as separate columns, so results
+    can be decoded without building neo4j Node objects."""
+    return 'labels({var}) AS labels, properties({var}) AS properties'.format(var=var)
 
 def bulk_node_exists_query(field:str, labels:str=None, only_field:bool=False) -> str:
+    field = cypher_tools.escape_name(field)
     query =  """UNWIND $nodes AS node
     MATCH (n{lbls} {{ {field}: node.{field} }})
-    RETURN n""".format(lbls=cypher_tools.format_labels(labels), field=field)
+    RETURN """.format(lbls=cypher_tools.format_labels(cypher_tools.normalize_labels(labels), escape=True), field=field)
     if only_field is True:
-        return query + '.{field} AS {field}'.format(field=field)
+        return query + 'n.{field} AS {field}'.format(field=field)
     else:
-        return query
+        return query + node_columns()
+
+def bulk_key_exists_query(field:str, labels:str=None, key:str='keys') -> str:
+    """Returns the distinct values of `field`, from a list of key values,
+    that exist on nodes with the given labels."""
+    field = cypher_tools.escape_name(field)
+    return """UNWIND ${key} AS key
+    MATCH (n{lbls} {{ {field}: key }})
+    RETURN DISTINCT n.{field} AS key""".format(
+        key=key, lbls=cypher_tools.format_labels(cypher_tools.normalize_labels(labels), escape=True), field=field)
 
 def node_match_query(labels:set=None, properties:dict={}, limit:int=None) -> str:
-    labels, properties = cypher_tools.format_labels(labels), cypher_tools.format_properties(properties)
-    q = """MATCH (n{lbls} {{ {props} }}) RETURN n""".format(lbls=labels, props=properties)
+    """Returns a parameterized MATCH statement for nodes with the given labels
+    and property keys. Property values (and limit) are not part of the text;
+    pass them with `node_match_params`."""
+    labels = cypher_tools.format_labels(cypher_tools.normalize_labels(labels), escape=True)
+    props = cypher_tools.format_parameters(list(properties))
+    q = """MATCH (n{lbls}{props}) RETURN {cols}""".format(
+        lbls=labels, props=(' {{{}}}'.format(props) if props else ''), cols=node_columns())
+    if limit:
+        q += ' LIMIT $limit'
+    return q
+
+def node_match_params(properties:dict={}, limit:int=None) -> dict:
+    """Parameters for the statement built by `node_match_query`."""
+    params = cypher_tools.property_params(properties)
+    if limit:
+        params['limit'] = limit
+    return params
+
+
+def _node_id(var:str, key:str=None) -> str:
+    return ('{}.{}'.format(var, cypher_tools.escape_name(key)) if key else 'elementId({})'.format(var))
+
+def relationship_match_fields(rel_properties:list=None) -> list:
+    """The fields returned by `relationship_match_query`."""
+    fields = ['start_labels', 'start_id', 'rel_type', 'end_labels', 'end_id']
+    return fields + (['properties'] if rel_properties is None else list(rel_properties))
+
+def relationship_match_query(start_lbls=None, rel_type:str=None, end_lbls=None, start_key:str=None,
+                             end_key:str=None, properties:dict={}, rel_properties:list=None,
+                             limit:int=None) -> str:
+    """Returns a parameterized MATCH statement for relationships, returning
+    endpoint labels & ids (the `start_key`/`end_key` property, or the element
+    id), the type and the properties as separate columns. With
+    `rel_properties`, only those properties are returned, as scalar columns.
+    Property values (and limit) are passed with `node_match_params`."""
+    props = cypher_tools.format_parameters(list(properties))
+    if rel_properties is None:
+        rel_columns = 'properties(rel) AS properties'
+    else:
+        rel_columns = ', '.join('rel.{p} AS {p}'.format(p=cypher_tools.escape_name(p)) for p in rel_properties)
+    q = """MATCH (s{start_lbls})-[rel{rel_type}{props}]->(e{end_lbls})
+    RETURN labels(s) AS start_labels, {start_id} AS start_id, type(rel) AS rel_type,
+    labels(e) AS end_labels, {end_id} AS end_id{rel_columns}""".format(
+        start_lbls=cypher_tools.format_labels(cypher_tools.normalize_labels(start_lbls), escape=True),
+        end_lbls=cypher_tools.format_labels(cypher_tools.normalize_labels(end_lbls), escape=True),
+        rel_type=(':{}'.format(cypher_tools.escape_name(rel_type)) if rel_type else ''),
+        props=(' {{{}}}'.format(props) if props else ''),
+        start_id=_node_id('s', start_key), end_id=_node_id('e', end_key),
+        rel_columns=(', ' + rel_columns if rel_columns else ''))
     if limit:
-        q += ' LIMIT {}'.format(limit)
+        q += ' LIMIT $limit'
     return q
 
 
@@ -54,4 +141,307 @@ def apoc_edge_create(key:str='edges') -> str:
     CALL apoc.merge.node(edge.end_lbls, edge.end_id) YIELD node AS end
     WITH start, end, edge
     CALL apoc.merge.relationship(start, edge.rel_type, edge.properties, {{}}, end) YIELD rel
-    RETURN NULL""".format(key=key)
\ No newline at end of file
+    RETURN NULL""".format(key=key)
+
+## Columnar (APOC) queries. The payload is a single map of parallel lists
+## (see `columnar_tools`); rows are rebuilt by index, with null properties
+## dropped.
+def _columnar_properties(batch:str, index:str) -> str:
+    return 'apoc.map.clean(apoc.map.fromLists({b}.keys, [c IN {b}.columns | c[{i}]]), [], [null])'.format(
+        b=batch, i=index)
+
+def columnar_node_create(key:str='nodes') -> str:
+    """Returns cypher query for creating bulk nodes via APOC from a
+    columnar payload."""
+    return """WITH ${key} AS batch
+    UNWIND range(0, size(batch.label_codes) - 1) AS i
+    CALL apoc.create.node(batch.labels[batch.label_codes[i]], {props}) YIELD node
+    RETURN COUNT(node)""".format(key=key, props=_columnar_properties('batch', 'i'))
+
+def columnar_edge_create(key:str='edges') -> str:
+    """Returns cypher query for merging bulk relationships (and their
+    endpoint nodes) via APOC from a columnar payload."""
+    return """WITH ${key} AS batch
+    UNWIND range(0, size(batch.type_codes) - 1) AS i
+    CALL apoc.merge.node(batch.labels[batch.start_labels[i]],
+        apoc.map.fromLists([batch.id_keys[batch.start_keys[i]]], [batch.start_ids[i]])) YIELD node AS start
+    WITH batch, i, start
+    CALL apoc.merge.node(batch.labels[batch.end_labels[i]],
+        apoc.map.fromLists([batch.id_keys[batch.end_keys[i]]], [batch.end_ids[i]])) YIELD node AS end
+    WITH batch, i, start, end
+    CALL apoc.merge.relationship(start, batch.types[batch.type_codes[i]], {props}, {{}}, end) YIELD rel
+    RETURN NULL""".format(key=key, props=_columnar_properties('batch', 'i'))
+
+
+## Static (label-grouped) queries. These do not require APOC, and since
+## labels & types are written into the query text, each group's statement
+## is cached by the planner and can use indexes.
+def node_create_query(labels, key:str='nodes', var:str='n') -> str:
+    """Returns cypher query for creating bulk nodes sharing a label set."""
+    return """UNWIND ${key} AS props
+    CREATE ({var}{lbls})
+    SET {var} = props
+    RETURN COUNT({var})""".format(key=key, var=var, lbls=cypher_tools.format_labels(sorted(labels), escape=True))
+
+def node_merge_query(labels, id_key:str, key:str='nodes', var:str='n') -> str:
+    """Returns cypher query merging bulk nodes sharing a label set by their
+    identifying key; the payload is a list of key values."""
+    return """UNWIND ${key} AS id
+    MERGE ({var}{lbls} {{{id_key}: id}})
+    RETURN COUNT({var})""".format(key=key, var=var, id_key=cypher_tools.escape_name(id_key),
+                                  lbls=cypher_tools.format_labels(sorted(labels), escape=True))
+
+def node_upsert_query(labels, id_key:str, key:str='nodes', var:str='n', replace:bool=True) -> str:
+    """Returns cypher query merging bulk nodes sharing a label set by their
+    identifying key, replacing all of their properties. Without `replace`,
+    the given properties are set and any others are kept."""
+    return """UNWIND ${key} AS props
+    MERGE ({var}{lbls} {{{id_key}: props.{id_key}}})
+    SET {var} {op} props
+    RETURN COUNT({var})""".format(key=key, var=var, op=('=' if replace else '+='),
+                                  id_key=cypher_tools.escape_name(id_key),
+                                  lbls=cypher_tools.format_labels(sorted(labels), escape=True))
+
+def node_update_query(labels, id_key:str, key:str='nodes', var:str='n') -> str:
+    """Returns cypher query setting the given properties on existing nodes
+    sharing a label set, found by their identifying key. Rows without a
+    matching node are skipped."""
+    return """UNWIND ${key} AS props
+    MATCH ({var}{lbls} {{{id_key}: props.{id_key}}})
+    SET {var} += props
+    RETURN COUNT({var})""".format(key=key, var=var, id_key=cypher_tools.escape_name(id_key),
+                                  lbls=cypher_tools.format_labels(sorted(labels), escape=True))
+
+def node_delete_query(labels, id_key:str, key:str='nodes', var:str='n') -> str:
+    """Returns cypher query deleting bulk nodes (and their relationships)
+    sharing a label set, from a list of key values."""
+    return """UNWIND ${key} AS id
+    MATCH ({var}{lbls} {{{id_key}: id}})
+    DETACH DELETE {var}""".format(key=key, var=var, id_key=cypher_tools.escape_name(id_key),
+                                  lbls=cypher_tools.format_labels(sorted(labels), escape=True))
+
+def _edge_query(find:str, start_lbls, start_key:str, rel_type:str, end_lbls, end_key:str, key:str,
+                replace:bool=False) -> str:
+    return """UNWIND ${key} AS edge
+    {find} (s{start_lbls} {{{start_key}: edge.start_id}})
+    {find} (e{end_lbls} {{{end_key}: edge.end_id}})
+    MERGE (s)-[rel:{rel_type}]->(e)
+    SET rel {op} edge.properties
+    RETURN COUNT(rel)""".format(
+        key=key, find=find, op=('=' if replace else '+='), rel_type=cypher_tools.escape_name(rel_type),
+        start_lbls=cypher_tools.format_labels(sorted(start_lbls), escape=True),
+        end_lbls=cypher_tools.format_labels(sorted(end_lbls), escape=True),
+        start_key=cypher_tools.escape_name(start_key), end_key=cypher_tools.escape_name(end_key))
+
+def edge_merge_query(start_lbls, start_key:str, rel_type:str, end_lbls, end_key:str,
+                    key:str='edges', replace:bool=False) -> str:
+    """Returns cypher query for merging bulk relationships of one type
+    between nodes with fixed start & end label sets. With `replace`, the
+    relationship properties are overwritten rather than updated."""
+    return _edge_query('MERGE', start_lbls, start_key, rel_type, end_lbls, end_key, key, replace)
+
+def edge_match_query(start_lbls, start_key:str, rel_type:str, end_lbls, end_key:str,
+                    key:str='edges') -> str:
+    """Same as `edge_merge_query`, but looks up existing start & end nodes
+    (by index) instead of merging them."""
+    return _edge_query('MATCH', start_lbls, start_key, rel_type, end_lbls, end_key, key)
+
+def edge_update_query(start_lbls, start_key:str, rel_type:str, end_lbls, end_key:str,
+                      key:str='edges') -> str:
+    """Returns cypher query setting the given properties on existing
+    relationships of one type, from a list of {start_id, end_id, properties}
+    dicts. Rows without a matching relationship are skipped."""
+    return """UNWIND ${key} AS edge
+    MATCH (s{start_lbls} {{{start_key}: edge.start_id}})-[rel:{rel_type}]->(e{end_lbls} {{{end_key}: edge.end_id}})
+    SET rel += edge.properties
+    RETURN COUNT(rel)""".format(
+        key=key, rel_type=cypher_tools.escape_name(rel_type),
+        start_lbls=cypher_tools.format_labels(sorted(start_lbls), escape=True),
+        end_lbls=cypher_tools.format_labels(sorted(end_lbls), escape=True),
+        start_key=cypher_tools.escape_name(start_key), end_key=cypher_tools.escape_name(end_key))
+
+def edge_delete_query(start_lbls, start_key:str, rel_type:str, end_lbls, end_key:str,
+                    key:str='edges') -> str:
+    """Returns cypher query deleting bulk relationships of one type, from
+    a list of {start_id, end_id} dicts."""
+    return """UNWIND ${key} AS edge
+    MATCH (s{start_lbls} {{{start_key}: edge.start_id}})-[rel:{rel_type}]->(e{end_lbls} {{{end_key}: edge.end_id}})
+    DELETE rel""".format(
+        key=key, rel_type=cypher_tools.escape_name(rel_type),
+        start_lbls=cypher_tools.format_labels(sorted(start_lbls), escape=True),
+        end_lbls=cypher_tools.format_labels(sorted(end_lbls), escape=True),
+        start_key=cypher_tools.escape_name(start_key), end_key=cypher_tools.escape_name(end_key))
+
+def in_transactions(query:str, rows:int) -> str:
+    """Wraps a batched `UNWIND $key AS var ...` statement so the server
+    commits it in transactions of `rows` rows (`CALL {} IN TRANSACTIONS`).
+    The statement must then run in an auto-commit transaction."""
+    lines = [line.strip() for line in query.strip().splitlines()]
+    unwind, body = lines[0], lines[1:]
+    if not unwind.startswith('UNWIND ') or ' AS ' not in unwind:
+        raise ValueError("Only UNWIND statements can be run in transactions.")
+    # a unit subquery returns nothing; counters come from the summary
+    if body and body[-1].startswith('RETURN '):
+        body = body[:-1]
+    return """{unwind}
+    CALL {{
+        WITH {var}
+        {body}
+    }} IN TRANSACTIONS OF {rows} ROWS""".format(unwind=unwind, var=unwind.rsplit(' AS ', 1)[1],
+                                               body='\n        '.join(body), rows=int(rows))
+
+
+class StatementCache:
+    """LRU cache of generated statement templates, keyed by (operation,
+    labels, keys). Since values are sent as parameters, repeated calls reuse
+    both the statement string and the server's cached query plan."""
+    def __init__(self, maxsize:int=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __repr__(self):
+        return '<StatementCache {} statements, {} hits, {} misses>'.format(len(self), self.hits, self.misses)
+
+    def get(self, operation:str, labels=None, keys=(), build=None) -> str:
+        """Returns the cached statement, calling `build()` to create it on a miss."""
+        key = (operation, cypher_tools.normalize_labels(labels), tuple(keys))
+        with self._lock:
+            if key in self._statements:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return self._statements[key]
+            self.misses += 1
+        statement = build()
+        with self._lock:
+            self._statements[key] = statement
+            if self.maxsize is not None and len(self._statements) > self.maxsize:
+                self._statements.popitem(last=False)
+        return statement
+
+    def clear(self):
+        with self._lock:
+            self._statements.clear()
+
+
+def _freeze(value):
+    """Hashable, order-independent form of a parameter value."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ResultCache:
+    """LRU cache of query results (e.g. `Graph.match_nodes` frames), keyed by
+    (operation, labels, parameters). Entries expire after `ttl` seconds and
+    the cache holds at most `maxsize` entries and (with `max_bytes`) about
+    that many bytes of frames. Writes invalidate the entries they may have
+    changed (see `invalidate`); results are returned as copies."""
+    def __init__(self, maxsize:int=128, ttl:float=None, max_bytes:int=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.nbytes = 0
+        # entries: key -> (labels, result, size, expiry)
+        self._entries = OrderedDict()
+        # bumped by every invalidation; results read before one are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<ResultCache {} entries, {} bytes, {} hits, {} misses>'.format(
+            len(self), self.nbytes, self.hits, self.misses)
+
+    def stats(self) -> dict:
+        """Entry & byte counts and hit, miss, eviction, expiration &
+        invalidation counters."""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.nbytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'invalidations': self.invalidations}
+
+    def get(self, operation:str, labels=None, params=(), build=None):
+        """Returns (a copy of) the cached result, calling `build()` to
+        create it on a miss or after expiry."""
+        labels = cypher_tools.normalize_labels(labels)
+        key = (operation, labels, _freeze(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] is not None and entry[3] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy()
+            self.misses += 1
+            generation = self._generation
+        result = build()
+        size = _result_size(result)
+        with self._lock:
+            # skip results that may predate a write, or that could never fit
+            if generation == self._generation and (self.max_bytes is None or size <= self.max_bytes):
+                if key in self._entries:
+                    self._remove(key)
+                expiry = (time.monotonic() + self.ttl if self.ttl is not None else None)
+                self._entries[key] = (labels, result, size, expiry)
+                self.nbytes += size
+                self._evict()
+        return result.copy()
+
+    def invalidate(self, label_sets=None) -> int:
+        """Drops entries whose results may include new nodes with exactly
+        one of the given label sets: those matching a subset of a label set
+        (an entry without labels matches every node). This only holds for
+        writes creating nodes; for writes to existing nodes, which may carry
+        other labels too, pass no `label_sets` to drop every entry. Returns
+        the number of entries dropped."""
+        with self._lock:
+            self._generation += 1
+            if label_sets is None:
+                keys = list(self._entries)
+            else:
+                label_sets = [frozenset(s) for s in label_sets]
+                keys = [key for key, entry in self._entries.items()
+                        if any(s.issuperset(entry[0]) for s in label_sets)]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        self.invalidate()
+
+    def _remove(self, key):
+        self.nbytes -= self._entries.pop(key)[2]
+
+    def _evict(self):
+        while self._entries and ((self.maxsize is not None and len(self._entries) > self.maxsize)
+                                 or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self.nbytes -= self._entries.popitem(last=False)[1][2]
+            self.evictions += 1
+
+
+def _result_size(result) -> int:
+    """Approximate memory use of a cached result, in bytes."""
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    return 0
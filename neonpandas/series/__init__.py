@@ -1,2 +1,3 @@
 from .label_series import *
-from .rel_series import *
\ No newline at end of file
+from .rel_series import *
+from .node_series import *
@@ -1 +1,365 @@
-## build LabelSeries Class here
\ No newline at end of file
+import numbers
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from pandas.api.extensions import ExtensionArray, ExtensionDtype
+from pandas.api.extensions import register_extension_dtype, register_series_accessor
+from pandas.api.extensions import take as pd_take
+
+## Node Labels -----
+## Label sets are stored as a vocabulary of labels plus an integer bitmask per
+## row (bit i set <=> row has vocabulary[i]). Masks are uint64 for up to 64
+## distinct labels and Python ints beyond that. A missing label set is empty.
+
+_MAX_UINT_LABELS = 64
+
+
+def _mask_dtype(num_labels:int):
+    return (np.uint64 if num_labels <= _MAX_UINT_LABELS else object)
+
+def _as_label_set(x) -> frozenset:
+    if isinstance(x, (set, frozenset, list, tuple)):
+        return frozenset(x)
+    elif isinstance(x, str):
+        return frozenset([x])
+    elif x is None or pd.isna(x):
+        return frozenset()
+    else:
+        raise ValueError("Labels must be str, list, tuple or set type.")
+
+
+@register_extension_dtype
+class LabelDtype(ExtensionDtype):
+    """Pandas dtype for columns of node label sets."""
+    name = 'labels'
+    type = set
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(cls):
+        return LabelArray
+
+
+class LabelArray(ExtensionArray):
+    """Array of label sets, encoded as bitmasks over a label vocabulary."""
+    _dtype = LabelDtype()
+
+    def __init__(self, masks, vocabulary:tuple):
+        self._vocabulary = tuple(vocabulary)
+        self._masks = np.asarray(masks, dtype=_mask_dtype(len(self._vocabulary)))
+
+    ## Constructors -----
+    @classmethod
+    def from_sets(cls, values, vocabulary:tuple=()):
+        """Encodes an iterable of label collections (set, list, str or None).
+        Each distinct label object (or list of labels) is only converted once."""
+        vocab = {lbl: i for i, lbl in enumerate(vocabulary)}
+        distinct, row_masks = {}, []
+        for x in values:
+            # lists (e.g. labels decoded from query results) are new objects
+            # per row, so they are looked up by content instead of identity
+            key = (tuple(x) if isinstance(x, list) else id(x))
+            if key not in distinct:
+                mask = 0
+                for lbl in sorted(_as_label_set(x)):
+                    mask |= 1 << vocab.setdefault(lbl, len(vocab))
+                distinct[key] = (x, mask)  # keep x alive so its id stays unique
+            row_masks.append(distinct[key][1])
+        masks = np.empty(len(row_masks), dtype=_mask_dtype(len(vocab)))
+        masks[:] = row_masks
+        return cls(masks, tuple(vocab))
+
+    @classmethod
+    def from_labels(cls, labels, length:int):
+        """Array of `length` rows, each holding the same label set."""
+        vocabulary = tuple(sorted(_as_label_set(labels)))
+        masks = np.empty(length, dtype=_mask_dtype(len(vocabulary)))
+        masks[:] = (1 << len(vocabulary)) - 1
+        return cls(masks, vocabulary)
+
+    @classmethod
+    def coerce(cls, col):
+        """Returns the LabelArray behind a column, encoding a column of
+        label sets if needed."""
+        array = getattr(col, 'array', col)
+        return (array if isinstance(array, cls) else cls.from_sets(array))
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy:bool=False):
+        if isinstance(scalars, cls):
+            return (scalars.copy() if copy else scalars)
+        return cls.from_sets(scalars)
+
+    @classmethod
+    def _from_factorized(cls, uniques, original):
+        return cls(uniques, original._vocabulary)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        to_concat = list(to_concat)
+        vocabulary = []
+        for a in to_concat:
+            vocabulary += [lbl for lbl in a._vocabulary if lbl not in vocabulary]
+        return cls(np.concatenate([a.with_vocabulary(vocabulary)._masks for a in to_concat]), vocabulary)
+
+    ## ExtensionArray interface -----
+    @property
+    def dtype(self) -> LabelDtype:
+        return self._dtype
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            return self.mask_to_set(self._masks[item])
+        item = pd.api.indexers.check_array_indexer(self, item)
+        return type(self)(self._masks[item], self._vocabulary)
+
+    def __setitem__(self, key, value):
+        key = pd.api.indexers.check_array_indexer(self, key)
+        if isinstance(value, (set, frozenset, str)) or not pd.api.types.is_list_like(value):
+            value = LabelArray.from_labels(value, 1)
+        value = self.coerce(value)
+        vocabulary = list(self._vocabulary) + [lbl for lbl in value._vocabulary if lbl not in self._vocabulary]
+        aligned = self.with_vocabulary(vocabulary)
+        masks = value.with_vocabulary(vocabulary)._masks
+        aligned._masks[key] = (masks[0] if len(masks) == 1 else masks)
+        self._masks, self._vocabulary = aligned._masks, aligned._vocabulary
+
+    def __eq__(self, other):
+        if isinstance(other, (Series, pd.Index, DataFrame)):
+            return NotImplemented
+        if isinstance(other, (set, frozenset, str)):
+            labels = _as_label_set(other)
+            if not labels.issubset(self._vocabulary):
+                return np.zeros(len(self), dtype=bool)
+            return self._masks == self.mask_of(labels)
+        other = self.coerce(other)
+        vocabulary = list(self._vocabulary) + [lbl for lbl in other._vocabulary if lbl not in self._vocabulary]
+        return self.with_vocabulary(vocabulary)._masks == other.with_vocabulary(vocabulary)._masks
+
+    @property
+    def nbytes(self) -> int:
+        return self._masks.nbytes
+
+    def isna(self) -> np.ndarray:
+        return np.zeros(len(self), dtype=bool)
+
+    def take(self, indices, allow_fill:bool=False, fill_value=None):
+        masks = pd_take(self._masks, indices, allow_fill=allow_fill, fill_value=0)
+        return type(self)(masks, self._vocabulary)
+
+    def copy(self):
+        return type(self)(self._masks.copy(), self._vocabulary)
+
+    def _values_for_factorize(self):
+        return self._masks, None
+
+    def unique(self) -> 'LabelArray':
+        """Distinct label sets, in order of first appearance. Factorizes the
+        integer masks, as label sets themselves are unhashable."""
+        _, uniques = pd.factorize(self._masks)
+        return type(self)(uniques, self._vocabulary)
+
+    ## Encoding -----
+    @property
+    def vocabulary(self) -> tuple:
+        return self._vocabulary
+
+    @property
+    def masks(self) -> np.ndarray:
+        return self._masks
+
+    def mask_of(self, labels) -> int:
+        """Bitmask of a label set; labels missing from the vocabulary are ignored."""
+        mask = 0
+        for lbl in _as_label_set(labels):
+            if lbl in self._vocabulary:
+                mask |= 1 << self._vocabulary.index(lbl)
+        return mask
+
+    def mask_to_set(self, mask) -> set:
+        mask = int(mask)
+        return {lbl for i, lbl in enumerate(self._vocabulary) if mask >> i & 1}
+
+    def with_vocabulary(self, vocabulary) -> 'LabelArray':
+        """Re-encodes the masks over another vocabulary (a superset of this one)."""
+        vocabulary = tuple(vocabulary)
+        if vocabulary == self._vocabulary:
+            return self.copy()
+        masks = np.zeros(len(self), dtype=_mask_dtype(len(vocabulary)))
+        for i, lbl in enumerate(self._vocabulary):
+            bit = (self._masks >> i) & 1
+            masks |= bit.astype(masks.dtype) << vocabulary.index(lbl)
+        return type(self)(masks, vocabulary)
+
+    def _bits(self, mask):
+        return np.asarray(mask, dtype=self._masks.dtype)
+
+    ## Vectorized label operations -----
+    def has_label(self, label:str) -> np.ndarray:
+        """Boolean array of rows whose label set contains `label`."""
+        return self.has_any(label)
+
+    def has_any(self, labels) -> np.ndarray:
+        return (self._masks & self._bits(self.mask_of(labels))) != 0
+
+    def has_all(self, labels) -> np.ndarray:
+        labels = _as_label_set(labels)
+        if not labels.issubset(self._vocabulary):
+            return np.zeros(len(self), dtype=bool)
+        mask = self._bits(self.mask_of(labels))
+        return (self._masks & mask) == mask
+
+    def union(self, labels) -> 'LabelArray':
+        """Adds a label set (or a LabelArray, row-wise) to every row."""
+        if isinstance(labels, LabelArray):
+            vocabulary = list(self._vocabulary) + [lbl for lbl in labels._vocabulary if lbl not in self._vocabulary]
+            return type(self)(self.with_vocabulary(vocabulary)._masks | labels.with_vocabulary(vocabulary)._masks,
+                              vocabulary)
+        labels = _as_label_set(labels)
+        vocabulary = list(self._vocabulary) + sorted(labels.difference(self._vocabulary))
+        aligned = self.with_vocabulary(vocabulary)
+        return type(self)(aligned._masks | aligned._bits(aligned.mask_of(labels)), vocabulary)
+
+    def intersection(self, labels) -> 'LabelArray':
+        """Keeps only the given labels (or a LabelArray's labels, row-wise)."""
+        if isinstance(labels, LabelArray):
+            vocabulary = list(self._vocabulary) + [lbl for lbl in labels._vocabulary if lbl not in self._vocabulary]
+            return type(self)(self.with_vocabulary(vocabulary)._masks & labels.with_vocabulary(vocabulary)._masks,
+                              vocabulary)
+        return type(self)(self._masks & self._bits(self.mask_of(labels)), self._vocabulary)
+
+    def label_counts(self) -> Series:
+        """Number of rows carrying each label."""
+        return Series({lbl: int(((self._masks >> i) & 1).astype(bool).sum())
+                       for i, lbl in enumerate(self._vocabulary)}, dtype='int64')
+
+    def label_set_counts(self) -> Series:
+        """Number of rows per distinct label set (indexed by sorted label tuples)."""
+        masks, counts = np.unique(self._masks, return_counts=True)
+        return Series(counts, index=[tuple(sorted(self.mask_to_set(m))) for m in masks]).sort_values(ascending=False)
+
+    def group_indices(self) -> list:
+        """(sorted label tuple, row positions) per distinct label set,
+        in order of first appearance."""
+        codes, uniques = pd.factorize(self._masks)
+        positions = Series(np.arange(len(codes))).groupby(codes).indices
+        return [(tuple(sorted(self.mask_to_set(m))), positions[code]) for code, m in enumerate(uniques)]
+
+    def set_codes(self) -> tuple:
+        """(codes, label lists): a code per row into the distinct label sets
+        (as sorted lists), in order of first appearance."""
+        codes, uniques = pd.factorize(self._masks)
+        return codes, [sorted(self.mask_to_set(m)) for m in uniques]
+
+    def to_lists(self) -> list:
+        """Labels per row as lists, shared between rows with the same label set."""
+        codes, lookup = self.set_codes()
+        return [lookup[c] for c in codes.tolist()]
+
+    def to_frozensets(self) -> list:
+        """Label set per row as frozensets, shared between rows with the same label set."""
+        codes, uniques = pd.factorize(self._masks)
+        lookup = [frozenset(self.mask_to_set(m)) for m in uniques]
+        return [lookup[c] for c in codes.tolist()]
+
+
+class LabelIndex:
+    """Inverted index of a LabelArray: row positions per distinct label set
+    and per label, with label cardinalities. Positions per label are built
+    on first lookup. The index holds on to the masks it was built from, so
+    `is_current` can tell when a column has been written to since."""
+    def __init__(self, array:LabelArray):
+        self.array = array
+        self._masks = array.masks
+        self.codes, self.set_masks = pd.factorize(array.masks)
+        self.set_positions = Series(np.arange(len(self.codes))).groupby(self.codes).indices
+        self.set_sizes = np.bincount(self.codes, minlength=len(self.set_masks))
+        self._positions = {}
+
+    def __repr__(self):
+        return '<LabelIndex {} rows, {} labels, {} label sets>'.format(
+            len(self.codes), len(self.array.vocabulary), len(self.set_masks))
+
+    @staticmethod
+    def _buffer(masks:np.ndarray) -> tuple:
+        return (masks.__array_interface__['data'][0], masks.shape, masks.strides)
+
+    def is_current(self, array:LabelArray) -> bool:
+        """Whether `array` still holds the label sets the index was built on.
+        Writes to a labels column always replace its mask buffer."""
+        return (array.vocabulary == self.array.vocabulary
+                and self._buffer(array.masks) == self._buffer(self._masks))
+
+    def positions(self, labels) -> np.ndarray:
+        """Sorted row positions of rows carrying all of the given labels."""
+        labels = _as_label_set(labels)
+        if labels not in self._positions:
+            if not labels.issubset(self.array.vocabulary):
+                found = np.array([], dtype=np.intp)
+            else:
+                mask = self.array._bits(self.array.mask_of(labels))
+                matches = np.flatnonzero((self.set_masks & mask) == mask)
+                found = (np.sort(np.concatenate([self.set_positions[c] for c in matches]))
+                         if len(matches) > 0 else np.array([], dtype=np.intp))
+            self._positions[labels] = found
+        return self._positions[labels]
+
+    def label_counts(self) -> Series:
+        """Number of rows carrying each label (in vocabulary order)."""
+        return Series({lbl: int(self.set_sizes[((self.set_masks >> i) & 1).astype(bool)].sum())
+                       for i, lbl in enumerate(self.array.vocabulary)}, dtype='int64')
+
+    def groups(self) -> list:
+        """(sorted label tuple, row positions) per distinct label set, in
+        order of first appearance (as `LabelArray.group_indices`)."""
+        return [(tuple(sorted(self.array.mask_to_set(m))), self.set_positions[code])
+                for code, m in enumerate(self.set_masks)]
+
+
+def LabelSeries(data, index=None, name:str='labels') -> Series:
+    """Creates a pandas Series of label sets backed by a LabelArray."""
+    return Series(LabelArray.coerce(data), index=index, name=name)
+
+
+@register_series_accessor('lbl')
+class LabelAccessor:
+    """Label operations on a labels column, e.g. `nf['labels'].lbl.has_label('Pet')`."""
+    def __init__(self, series:Series):
+        self._series = series
+        self._array = LabelArray.coerce(series)
+
+    def _wrap(self, values, name:str=None) -> Series:
+        return Series(values, index=self._series.index, name=(self._series.name if name is None else name))
+
+    @property
+    def vocabulary(self) -> tuple:
+        return self._array.vocabulary
+
+    def has_label(self, label:str) -> Series:
+        return self._wrap(self._array.has_label(label))
+
+    def has_any(self, labels) -> Series:
+        return self._wrap(self._array.has_any(labels))
+
+    def has_all(self, labels) -> Series:
+        return self._wrap(self._array.has_all(labels))
+
+    def union(self, labels) -> Series:
+        return self._wrap(self._array.union(LabelArray.coerce(labels) if isinstance(labels, Series) else labels))
+
+    def intersection(self, labels) -> Series:
+        return self._wrap(self._array.intersection(LabelArray.coerce(labels) if isinstance(labels, Series) else labels))
+
+    def label_counts(self) -> Series:
+        return self._array.label_counts()
+
+    def value_counts(self) -> Series:
+        return self._array.label_set_counts()
+
+    def groups(self) -> dict:
+        """Maps each distinct label set (sorted tuple) to its index labels."""
+        return {lbls: self._series.index[pos] for lbls, pos in self._array.group_indices()}
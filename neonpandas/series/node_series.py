@@ -0,0 +1,396 @@
+import numbers
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype
+from pandas.api.extensions import take as pd_take
+from neonpandas.graph.node import Node
+from neonpandas.series.label_series import LabelArray
+
+## Node Column (in EdgeFrame) -----
+## Node references are stored columnar: a code into a vocabulary of label
+## sets, a code into a vocabulary of key names, and an array of key values.
+## `Node` objects are only created when a single element is accessed.
+
+
+@register_extension_dtype
+class NodeDtype(ExtensionDtype):
+    """Pandas dtype for columns of node references."""
+    name = 'node'
+    type = Node
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(cls):
+        return NodeArray
+
+
+def _factorize_label_sets(labels) -> tuple:
+    """Returns (codes, vocabulary) for an iterable of label collections.
+    Label objects shared between rows are only converted once."""
+    frozen, cache = [], {}
+    for x in labels:
+        if id(x) not in cache:
+            cache[id(x)] = (None if x is None or (not isinstance(x, (set, frozenset, list, tuple, str)) and pd.isna(x))
+                            else frozenset([x] if isinstance(x, str) else x))
+        frozen.append(cache[id(x)])
+    codes, uniques = pd.factorize(pd.Series(frozen, dtype=object), use_na_sentinel=True)
+    return codes.astype(np.int32), tuple(uniques)
+
+def _recode(codes:np.ndarray, vocab:tuple, target:dict) -> np.ndarray:
+    """Maps codes of one vocabulary onto a shared (target) vocabulary,
+    extending the target with any new entries."""
+    mapping = np.empty(len(vocab) + 1, dtype=np.int32)
+    mapping[-1] = -1
+    for i, v in enumerate(vocab):
+        mapping[i] = target.setdefault(v, len(target))
+    return mapping[codes]
+
+
+class NodeArray(ExtensionArray):
+    """Columnar array of node references (label set, key, value)."""
+    _dtype = NodeDtype()
+
+    def __init__(self, codes, label_sets:tuple, key_codes, keys:tuple, values, var:str='n'):
+        self._codes = np.asarray(codes, dtype=np.int32)
+        self._label_sets = tuple(label_sets)
+        self._key_codes = np.asarray(key_codes, dtype=np.int32)
+        self._keys = tuple(keys)
+        self._values = np.asarray(values, dtype=object) if not isinstance(values, np.ndarray) else values
+        self.var = (var if var is not None else 'n')
+
+    ## Constructors -----
+    @classmethod
+    def from_columns(cls, labels, key:str, values, var:str='n'):
+        """Builds a NodeArray from a column of label sets, a key name and
+        a column of key values, without creating per-row Node objects."""
+        label_array = getattr(labels, 'array', labels)
+        if isinstance(label_array, LabelArray):
+            codes, masks = pd.factorize(label_array.masks)
+            codes, label_sets = codes.astype(np.int32), tuple(frozenset(label_array.mask_to_set(m)) for m in masks)
+        else:
+            codes, label_sets = _factorize_label_sets(labels)
+        values = (values.to_numpy() if isinstance(values, Series) else np.asarray(values, dtype=object))
+        key_codes = np.zeros(len(values), dtype=np.int32)
+        key_codes[codes < 0] = -1
+        return cls(codes, label_sets, key_codes, (key,), values, var=var)
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy:bool=False):
+        if isinstance(scalars, cls):
+            return (scalars.copy() if copy else scalars)
+        scalars = list(scalars)
+        missing = [not isinstance(n, Node) for n in scalars]
+        labels = [(None if m else n.labels) for n, m in zip(scalars, missing)]
+        codes, label_sets = _factorize_label_sets(labels)
+        key_codes, keys = pd.factorize(pd.Series([(None if m else n.key) for n, m in zip(scalars, missing)], dtype=object))
+        values = np.empty(len(scalars), dtype=object)
+        for i, (n, m) in enumerate(zip(scalars, missing)):
+            values[i] = (None if m else n.value)
+        var = next((n.var for n, m in zip(scalars, missing) if not m), 'n')
+        return cls(codes, label_sets, key_codes, tuple(keys), values, var=var)
+
+    @classmethod
+    def coerce(cls, col):
+        """Returns the NodeArray behind a column, converting a column of
+        Node objects if needed."""
+        array = getattr(col, 'array', col)
+        return (array if isinstance(array, cls) else cls._from_sequence(array))
+
+    @classmethod
+    def _from_factorized(cls, uniques, original):
+        # uniques are row positions (see `_values_for_factorize`)
+        return original.take(uniques)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        to_concat = list(to_concat)
+        label_sets, keys = {}, {}
+        codes = np.concatenate([_recode(a._codes, a._label_sets, label_sets) for a in to_concat])
+        key_codes = np.concatenate([_recode(a._key_codes, a._keys, keys) for a in to_concat])
+        values = np.concatenate([np.asarray(a._values, dtype=object) for a in to_concat])
+        var = (to_concat[0].var if to_concat else 'n')
+        return cls(codes, tuple(label_sets), key_codes, tuple(keys), values, var=var)
+
+    ## ExtensionArray interface -----
+    @property
+    def dtype(self) -> NodeDtype:
+        return self._dtype
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            code = self._codes[item]
+            if code < 0:
+                return self._dtype.na_value
+            return Node(set(self._label_sets[code]), self._keys[self._key_codes[item]],
+                        self._values[item], var=self.var)
+        item = pd.api.indexers.check_array_indexer(self, item)
+        return type(self)(self._codes[item], self._label_sets, self._key_codes[item],
+                          self._keys, self._values[item], var=self.var)
+
+    def __setitem__(self, key, value):
+        key = pd.api.indexers.check_array_indexer(self, key)
+        if isinstance(value, Node) or not pd.api.types.is_list_like(value):
+            value = [value]
+        value = self.coerce(value)
+        label_sets, keys = {v: i for i, v in enumerate(self._label_sets)}, {v: i for i, v in enumerate(self._keys)}
+        codes = _recode(value._codes, value._label_sets, label_sets)
+        key_codes = _recode(value._key_codes, value._keys, keys)
+        self._codes[key] = (codes[0] if len(codes) == 1 else codes)
+        self._key_codes[key] = (key_codes[0] if len(key_codes) == 1 else key_codes)
+        if self._values.dtype != value._values.dtype:
+            self._values = self._values.astype(object)
+        self._values[key] = (value._values[0] if len(value) == 1 else value._values)
+        self._label_sets, self._keys = tuple(label_sets), tuple(keys)
+
+    def __eq__(self, other):
+        if isinstance(other, (Series, pd.Index, DataFrame)):
+            return NotImplemented
+        if isinstance(other, Node):
+            shares = np.array([bool(s & other.labels) for s in self._label_sets] + [False])
+            same_key = np.array([k == other.key for k in self._keys] + [False])
+            return shares[self._codes] & same_key[self._key_codes] & (self._values == other.value)
+        other = self.coerce(other)
+        if len(other) != len(self):
+            raise ValueError("Lengths must match to compare node columns.")
+        # label sets are compared once per distinct pair of label set codes
+        label_sets, keys = {}, {}
+        codes = _recode(self._codes, self._label_sets, label_sets)
+        other_codes = _recode(other._codes, other._label_sets, label_sets)
+        vocab = list(label_sets)
+        pair_codes, pairs = pd.factorize(codes.astype(np.int64) * (len(vocab) + 1) + other_codes)
+        shares = np.array([(a >= 0 and b >= 0 and bool(vocab[a] & vocab[b]))
+                           for a, b in zip(*divmod(pairs, len(vocab) + 1))], dtype=bool)
+        same_key = (_recode(self._key_codes, self._keys, keys) == _recode(other._key_codes, other._keys, keys))
+        same_value = (np.asarray(self._values, dtype=object) == np.asarray(other._values, dtype=object))
+        return shares[pair_codes] & same_key & same_value
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.nbytes + self._key_codes.nbytes + self._values.nbytes
+
+    def isna(self) -> np.ndarray:
+        return self._codes < 0
+
+    def take(self, indices, allow_fill:bool=False, fill_value=None):
+        if allow_fill and fill_value is not None and not pd.isna(fill_value):
+            raise ValueError("NodeArray can only be filled with missing values.")
+        codes = pd_take(self._codes, indices, allow_fill=allow_fill, fill_value=-1)
+        key_codes = pd_take(self._key_codes, indices, allow_fill=allow_fill, fill_value=-1)
+        values = pd_take(np.asarray(self._values, dtype=object), indices, allow_fill=allow_fill, fill_value=None)
+        return type(self)(codes, self._label_sets, key_codes, self._keys, values, var=self.var)
+
+    def copy(self):
+        return type(self)(self._codes.copy(), self._label_sets, self._key_codes.copy(),
+                          self._keys, self._values.copy(), var=self.var)
+
+    def _values_for_factorize(self):
+        # position of each node's first occurrence, so equal identities
+        # factorize together without building per-row tuples
+        ids = self.node_ids()
+        present = np.flatnonzero(ids >= 0)
+        if len(present) == 0:
+            return np.full(len(ids), -1, dtype=np.int64), -1
+        first = np.zeros(ids.max() + 1, dtype=np.int64)
+        first[ids[present[::-1]]] = present[::-1]
+        return np.where(ids >= 0, first[np.maximum(ids, 0)], -1), -1
+
+    def _hash_pandas_object(self, *, encoding:str, hash_key:str, categorize:bool) -> np.ndarray:
+        return pd.util.hash_pandas_object(self._identity_frame(), index=False, encoding=encoding,
+                                          hash_key=hash_key, categorize=categorize).to_numpy()
+
+    def duplicated(self, keep='first') -> np.ndarray:
+        return Series(self.node_ids()).duplicated(keep=keep).to_numpy()
+
+    def unique(self):
+        return self[~self.duplicated()]
+
+    def node_ids(self) -> np.ndarray:
+        """Dense integer id per row, equal for equal (label set, key, value)
+        identities and numbered in order of first appearance; -1 for
+        missing nodes."""
+        return NodeRegistry().register(self)
+
+    ## Columnar accessors -----
+    def _identity_frame(self) -> DataFrame:
+        """Identity columns per row: sorted labels joined by ':', key & value."""
+        labels = np.array([':'.join(sorted(s)) for s in self._label_sets] + [''], dtype=object)
+        keys = np.array(list(self._keys) + [''], dtype=object)
+        return DataFrame({'labels': labels[self._codes], 'key': keys[self._key_codes],
+                          'value': np.asarray(self._values, dtype=object)})
+
+    def identities(self) -> list:
+        """Returns (label frozenset, key, value) tuples, None for missing nodes."""
+        return [(self._label_sets[c], self._keys[k], v) if c >= 0 else None
+                for c, k, v in zip(self._codes.tolist(), self._key_codes.tolist(), self._values)]
+
+    @property
+    def label_sets(self) -> tuple:
+        """Vocabulary of label sets (frozensets) referenced by `label_codes`."""
+        return self._label_sets
+
+    @property
+    def label_codes(self) -> np.ndarray:
+        return self._codes
+
+    @property
+    def key_names(self) -> tuple:
+        """Vocabulary of key names referenced by `key_codes`."""
+        return self._keys
+
+    @property
+    def key_codes(self) -> np.ndarray:
+        return self._key_codes
+
+    @property
+    def key_values(self) -> np.ndarray:
+        """Array of identifying key values."""
+        return self._values
+
+    def labels(self) -> list:
+        """Label set (frozenset) per row; rows with the same label set share one object."""
+        lookup = list(self._label_sets) + [None]
+        return [lookup[c] for c in self._codes.tolist()]
+
+    def label_lists(self) -> list:
+        """Labels per row as lists, shared between rows with the same label set."""
+        lookup = [list(s) for s in self._label_sets] + [[]]
+        return [lookup[c] for c in self._codes.tolist()]
+
+    def row_keys(self) -> list:
+        """Key name per row."""
+        lookup = list(self._keys) + [None]
+        return [lookup[k] for k in self._key_codes.tolist()]
+
+    def ids(self) -> list:
+        """Identifying {key: value} dict per row (as in `Node.get_id`)."""
+        return [{k: v} for k, v in zip(self.row_keys(), self._values.tolist())]
+
+    def to_frame(self) -> DataFrame:
+        """Returns a DataFrame with a `labels` column (a LabelArray) and
+        one column of values per key name."""
+        # missing nodes (code -1) take the trailing empty label set
+        label_array = LabelArray.from_sets(list(self._label_sets) + [None])
+        data = {'labels': label_array.take(self._codes)}
+        for i, key in enumerate(self._keys):
+            data[key] = np.where(self._key_codes == i, self._values, None)
+        return DataFrame(data)
+
+
+class NodeRegistry:
+    """Interns node identities (label set, key, value) as dense integer ids,
+    numbered in order of registration. Label sets, keys & values are each
+    coded once, so whole node columns are registered & looked up by hashing
+    integer codes; `node(id)` always returns the same Node object for an id."""
+    def __init__(self):
+        self._label_sets, self._keys = {}, {}
+        self._value_vocab = pd.Index([], dtype=object)
+        # per registered node: codes into the three vocabularies
+        self._codes = np.array([], dtype=np.int64)
+        self._key_codes = np.array([], dtype=np.int64)
+        self._value_codes = np.array([], dtype=np.int64)
+        # lookups, rebuilt after registration
+        self._index = None
+        self._by_id = None
+        self._interned = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __repr__(self):
+        return '<NodeRegistry {} nodes>'.format(len(self))
+
+    def __contains__(self, node:Node) -> bool:
+        return self.ids([node])[0] >= 0
+
+    def _combine(self, codes, key_codes, value_codes) -> np.ndarray:
+        """Single int64 per identity, unique for the current vocabularies."""
+        return (codes * len(self._keys) + key_codes) * len(self._value_vocab) + value_codes
+
+    def _identities(self, nodes:NodeArray, register:bool) -> tuple:
+        """(present rows, combined identity of each present row). Without
+        `register`, unknown label sets, keys & values get code -1."""
+        present = ~nodes.isna()
+        label_sets, keys = ((self._label_sets, self._keys) if register
+                            else (dict(self._label_sets), dict(self._keys)))
+        codes = _recode(nodes.label_codes, nodes.label_sets, label_sets)[present].astype(np.int64)
+        key_codes = _recode(nodes.key_codes, nodes.key_names, keys)[present].astype(np.int64)
+        value_codes, values = pd.factorize(nodes.key_values[present], use_na_sentinel=False)
+        mapping = self._value_vocab.get_indexer(values)
+        if register and (mapping < 0).any():
+            self._value_vocab = self._value_vocab.append(pd.Index(values[mapping < 0], dtype=object))
+            mapping = self._value_vocab.get_indexer(values)
+        value_codes = mapping[value_codes].astype(np.int64)
+        if not register:
+            known = (codes < len(self._label_sets)) & (key_codes < len(self._keys)) & (value_codes >= 0)
+            return present, np.where(known, self._combine(codes, key_codes, value_codes), -1)
+        return present, self._combine(codes, key_codes, value_codes)
+
+    def _lookup(self, identities:np.ndarray) -> np.ndarray:
+        if len(self) == 0:
+            return np.full(len(identities), -1, dtype=np.int64)
+        if self._index is None:
+            self._index = pd.Index(self._combine(self._codes, self._key_codes, self._value_codes))
+        return self._index.get_indexer(identities).astype(np.int64)
+
+    def register(self, nodes) -> np.ndarray:
+        """Registers the nodes of a column, returning each row's node id
+        (-1 for missing nodes). Known identities keep their id."""
+        nodes = NodeArray.coerce(nodes)
+        # growing vocabularies change the combined identities of known nodes
+        self._index = None
+        present, identities = self._identities(nodes, register=True)
+        found = self._lookup(identities)
+        new = found < 0
+        if new.any():
+            new_ids, uniques = pd.factorize(identities[new])
+            found[new] = len(self) + new_ids
+            rest, value_codes = np.divmod(uniques, len(self._value_vocab))
+            codes, key_codes = np.divmod(rest, len(self._keys))
+            self._codes = np.concatenate([self._codes, codes])
+            self._key_codes = np.concatenate([self._key_codes, key_codes])
+            self._value_codes = np.concatenate([self._value_codes, value_codes])
+            self._index, self._by_id = None, None
+        ids = np.full(len(nodes), -1, dtype=np.int64)
+        ids[present] = found
+        return ids
+
+    def ids(self, nodes) -> np.ndarray:
+        """Node id of each row of a column, without registering (-1 for
+        missing or unknown nodes)."""
+        nodes = NodeArray.coerce(nodes)
+        present, identities = self._identities(nodes, register=False)
+        ids = np.full(len(nodes), -1, dtype=np.int64)
+        ids[present] = np.where(identities >= 0, self._lookup(identities), -1)
+        return ids
+
+    def nodes(self) -> NodeArray:
+        """All registered nodes, in id order."""
+        return NodeArray(self._codes, tuple(self._label_sets), self._key_codes, tuple(self._keys),
+                         self._value_vocab.to_numpy(dtype=object)[self._value_codes])
+
+    def node(self, node_id:int) -> Node:
+        """The interned Node of an id."""
+        if node_id not in self._interned:
+            self._interned[node_id] = Node(set(list(self._label_sets)[self._codes[node_id]]),
+                                           list(self._keys)[self._key_codes[node_id]],
+                                           self._value_vocab[self._value_codes[node_id]])
+        return self._interned[node_id]
+
+    def find(self, node:Node) -> Node:
+        """Interned node equal to `node` (same id, a shared label), or None.
+        Nodes are hashed by key & value, so only those are compared."""
+        if self._by_id is None:
+            keys, values = list(self._keys), self._value_vocab.to_numpy(dtype=object)
+            self._by_id = {}
+            for i, (k, v) in enumerate(zip(self._key_codes.tolist(), values[self._value_codes].tolist())):
+                self._by_id.setdefault((keys[k], v), []).append(i)
+        label_sets = list(self._label_sets)
+        for i in self._by_id.get((node.key, node.value), []):
+            if label_sets[self._codes[i]] & node.labels:
+                return self.node(i)
+        return None
@@ -1,4 +1,12 @@
 from .apoc_tools import *
+from .static_tools import *
 from .df_tools import *
 from .cypher_tools import *
+from .batch_tools import *
+from .schema_tools import *
+from .sync_tools import *
+from .io_tools import *
+from .admin_tools import *
+from .metrics_tools import *
+from .columnar_tools import *
 from .datetimes import to_datetime, convert_to_neo_datetime
\ No newline at end of file
@@ -0,0 +1,223 @@
+import os
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api import types as ptypes
+from neonpandas.series.label_series import LabelArray
+from neonpandas.series.node_series import NodeArray
+
+#### Functions for writing frames in the `neo4j-admin database import` format ####
+## Every group of rows sharing a header is written as one header file plus
+## data files of up to `chunksize` rows each (written in parallel). Node ids
+## live in one ID space per label (or a single configured space): each label
+## set's primary label, the one carried by the most rows. Labels shared by
+## a whole frame (e.g. `Pet`) name a single space, which relationship
+## endpoints matched on that label resolve to, while nodes without a common
+## label (a Dog & a Person named "Max") keep their ids apart.
+
+ARRAY_DELIMITER = ';'
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def id_spaces(label_sets:list, counts:list, space:str=None) -> list:
+    """ID space of each label set, given the number of rows carrying it:
+    `space` if given, else the set's label carried by the most rows (ties
+    broken by name)."""
+    if space is not None:
+        return [space] * len(label_sets)
+    totals = {}
+    for lbls, n in zip(label_sets, counts):
+        for lbl in lbls:
+            totals[lbl] = totals.get(lbl, 0) + n
+    if any(len(lbls) == 0 for lbls in label_sets):
+        raise ValueError("Admin import requires a label on every node to name its ID space.")
+    return [min(lbls, key=lambda lbl: (-totals[lbl], lbl)) for lbls in label_sets]
+
+def header_id_spaces(path:str, fields=(':ID',)) -> set:
+    """ID spaces named by the given header fields (e.g. ':START_ID') of a header file."""
+    with open(path) as f:
+        header = f.readline().strip().split(',')
+    spaces = set()
+    for h in header:
+        for field in fields:
+            if field + '(' in h:
+                spaces.add(h.split(field + '(', 1)[1].rstrip(')'))
+    return spaces
+
+def _is_list_column(col) -> bool:
+    values = col.dropna()
+    return (col.dtype == object and len(values) > 0 and isinstance(values.iloc[0], (list, tuple)))
+
+def admin_type(col) -> str:
+    """neo4j-admin import type of a column (None for strings)."""
+    dtype = col.dtype
+    if _is_list_column(col):
+        return 'string[]'
+    elif ptypes.is_bool_dtype(dtype):
+        return 'boolean'
+    elif ptypes.is_integer_dtype(dtype):
+        return 'long'
+    elif ptypes.is_float_dtype(dtype):
+        return 'double'
+    elif ptypes.is_datetime64_any_dtype(dtype):
+        return ('datetime' if getattr(dtype, 'tz', None) is not None else 'localdatetime')
+    return None
+
+def property_header(df:DataFrame, columns:list) -> list:
+    """`name:type` header fields of property columns."""
+    fields = []
+    for c in columns:
+        _type = admin_type(df[c])
+        fields.append(str(c) if _type is None else '{}:{}'.format(c, _type))
+    return fields
+
+
+class AdminImport:
+    """Header & data files written for `neo4j-admin database import`. Imports
+    of several frames can be combined with `+`; `command()` gives the full
+    command line."""
+    def __init__(self, nodes:list=None, relationships:list=None):
+        # lists of [header file, data file, ...] groups
+        self.nodes = list(nodes or [])
+        self.relationships = list(relationships or [])
+
+    def __add__(self, other:'AdminImport') -> 'AdminImport':
+        return AdminImport(self.nodes + other.nodes, self.relationships + other.relationships)
+
+    def __repr__(self):
+        return '<AdminImport {} node groups, {} relationship groups>'.format(len(self.nodes), len(self.relationships))
+
+    def __str__(self):
+        return self.command()
+
+    def id_spaces(self) -> set:
+        """ID spaces declared by the node files (read back from their headers)."""
+        return set().union(*[header_id_spaces(files[0]) for files in self.nodes])
+
+    def endpoint_spaces(self) -> set:
+        """ID spaces referenced by the relationship files' START & END ids."""
+        return set().union(*[header_id_spaces(files[0], (':START_ID', ':END_ID')) for files in self.relationships])
+
+    def node_ids(self) -> DataFrame:
+        """`space` & `id` of every node written (read back from the files)."""
+        frames = []
+        for files in self.nodes:
+            header = pd.read_csv(files[0], nrows=0).columns.tolist()
+            col = next(i for i, h in enumerate(header) if ':ID' in h)
+            space = header_id_spaces(files[0]).pop()
+            for path in files[1:]:
+                ids = pd.read_csv(path, header=None, usecols=[col], dtype=str).iloc[:, 0]
+                frames.append(DataFrame({'space': space, 'id': ids}))
+        return (pd.concat(frames, ignore_index=True) if frames else DataFrame(columns=['space', 'id']))
+
+    def check(self):
+        """Raises a ValueError if a relationship endpoint refers to an ID
+        space no node file declares, or if an ID space holds the same id
+        twice (the import would fail or resolve endpoints ambiguously).
+        Node data files are read back, so this takes a pass over them."""
+        missing = self.endpoint_spaces() - self.id_spaces()
+        if missing:
+            raise ValueError("Relationship endpoints refer to ID spaces without node files: {}.".format(
+                ', '.join(sorted(missing))))
+        ids = self.node_ids()
+        duplicated = ids.loc[ids.duplicated(keep='first')].drop_duplicates()
+        if len(duplicated) > 0:
+            raise ValueError("Duplicate node ids within an ID space: {}.".format(
+                ', '.join('{}({})'.format(s, i) for s, i in duplicated.head(10).itertuples(index=False))))
+
+    def command(self, database:str='neo4j', **options) -> str:
+        """Returns the `neo4j-admin database import full` command line.
+        Options are passed as `--name=value` (underscores become dashes)."""
+        args = ['neo4j-admin', 'database', 'import', 'full']
+        args += ['--nodes={}'.format(','.join(files)) for files in self.nodes]
+        args += ['--relationships={}'.format(','.join(files)) for files in self.relationships]
+        options = {'array_delimiter': ARRAY_DELIMITER, 'id_type': 'string', **options}
+        for name, value in options.items():
+            value = (str(value).lower() if isinstance(value, bool) else value)
+            args.append('--{}={}'.format(name.replace('_', '-'), value))
+        args.append(database)
+        return ' '.join(shlex.quote(a) for a in args)
+
+
+def admin_values(df:DataFrame, columns:list) -> DataFrame:
+    """Property columns ready for writing; list values are joined with
+    the array delimiter."""
+    data = df[columns].reset_index(drop=True)
+    for c in columns:
+        if _is_list_column(data[c]):
+            data[c] = data[c].map(lambda x: (ARRAY_DELIMITER.join(map(str, x)) if isinstance(x, (list, tuple)) else x))
+    return data
+
+def write_files(df:DataFrame, header:list, directory:str, prefix:str, chunksize:int=1000000,
+                compress:bool=False, workers:int=4) -> list:
+    """Writes a header file and data files of up to `chunksize` rows each
+    (gzipped with `compress`), `workers` files at a time. Returns the
+    header path followed by the data file paths."""
+    os.makedirs(directory, exist_ok=True)
+    header_path = os.path.join(directory, '{}_header.csv'.format(prefix))
+    DataFrame(columns=header).to_csv(header_path, index=False)
+    chunks = range(0, max(len(df), 1), chunksize)
+    paths = [os.path.join(directory, '{}_part{}.csv{}'.format(prefix, i, ('.gz' if compress else '')))
+             for i in range(len(chunks))]
+
+    def write(i):
+        df.iloc[chunks[i]:chunks[i] + chunksize].to_csv(
+            paths[i], header=False, index=False, date_format=DATE_FORMAT,
+            compression=('gzip' if compress else None))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(write, range(len(chunks))))
+    return [header_path] + paths
+
+def write_nodes(nf:DataFrame, directory:str, id_col:str, lbls_col:str='labels', prefix:str='nodes',
+                chunksize:int=1000000, compress:bool=False, workers:int=4, space:str=None) -> AdminImport:
+    """Writes a NodeFrame as node files, one group per label set, with ids
+    in the label set's ID space (see `id_spaces`) or `space`."""
+    if id_col is None or id_col not in nf:
+        raise ValueError("Admin import of nodes requires an id column.")
+    properties = [c for c in nf.columns if c not in (id_col, lbls_col)]
+    label_groups = LabelArray.coerce(nf[lbls_col]).group_indices()
+    spaces = id_spaces([lbls for lbls, _ in label_groups], [len(pos) for _, pos in label_groups], space)
+    groups = []
+    for i, ((lbls, pos), lbl_space) in enumerate(zip(label_groups, spaces)):
+        header = (['{}:ID({})'.format(id_col, lbl_space)] + property_header(nf, properties) + [':LABEL'])
+        data = admin_values(nf.iloc[pos], [id_col] + properties)
+        data[':LABEL'] = ARRAY_DELIMITER.join(lbls)
+        groups.append(write_files(data, header, directory, '{}_{}'.format(prefix, i),
+                                  chunksize, compress, workers))
+    return AdminImport(nodes=groups)
+
+def endpoint_spaces(start:NodeArray, end:NodeArray, space:str=None) -> tuple:
+    """ID space per row of the start & end nodes of an EdgeFrame, from the
+    endpoint label sets (see `id_spaces`); None for missing nodes."""
+    label_sets = list(start.label_sets) + list(end.label_sets)
+    counts = (np.bincount(start.label_codes[start.label_codes >= 0], minlength=len(start.label_sets)).tolist()
+              + np.bincount(end.label_codes[end.label_codes >= 0], minlength=len(end.label_sets)).tolist())
+    spaces = np.array(id_spaces(label_sets, counts, space) + [None], dtype=object)
+    return (spaces[np.where(start.label_codes >= 0, start.label_codes, -1)],
+            spaces[np.where(end.label_codes >= 0, end.label_codes + len(start.label_sets), -1)])
+
+def write_relationships(ef:DataFrame, directory:str, prefix:str='relationships', chunksize:int=1000000,
+                        compress:bool=False, workers:int=4, space:str=None) -> AdminImport:
+    """Writes an EdgeFrame as relationship files, one group per pair of
+    start & end ID spaces (named as for node files, or a single `space`)."""
+    if ef.rel_col is None:
+        raise ValueError("Admin import of relationships requires a relationship type column.")
+    start, end = (NodeArray.coerce(ef[ef.start_col]), NodeArray.coerce(ef[ef.end_col]))
+    if (start.key_codes < 0).any() or (end.key_codes < 0).any():
+        raise ValueError("Admin import of relationships requires both endpoints of every edge.")
+    properties = [c for c in ef.columns if c not in (ef.start_col, ef.end_col, ef.rel_col)]
+    start_spaces, end_spaces = endpoint_spaces(start, end, space)
+    codes = DataFrame({'start': start_spaces, 'end': end_spaces})
+    groups = []
+    for i, ((s, e), pos) in enumerate(codes.groupby(['start', 'end'], sort=False).indices.items()):
+        group = ef.iloc[pos]
+        data = pd.concat([DataFrame({':START_ID': start.key_values[pos], ':END_ID': end.key_values[pos],
+                                     ':TYPE': group[ef.rel_col].to_numpy()}),
+                          admin_values(group, properties)], axis=1)
+        header = [':START_ID({})'.format(s), ':END_ID({})'.format(e), ':TYPE'] + property_header(ef, properties)
+        groups.append(write_files(data, header, directory, '{}_{}'.format(prefix, i),
+                                  chunksize, compress, workers))
+    return AdminImport(relationships=groups)
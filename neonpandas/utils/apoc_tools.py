@@ -30,10 +30,9 @@ def convert_nodes_to_apoc(nf:NodeFrame, lbls_col:str='labels') -> list:
         via pre-constructed query to Neo4j.
         
     """
-    return [
-        {'labels': df_tools.conform_to_list(r.get(lbls_col)),
-         'properties': {k:v for k,v in r.items() if k != lbls_col}}
-        for r in df_tools.convert_to_records(nf)]
+    labels = df_tools.label_lists(nf[lbls_col])
+    properties = df_tools.iter_records(nf, [c for c in nf.columns if c != lbls_col])
+    return [{'labels': l, 'properties': p} for l, p in zip(labels, properties)]
 
 ## APOC Conversion for EdgeFrames ----
 def convert_edges_to_apoc(ef:EdgeFrame):
@@ -58,18 +57,15 @@ def convert_edges_to_apoc(ef:EdgeFrame):
 
     """
     non_property_columns = [ef.start_col, ef.end_col, ef.rel_col]
-    edge_records = df_tools.convert_to_records(ef)
-    apoc_edges = []
-    for edge_rec in edge_records:
-        start_node = edge_rec.get(ef.start_col)
-        end_node = edge_rec.get(ef.end_col)
-        apoc_data = {
-            'rel_type': edge_rec.get(ef.rel_col),
-            'start_id': start_node.get_id(),
-            'end_id': end_node.get_id(),
-            'start_lbls': list(start_node.labels),
-            'end_lbls': list(end_node.labels),
-            'properties' : {k:v for k,v in edge_rec.items() if k not in non_property_columns}
-        }
-        apoc_edges.append(apoc_data)
-    return apoc_edges
+    properties = df_tools.iter_records(ef, [c for c in ef.columns if c not in non_property_columns])
+    start, end = ef.node_arrays()
+    return [
+        {'rel_type': rel,
+         'start_id': start_id,
+         'end_id': end_id,
+         'start_lbls': start_lbls,
+         'end_lbls': end_lbls,
+         'properties': props}
+        for rel, start_id, end_id, start_lbls, end_lbls, props in zip(
+            ef[ef.rel_col].tolist(), start.ids(), end.ids(), start.label_lists(), end.label_lists(), properties)
+    ]
@@ -0,0 +1,213 @@
+import math
+import time
+import threading
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from neonpandas.series.node_series import NodeArray
+
+## Utility functions for splitting Node & Edge Frames into upload batches.
+
+
+def num_batches(df:DataFrame, batch_size:int=None) -> int:
+    """Returns the number of batches needed to upload a frame."""
+    if batch_size is None or len(df) == 0:
+        return (1 if len(df) > 0 else 0)
+    return math.ceil(len(df) / batch_size)
+
+def iter_batches(df:DataFrame, batch_size:int=None, start:int=0):
+    """Yields (batch number, chunk) pairs of bounded size from a frame.
+    Chunks are positional slices, so NodeFrame/EdgeFrame metadata is
+    carried along. Batches before `start` are skipped, which allows
+    resuming an upload from the last committed batch."""
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer.")
+    size = (len(df) if batch_size is None else batch_size)
+    for batch in range(start, num_batches(df, batch_size)):
+        yield batch, df.iloc[batch * size:(batch + 1) * size]
+
+
+## Lock-aware partitioning for concurrent edge uploads -----
+def node_buckets(nodes:Series, num_buckets:int) -> np.ndarray:
+    """Hashes the identifying key-value pair of each Node into one of
+    `num_buckets` buckets. Labels are ignored, so the same node always
+    lands in the same bucket whether it is a start or end node."""
+    nodes = NodeArray.coerce(nodes)
+    ids = DataFrame({'key': nodes.row_keys(), 'value': Series(nodes.key_values).astype(str)})
+    return (pd.util.hash_pandas_object(ids, index=False).to_numpy() % num_buckets).astype(np.int64)
+
+def schedule_rounds(num_buckets:int) -> np.ndarray:
+    """Round-robin schedule over bucket pairs. Returns a matrix where entry
+    (i, j) is the round in which edges between buckets i & j are written.
+    Cells sharing a round never share a bucket, so their edges never
+    touch the same node."""
+    if num_buckets % 2 != 0:
+        raise ValueError("'num_buckets' must be even.")
+    rounds = np.zeros((num_buckets, num_buckets), dtype=np.int64)
+    teams = list(range(num_buckets))
+    for r in range(num_buckets - 1):
+        for i in range(num_buckets // 2):
+            a, b = teams[i], teams[num_buckets - 1 - i]
+            rounds[a, b] = rounds[b, a] = r
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    # edges within a single bucket get a final round of their own
+    rounds[np.arange(num_buckets), np.arange(num_buckets)] = num_buckets - 1
+    return rounds
+
+def schedule_lanes(num_buckets:int, workers:int) -> np.ndarray:
+    """Lane of each bucket pair within its round (see `schedule_rounds`).
+    The cells of a round are dealt out to `workers` lanes, so lanes never
+    share a bucket either."""
+    rounds = schedule_rounds(num_buckets)
+    lanes = np.zeros_like(rounds)
+    for r in range(num_buckets):
+        a, b = np.nonzero(np.triu(rounds == r))
+        lanes[a, b] = lanes[b, a] = np.arange(len(a)) % workers
+    return lanes
+
+def edge_slots(ef:DataFrame, workers:int) -> np.ndarray:
+    """Round & lane of each edge of an EdgeFrame in a concurrent upload,
+    as `round * workers + lane`. Within a round, no two lanes share a start
+    or end node, so their relationship merges do not contend for the same
+    node locks. Slots only depend on the endpoints, so the groups of a frame
+    (e.g. `static_tools.group_edges`) are slotted consistently."""
+    num_buckets = 2 * workers
+    start = node_buckets(ef[ef.start_col], num_buckets)
+    end = node_buckets(ef[ef.end_col], num_buckets)
+    return schedule_rounds(num_buckets)[start, end] * workers + schedule_lanes(num_buckets, workers)[start, end]
+
+
+class BatchUploadError(RuntimeError):
+    """Raised when a batch fails to commit. All batches before `batch`
+    were committed, so the upload can be resumed with `start_batch=batch`
+    (and `start_chunk=chunk`, for uploads streamed from a file). With
+    concurrent lanes, `failed` is the batch that raised, and later batches
+    may have committed before the other lanes stopped: `skip` holds them,
+    to be passed as `skip_batches` when resuming."""
+    def __init__(self, batch:int, error:Exception, chunk:int=None, skip=(), failed:int=None):
+        self.batch = batch
+        self.error = error
+        self.chunk = chunk
+        self.skip = sorted(skip)
+        self.failed = (batch if failed is None else failed)
+        resume = ('start_batch={}'.format(batch) if chunk is None
+                  else 'start_chunk={}, start_batch={}'.format(chunk, batch))
+        if self.skip:
+            resume += ', skip_batches={}'.format(self.skip)
+        where = ('Batch {}'.format(self.failed) if chunk is None
+                 else 'Batch {} of chunk {}'.format(self.failed, chunk))
+        msg = "{} failed to commit ({}). Resume upload with {}.".format(where, error, resume)
+        super(BatchUploadError, self).__init__(msg)
+
+
+def resume_error(errors:list, progress:'UploadProgress', skip=()) -> BatchUploadError:
+    """Error for an upload whose concurrent lanes failed: resumes from the
+    first batch that did not commit and skips the later ones that did."""
+    first = min(errors, key=lambda e: getattr(e, 'batch', float('inf')))
+    done = set(skip) | {b['batch'] for b in progress.batches}
+    resume = progress.start
+    while resume in done:
+        resume += 1
+    return BatchUploadError(resume, getattr(first, 'error', first),
+                            skip=[b for b in done if b > resume], failed=getattr(first, 'batch', None))
+
+
+# write counters collected from each batch's result summary
+COUNTERS = ('nodes_created', 'nodes_deleted', 'relationships_created',
+            'relationships_deleted', 'properties_set', 'labels_added')
+
+# phases of a batch upload: building parameters from the frame, the write
+# round trip (serialization, network & server), and the server's share of it
+PHASES = ('convert', 'write', 'server')
+
+def summary_counters(summary) -> dict:
+    """Returns the write counters of a neo4j ResultSummary as a dict."""
+    counters = getattr(summary, 'counters', None)
+    return {c: getattr(counters, c, 0) for c in COUNTERS}
+
+
+class UploadProgress:
+    """Tracks committed batches, rows and throughput of an upload."""
+    def __init__(self, total_rows:int, num_batches:int, start:int=0,
+                verbose:bool=False, callback=None):
+        self.total_rows = total_rows
+        self.num_batches = num_batches
+        self.start = start
+        self.verbose = verbose
+        self.callback = callback
+        self.batches = []
+        self.counters = {c: 0 for c in COUNTERS}
+        # seconds spent per phase, summed over batches (see `update`)
+        self.timings = {p: 0.0 for p in PHASES}
+        self.payload_bytes = 0
+        self.report = {}
+        self._lock = threading.Lock()
+        self.last_committed = start - 1
+        self._started = time.perf_counter()
+
+    def __repr__(self):
+        return '<UploadProgress {}/{} batches, {} rows, {:.1f} rows/s>'.format(
+            self.committed_batches(), self.num_batches, self.rows(), self.rows_per_second())
+
+    def update(self, batch:int, rows:int, seconds:float, counters:dict=None,
+               timings:dict=None, payload_bytes:int=None) -> dict:
+        """Records a committed batch (with its write counters, phase timings
+        & payload size, where measured) and reports it."""
+        report = {
+            'batch': batch,
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_second': (rows / seconds if seconds > 0 else float('inf'))
+        }
+        report.update({'{}_seconds'.format(p): t for p, t in (timings or {}).items()})
+        if payload_bytes is not None:
+            report['payload_bytes'] = payload_bytes
+        with self._lock:
+            self.batches.append(report)
+            self.last_committed = max(self.last_committed, batch)
+            for c, n in (counters or {}).items():
+                self.counters[c] = self.counters.get(c, 0) + n
+            for p, t in (timings or {}).items():
+                self.timings[p] = self.timings.get(p, 0.0) + t
+            self.payload_bytes += (payload_bytes or 0)
+        if self.verbose:
+            print('batch {}/{}: {} rows in {:.3f}s ({:.1f} rows/s)'.format(
+                batch + 1, self.num_batches, rows, seconds, report['rows_per_second']))
+        if self.callback is not None:
+            self.callback(report)
+        return report
+
+    def add(self, other:'UploadProgress') -> 'UploadProgress':
+        """Folds another upload's progress (e.g. of one file chunk) into this one."""
+        with self._lock:
+            self.total_rows += other.total_rows
+            self.num_batches += other.num_batches
+            self.batches += other.batches
+            for c, n in other.counters.items():
+                self.counters[c] = self.counters.get(c, 0) + n
+            for p, t in other.timings.items():
+                self.timings[p] = self.timings.get(p, 0.0) + t
+            self.payload_bytes += other.payload_bytes
+        return self
+
+    def committed_batches(self) -> int:
+        return len(self.batches)
+
+    def rows(self) -> int:
+        return sum(b['rows'] for b in self.batches)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return (self.rows() / elapsed if elapsed > 0 else 0.0)
+
+    def metrics(self, operation:str=None) -> dict:
+        """Flat summary of the upload: rows, batches, elapsed seconds, phase
+        timings, payload bytes & write counters."""
+        metrics = {'operation': operation, 'rows': self.rows(), 'batches': self.committed_batches(),
+                   'seconds': self.elapsed(), 'payload_bytes': self.payload_bytes}
+        metrics.update({'{}_seconds'.format(p): t for p, t in self.timings.items()})
+        metrics.update(self.counters)
+        return metrics
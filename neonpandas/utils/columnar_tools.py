@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from neonpandas.utils import df_tools
+from neonpandas.series.label_series import LabelArray
+from neonpandas.frames.nodeframe import NodeFrame
+from neonpandas.frames.edgeframe import EdgeFrame
+
+#### Functions for transforming DataFrames into columnar payloads ####
+## A row-of-maps payload repeats every property key (and the label &
+## endpoint wrappers) in every row. A columnar payload sends each batch as
+## one map: parallel lists of values per property, the property keys once,
+## and vocabularies of label sets, id keys & relationship types referenced
+## by integer codes. The `queries.columnar_*` statements rebuild each row by
+## index on the server. Null cells are sent as null and dropped there.
+
+
+## Helpers -----
+def property_columns(df:pd.DataFrame, columns:list) -> dict:
+    """The property keys and a list of values per key (nulls as None)."""
+    return {'keys': list(columns),
+            'columns': [df_tools.column_list(df[c]) for c in columns]}
+
+def _vocabulary_codes(vocabulary:dict, values, codes:np.ndarray) -> list:
+    """Recodes `codes` into `values` as codes into the shared `vocabulary`
+    (value -> code, extended in place). Missing codes (-1) stay -1."""
+    lookup = np.array([vocabulary.setdefault(v, len(vocabulary)) for v in values] + [-1], dtype=np.int64)
+    return lookup[codes].tolist()
+
+
+## Columnar Conversion for NodeFrames -----
+def convert_nodes_to_columns(nf:NodeFrame, lbls_col:str='labels') -> dict:
+    """Converts a NodeFrame to a columnar payload: `labels` (distinct label
+    sets), `label_codes` (one per row) and the property `keys` & `columns`."""
+    codes, label_lists = LabelArray.coerce(nf[lbls_col]).set_codes()
+    payload = {'labels': label_lists, 'label_codes': codes.tolist()}
+    payload.update(property_columns(nf, [c for c in nf.columns if c != lbls_col]))
+    return payload
+
+
+## Columnar Conversion for EdgeFrames -----
+def convert_edges_to_columns(ef:EdgeFrame) -> dict:
+    """Converts an EdgeFrame to a columnar payload. Start & end nodes share
+    the `labels` (label sets) and `id_keys` vocabularies: each row has a
+    label set & id key code and an id value per endpoint, a `types` code
+    and the relationship property `keys` & `columns`."""
+    start, end = ef.node_arrays()
+    label_sets, id_keys = {}, {}
+    payload = {}
+    for prefix, nodes in (('start', start), ('end', end)):
+        payload[prefix + '_labels'] = _vocabulary_codes(label_sets, nodes.label_sets, nodes.label_codes)
+        payload[prefix + '_keys'] = _vocabulary_codes(id_keys, nodes.key_names, nodes.key_codes)
+        payload[prefix + '_ids'] = nodes.key_values.tolist()
+    type_codes, types = pd.factorize(ef[ef.rel_col])
+    payload.update({'labels': [sorted(s) for s in label_sets], 'id_keys': list(id_keys),
+                    'types': types.tolist(), 'type_codes': type_codes.tolist()})
+    non_property_columns = [ef.start_col, ef.end_col, ef.rel_col]
+    payload.update(property_columns(ef, [c for c in ef.columns if c not in non_property_columns]))
+    return payload
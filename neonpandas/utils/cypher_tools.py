@@ -1,18 +1,53 @@
+import re
+
 ## Utility functions for preparing data for Cypher queries.
 
-def format_labels(labels, sep:str=':', n:int=None) -> str:
+_identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+def escape_name(name:str) -> str:
+    """Backtick-quotes a label, relationship type or property key
+    if it is not a plain Cypher identifier."""
+    if _identifier.match(name):
+        return name
+    return '`{}`'.format(name.replace('`', '``'))
+
+def format_labels(labels, sep:str=':', n:int=None, escape:bool=False) -> str:
     """Formats node labels for neo4j MATCH statement."""
+    labels = ([escape_name(l) for l in labels] if escape and labels else labels)
     _lbls = sep.join((labels if not n else labels[:n]))
     if _lbls != '':
         return sep + _lbls 
     else:
         return _lbls
 
+def normalize_labels(labels) -> tuple:
+    """Returns labels as a sorted tuple, e.g. for use as a cache key."""
+    if not labels:
+        return ()
+    elif isinstance(labels, str):
+        return (labels,)
+    return tuple(sorted(labels))
+
+def quote_string(value:str) -> str:
+    """Quotes a string literal for display in a Cypher statement."""
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
+
 def format_properties(properties:dict, sep:str=', ') -> str:
+    """Formats property values inline. Only used for display; queries sent
+    to the database use `format_parameters` placeholders instead."""
     props = {}
     for k,v in properties.items():
         if isinstance(v, str):
-            props[k] = '"{}"'.format(v)
+            props[k] = quote_string(v)
         else:
             props[k] = v
-    return sep.join(['{}: {}'.format(k, v) for k,v in props.items()])
\ No newline at end of file
+    return sep.join(['{}: {}'.format(escape_name(k), v) for k,v in props.items()])
+
+def format_parameters(keys, prefix:str='p', sep:str=', ') -> str:
+    """Formats property keys with `$param` placeholders (e.g. `name: $p0`),
+    so the statement text does not depend on property values."""
+    return sep.join(['{}: ${}{}'.format(escape_name(k), prefix, i) for i, k in enumerate(keys)])
+
+def property_params(properties:dict, prefix:str='p') -> dict:
+    """Parameter values matching the placeholders from `format_parameters`."""
+    return {'{}{}'.format(prefix, i): v for i, v in enumerate(properties.values())}
\ No newline at end of file
@@ -1,25 +1,110 @@
-import pandas as pd 
-from neo4j.time import DateTime
+import datetime
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from neo4j.time import Date, DateTime, Duration
 from neonpandas.frames.nodeframe import NodeFrame
 
+## Temporal values are encoded column-wise: datetime64 & timedelta64 columns
+## are converted to native Python datetimes/timedeltas in one numpy cast,
+## which the neo4j driver sends as DateTime/LocalDateTime & Duration values.
+## Only values with sub-microsecond parts take a per-element path.
+
 def detect_datetimes(x) -> bool:
-    """Detects if a pandas series (i.e. dataframe column)
-    is of the Datetime dtype."""
-    return isinstance(x, pd.Timestamp)
+    """Detects if a pandas dtype (i.e. of a dataframe column)
+    is a datetime64 dtype, with or without timezone."""
+    return ptypes.is_datetime64_any_dtype(x)
 
 def get_datetime_cols(df:pd.DataFrame) -> list:
     """Returns list of columns in DataFrame of DataTime dtype."""
-    return [col for col,val in df.dtypes.iteritems() if detect_datetimes(val)]
+    return [col for col,val in df.dtypes.items() if detect_datetimes(val)]
+
+def get_temporal_cols(df:pd.DataFrame) -> list:
+    """Returns list of columns holding datetime64, timedelta64 or
+    daily period values, i.e. columns encoded by `encode_temporal`."""
+    return [col for col, val in df.dtypes.items() if is_temporal_dtype(val)]
+
+def is_temporal_dtype(dtype) -> bool:
+    return (ptypes.is_datetime64_any_dtype(dtype) or ptypes.is_timedelta64_dtype(dtype)
+            or _is_daily_period(dtype))
+
+def _is_daily_period(dtype) -> bool:
+    return (isinstance(dtype, pd.PeriodDtype) and dtype.freq.freqstr == 'D')
 
 def convert_to_neo_datetime(dt:pd.Timestamp) -> DateTime:
     """Converts pandas TimeStamp object to Neo4j DateTime Object."""
     return DateTime.from_iso_format(dt.isoformat())
 
 
+## Encoding (upload) -----
+def _neo_datetimes(s:pd.Series) -> np.ndarray:
+    """Nanosecond-precision neo4j DateTimes (per element)."""
+    values = np.full(len(s), None, dtype=object)
+    for i, ts in enumerate(s.tolist()):
+        if ts is not pd.NaT:
+            values[i] = DateTime(ts.year, ts.month, ts.day, ts.hour, ts.minute, ts.second,
+                                 ts.microsecond * 1000 + ts.nanosecond, tzinfo=ts.tzinfo)
+    return values
+
+def encode_temporal(col:pd.Series) -> np.ndarray:
+    """Encodes a temporal column as an object array of driver-native values
+    (None for missing values), or returns None for other columns.
+    datetime64 -> datetime (aware with a timezone), daily periods -> date,
+    timedelta64 -> timedelta."""
+    dtype = col.dtype
+    if ptypes.is_datetime64_any_dtype(dtype):
+        if (col.dt.nanosecond.fillna(0) != 0).any():
+            return _neo_datetimes(col)
+        values = col.array.to_pydatetime()
+        values[col.isna().to_numpy()] = None
+        return values
+    elif ptypes.is_timedelta64_dtype(dtype):
+        values = col.to_numpy()
+        if (col.dt.nanoseconds.fillna(0) != 0).any():
+            return np.array([(None if pd.isna(v) else Duration(nanoseconds=v.value)) for v in col], dtype=object)
+        return values.astype('timedelta64[us]').astype(object)
+    elif _is_daily_period(dtype):
+        return col.dt.start_time.to_numpy().astype('datetime64[D]').astype(object)
+    return None
+
+
+## Decoding (results) -----
+_TEMPORAL_TYPES = (Date, DateTime, Duration, datetime.date, datetime.timedelta)
+
+def decode_temporal(values) -> pd.Series:
+    """Decodes a column of neo4j temporal values (DateTime, Date, Duration)
+    into a datetime64 or timedelta64 Series. Returns None when the column
+    does not hold temporal values (or mixes them with other values)."""
+    first = next((v for v in values if v is not None), None)
+    if not isinstance(first, _TEMPORAL_TYPES):
+        return None
+    try:
+        if isinstance(first, (Duration, datetime.timedelta)):
+            return pd.Series(pd.to_timedelta([_native_duration(v) for v in values]))
+        natives = [_native_datetime(v) for v in values]
+        aware = any(getattr(v, 'tzinfo', None) is not None for v in natives)
+        return pd.Series(pd.to_datetime(natives, utc=aware))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def _native_datetime(v):
+    """Native value of a neo4j Date/DateTime; DateTimes keep their nanoseconds."""
+    if isinstance(v, DateTime) and v.nanosecond % 1000:
+        return pd.Timestamp(v.to_native()) + pd.Timedelta(nanoseconds=v.nanosecond % 1000)
+    return (v.to_native() if hasattr(v, 'to_native') else v)
+
+def _native_duration(v):
+    if v is None or isinstance(v, datetime.timedelta):
+        return v
+    if v.months != 0:
+        raise ValueError("Durations with months have no fixed length.")
+    return pd.Timedelta(days=v.days, seconds=v.seconds, nanoseconds=v.nanoseconds)
+
+
 def to_datetime(s:pd.Series, format:str = None) -> pd.Series:
     """Wrapper for pandas to_datetime method for converting
     and formatting datetime series. But additionally
-    converts series from pandas datetime format to 
+    converts series from pandas datetime format to
     Neo4j datetime format for importing."""
-    dt_series = pd.to_datetime(s, format)
-    return dt_series.apply(convert_to_neo_datetime)
\ No newline at end of file
+    dt_series = pd.to_datetime(s, format=format)
+    return pd.Series(encode_temporal(dt_series), index=s.index, name=s.name, dtype=object)
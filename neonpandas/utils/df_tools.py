@@ -1,14 +1,16 @@
 import neo4j
+import numpy as np
 import pandas as pd 
 from pandas import DataFrame, Series
 from neonpandas.utils import datetimes 
+from neonpandas.series.label_series import LabelArray
 
 def conform_to_list(x) -> list:
     if isinstance(x, list):
         return x
     elif isinstance(x, str):
         return [x]
-    elif isinstance(x, set):
+    elif isinstance(x, (set, frozenset)):
         return list(x)
     elif isinstance(x, tuple):
         return list(x)
@@ -36,12 +38,66 @@ def prepare_record(r:dict) -> dict:
         r['labels'] = conform_to_list(r.get('labels'))
     return r
 
-def convert_to_records(df:pd.DataFrame, convert_datetimes:bool=False) -> list:
+# placeholder for null cells while building records column-wise
+_MISSING = object()
+
+def column_values(col:Series, convert_datetimes:bool=True) -> tuple:
+    """Returns column values as a list of native Python objects, with
+    null cells (found via a vectorized mask) replaced by a sentinel,
+    and whether the column contained any nulls. With `convert_datetimes`,
+    temporal columns are encoded as values the driver sends as Neo4j
+    temporal types."""
+    temporal = (datetimes.encode_temporal(col) if convert_datetimes else None)
+    values = (col.tolist() if temporal is None else temporal.tolist())
+    nulls = np.flatnonzero(pd.isna(col).to_numpy())
+    for i in nulls:
+        values[i] = _MISSING
+    return values, len(nulls) > 0
+
+def column_list(col:Series, convert_datetimes:bool=True) -> list:
+    """Returns column values as a list of native Python objects, with
+    null cells as None (see `column_values`)."""
+    values, has_nulls = column_values(col, convert_datetimes)
+    if has_nulls:
+        values = [(None if v is _MISSING else v) for v in values]
+    return values
+
+def iter_records(df:pd.DataFrame, columns:list=None, convert_datetimes:bool=True):
+    """Lazily yields one dictionary per row for the given columns,
+    leaving out null values. Columns are processed as whole arrays,
+    so the per-row work is a single dict build."""
+    columns = (list(df.columns) if columns is None else list(columns))
+    if not columns:
+        return ({} for _ in range(len(df)))
+    values, nulls = zip(*[column_values(df[c], convert_datetimes) for c in columns])
+    if not any(nulls):
+        return (dict(zip(columns, row)) for row in zip(*values))
+    return ({k: v for k, v in zip(columns, row) if v is not _MISSING} for row in zip(*values))
+
+def label_lists(col:Series) -> list:
+    """Converts a labels column to lists, once per distinct label object
+    (label sets are often shared between rows). Null labels become []."""
+    if isinstance(col.array, LabelArray):
+        return col.array.to_lists()
+    lists = {}
+    values, _ = column_values(col)
+    for x in values:
+        if id(x) not in lists:
+            lists[id(x)] = (conform_to_list(x) if x is not _MISSING else [])
+    return [lists[id(x)] for x in values]
+
+def convert_to_records(df:pd.DataFrame, convert_datetimes:bool=True) -> list:
     """Convert a Pandas DataFrame to array of dictionaries
-    (using Pandas 'to_dicv(orient='records')` method). This
+    (equivalent to Pandas `to_dict(orient='records')`). This
     function also removes null/nan values from each 
-    dictionary upon conversion."""
-    return [prepare_record(r) for r in df.to_dict(orient='records')]
+    dictionary upon conversion, and (with `convert_datetimes`)
+    encodes temporal columns for Neo4j."""
+    records = list(iter_records(df, convert_datetimes=convert_datetimes))
+    if 'labels' in df.columns:
+        for r, lbls in zip(records, label_lists(df['labels'])):
+            if 'labels' in r:
+                r['labels'] = lbls
+    return records
     
 
 def anti_join(x:pd.DataFrame, y:pd.DataFrame, on:str) -> pd.DataFrame:
@@ -59,10 +115,100 @@ def prepare_node(node:neo4j.graph.Node) -> dict:
 
 
 def neo_nodes_to_df(neo_nodes) -> pd.DataFrame:
-    nodes = list(neo_nodes.graph().nodes)
+    """DataFrame of the nodes in a `Result`, or in a list of its records
+    (as returned by `Graph.run` & `Graph.read`)."""
+    if hasattr(neo_nodes, 'graph'):
+        nodes = list(neo_nodes.graph().nodes)
+    else:
+        nodes = list({n.element_id: n for record in neo_nodes for n in record.values()
+                      if isinstance(n, neo4j.graph.Node)}.values())
     return pd.DataFrame(prepare_node(n) for n in nodes)
 
 
+def _fill_column(rows:list, values:list, length:int):
+    """Column of `length` rows from values present at the given rows only.
+    Temporal values are decoded into datetime64/timedelta64 columns."""
+    if len(rows) == length:
+        col = values
+    else:
+        col = np.full(length, None, dtype=object)
+        for r, v in zip(rows, values):
+            col[r] = v
+    temporal = datetimes.decode_temporal(col)
+    if temporal is not None:
+        return temporal
+    return (col if len(rows) == length else pd.Series(col).infer_objects())
+
+def map_columns(maps, length:int=None) -> dict:
+    """Splits a sequence of dicts (e.g. `properties(r)` values of a query)
+    into columns. Each key is kept as parallel (row positions, values)
+    lists, so a row only costs one append per key it actually has."""
+    columns, length = {}, (0 if length is None else length)
+    for i, m in enumerate(maps):
+        if m:
+            for k, v in m.items():
+                col = columns.get(k)
+                if col is None:
+                    col = columns[k] = ([], [])
+                col[0].append(i)
+                col[1].append(v)
+        length = max(length, i + 1)
+    return {k: _fill_column(rows, values, length) for k, (rows, values) in columns.items()}
+
+
+class NodeColumns:
+    """Accumulates node records (labels, properties) straight into columns.
+    Each property is kept as parallel (row positions, values) lists, so a
+    row only costs one append per property it actually has."""
+    def __init__(self):
+        self.length = 0
+        self._labels = []
+        self._label_sets = {}
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, labels, properties:dict):
+        key = tuple(labels)
+        if key not in self._label_sets:
+            self._label_sets[key] = frozenset(key)
+        self._labels.append(self._label_sets[key])
+        for k, v in properties.items():
+            col = self._columns.get(k)
+            if col is None:
+                col = self._columns[k] = ([], [])
+            col[0].append(self.length)
+            col[1].append(v)
+        self.length += 1
+
+    def to_frame(self) -> pd.DataFrame:
+        data = {'labels': LabelArray.from_sets(self._labels)}
+        for k, (rows, values) in self._columns.items():
+            data[k] = _fill_column(rows, values, self.length)
+        return pd.DataFrame(data)
+
+def columns_to_frame(keys, columns, expand=()) -> pd.DataFrame:
+    """Builds a DataFrame from per-field value columns of a query result.
+    Map-valued fields listed in `expand` are split into one column per key."""
+    data = {}
+    for key, values in zip(keys, columns):
+        if key in expand:
+            data.update(map_columns(values, len(values)))
+        else:
+            temporal = datetimes.decode_temporal(values)
+            data[key] = (values if temporal is None else temporal)
+    return pd.DataFrame(data)
+
+def node_records_to_df(records, labels_field:str='labels', properties_field:str='properties') -> pd.DataFrame:
+    """Builds a DataFrame from records returning node labels and properties
+    (e.g. `RETURN labels(n) AS labels, properties(n) AS properties`)."""
+    columns = NodeColumns()
+    for record in records:
+        columns.append(record[labels_field], record[properties_field])
+    return columns.to_frame()
+
+
 def get_column_idx(df:pd.DataFrame, col_name:str) -> int:
     return df.columns.get_loc(col_name)
 
@@ -72,13 +218,12 @@ def merge_labels(df:DataFrame, column:str=None, labels:set=None) -> Series:
     NodeFrame object."""
     if column is not None and labels is None:
         assert column in df.columns
-        _lbls = df[column].apply(lambda x: conform_to_set(x))
+        _lbls = LabelArray.coerce(df[column])
     elif column is not None and labels is not None:
         assert column in df.columns
-        _lbls = df[column].apply(lambda x: conform_to_set(labels).union(conform_to_set(x)))
+        _lbls = LabelArray.coerce(df[column]).union(conform_to_set(labels))
     elif column is None and labels is not None:
-        labels = conform_to_set(labels)
-        _lbls = Series([labels for i in range(len(df))])
+        _lbls = LabelArray.from_labels(conform_to_set(labels), len(df))
     else:
         raise ValueError("Must provide either 'labels' or 'column' as input for attribute type.")
-    return _lbls
\ No newline at end of file
+    return Series(_lbls, index=df.index)
\ No newline at end of file
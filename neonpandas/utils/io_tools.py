@@ -0,0 +1,94 @@
+import os
+import pandas as pd
+
+#### Chunked readers for files too large to load in one piece ####
+
+FILE_FORMATS = ('csv', 'parquet')
+
+
+def infer_file_format(filepath:str) -> str:
+    """Infers 'csv' or 'parquet' from a file's extension (compressed
+    CSV files, e.g. `.csv.gz`, count as CSV)."""
+    name = os.path.basename(str(filepath)).lower()
+    if name.endswith(('.parquet', '.pq')):
+        return 'parquet'
+    elif '.csv' in name or name.endswith(('.txt', '.tsv')):
+        return 'csv'
+    raise ValueError("Cannot infer file format of '{}'. Pass one of {}.".format(filepath, FILE_FORMATS))
+
+def _kept_line(skip, n:int) -> int:
+    """Line number of the n-th (from 0) line not in the sorted `skip`."""
+    line = n
+    for s in skip:
+        if s > line:
+            break
+        line += 1
+    return line
+
+def _header_lines(header='infer', names=None) -> int:
+    """Number of header lines read before the data rows."""
+    if header is None or (header == 'infer' and names is not None):
+        return 0
+    elif header == 'infer':
+        return 1
+    return (max(header) if isinstance(header, (list, tuple)) else header) + 1
+
+def read_csv_chunks(filepath:str, chunksize:int=100000, start_chunk:int=0, **read_kwargs):
+    """Yields DataFrames of up to `chunksize` rows from a CSV file. Rows of
+    the first `start_chunk` chunks are skipped without building frames;
+    they are counted as lines after the caller's `skiprows` & the header,
+    so each row must fit on one line."""
+    if start_chunk > 0:
+        skip = read_kwargs.get('skiprows')
+        if callable(skip):
+            raise ValueError("'start_chunk' can't be combined with a callable 'skiprows'.")
+        skip = (range(skip) if isinstance(skip, int) else sorted(skip or ()))
+        header = _header_lines(read_kwargs.get('header', 'infer'), read_kwargs.get('names'))
+        first, end = _kept_line(skip, header), _kept_line(skip, header + start_chunk * chunksize)
+        skipped = (skip if isinstance(skip, range) else set(skip))
+        read_kwargs['skiprows'] = lambda i: i in skipped or first <= i < end
+    with pd.read_csv(filepath, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+def read_parquet_chunks(filepath:str, chunksize:int=100000, start_chunk:int=0, columns:list=None):
+    """Yields DataFrames of `chunksize` rows (the last may be shorter) from
+    a Parquet file, reading one row group at a time. Row groups before the
+    `start_chunk` chunk are not read. Requires pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet files in chunks requires pyarrow (pip install pyarrow).") from e
+    parquet = pq.ParquetFile(filepath)
+    start, offset, pending = start_chunk * chunksize, 0, None
+    for group in range(parquet.metadata.num_row_groups):
+        rows = parquet.metadata.row_group(group).num_rows
+        if offset + rows <= start:
+            offset += rows
+            continue
+        table = parquet.read_row_group(group, columns=columns)
+        if offset < start:
+            table = table.slice(start - offset)
+        offset += rows
+        pending = (table if pending is None else pa.concat_tables([pending, table]))
+        while pending.num_rows >= chunksize:
+            yield pending.slice(0, chunksize).to_pandas()
+            pending = pending.slice(chunksize)
+    if pending is not None and pending.num_rows > 0:
+        yield pending.to_pandas()
+
+def read_chunks(filepath:str, chunksize:int=100000, start_chunk:int=0,
+                file_format:str=None, **read_kwargs):
+    """Yields DataFrames of up to `chunksize` rows from a CSV or Parquet
+    file, so memory is bounded by the chunk size rather than the file size.
+    Extra keyword arguments go to the reader (`pd.read_csv`, or `columns`
+    for Parquet)."""
+    if chunksize is None or chunksize < 1:
+        raise ValueError("'chunksize' must be a positive integer.")
+    file_format = (infer_file_format(filepath) if file_format is None else file_format)
+    if file_format == 'csv':
+        return read_csv_chunks(filepath, chunksize, start_chunk, **read_kwargs)
+    elif file_format == 'parquet':
+        return read_parquet_chunks(filepath, chunksize, start_chunk, **read_kwargs)
+    raise ValueError("Unknown file format '{}'. Use one of {}.".format(file_format, FILE_FORMATS))
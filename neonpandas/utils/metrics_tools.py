@@ -0,0 +1,126 @@
+import datetime
+import threading
+import pandas as pd
+from neo4j.time import Date, DateTime, Duration, Time
+
+#### Instrumentation: payload sizes, server timings, metrics & query plans ####
+## A Graph built with `metrics=callable` calls it with one flat dict per
+## operation (query or upload). `MetricsLog` is a ready-made callable that
+## keeps the dicts and turns them into a DataFrame.
+
+_TEMPORAL_TYPES = (datetime.datetime, datetime.date, datetime.time, datetime.timedelta,
+                   Date, DateTime, Duration, Time)
+
+
+## Payload size -----
+def payload_size(value) -> int:
+    """Estimated size in bytes of a value encoded with PackStream (the Bolt
+    serialization), excluding message chunking."""
+    if value is None or isinstance(value, bool):
+        return 1
+    elif isinstance(value, int):
+        if -16 <= value < 128:
+            return 1
+        elif -128 <= value < 128:
+            return 2
+        elif -32768 <= value < 32768:
+            return 3
+        elif -2147483648 <= value < 2147483648:
+            return 5
+        return 9
+    elif isinstance(value, float):
+        return 9
+    elif isinstance(value, str):
+        size = len(value.encode('utf-8'))
+        return _header_size(size) + size
+    elif isinstance(value, (bytes, bytearray)):
+        return _header_size(len(value), tiny=False) + len(value)
+    elif isinstance(value, dict):
+        return _header_size(len(value)) + sum(payload_size(k) + payload_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return _header_size(len(value)) + sum(payload_size(v) for v in value)
+    elif isinstance(value, _TEMPORAL_TYPES):
+        # structure marker & signature plus up to four integer fields
+        return 2 + 4 * 5
+    return payload_size(str(value))
+
+def _header_size(size:int, tiny:bool=True) -> int:
+    if tiny and size < 16:
+        return 1
+    elif size < 256:
+        return 2
+    elif size < 65536:
+        return 3
+    return 5
+
+
+## Result summaries -----
+def server_seconds(summary) -> float:
+    """Time the server took to make the result available and stream it,
+    from a neo4j ResultSummary (0.0 when not reported)."""
+    available = getattr(summary, 'result_available_after', None) or 0
+    consumed = getattr(summary, 'result_consumed_after', None) or 0
+    return (available + consumed) / 1000
+
+def plan_operators(plan:dict, depth:int=0) -> list:
+    """Operators of a profiled plan (a ResultSummary's `profile`), depth first."""
+    if not plan:
+        return []
+    args = plan.get('args', {})
+    operators = [{'operator': plan.get('operatorType'), 'depth': depth,
+                  'rows': plan.get('rows', 0), 'db_hits': plan.get('dbHits', 0),
+                  'page_cache_hits': plan.get('pageCacheHits', 0),
+                  'identifiers': plan.get('identifiers', []), 'details': args.get('Details')}]
+    for child in plan.get('children', []):
+        operators += plan_operators(child, depth + 1)
+    return operators
+
+
+class QueryProfile:
+    """Profiled plan of a statement run with PROFILE (and rolled back)."""
+    def __init__(self, query:str, plan:dict, rows:int=0, counters:dict=None, server_seconds:float=0.0):
+        self.query = query
+        self.plan = plan
+        self.rows = rows
+        self.counters = (counters or {})
+        self.server_seconds = server_seconds
+
+    def __repr__(self):
+        return '<QueryProfile {} rows, {} db hits, {:.3f}s on server>'.format(
+            self.rows, self.db_hits(), self.server_seconds)
+
+    def db_hits(self) -> int:
+        """Total database hits over all operators."""
+        return sum(op['db_hits'] for op in plan_operators(self.plan))
+
+    def operators(self) -> pd.DataFrame:
+        """One row per plan operator, depth first."""
+        return pd.DataFrame(plan_operators(self.plan),
+                            columns=['operator', 'depth', 'rows', 'db_hits', 'page_cache_hits',
+                                     'identifiers', 'details'])
+
+
+class MetricsLog:
+    """Metrics callback keeping every operation's metrics (thread-safe).
+    Pass an instance as a Graph's `metrics`."""
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics:dict):
+        with self._lock:
+            self.records.append(metrics)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self):
+        return '<MetricsLog {} operations>'.format(len(self))
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per operation."""
+        return pd.DataFrame(list(self.records))
@@ -0,0 +1,47 @@
+import numpy as np
+from neonpandas.utils import df_tools
+from neonpandas.series.label_series import LabelArray
+from neonpandas.frames.nodeframe import NodeFrame
+from neonpandas.frames.edgeframe import EdgeFrame
+
+#### Functions for deriving the (label, key) pairs uploads merge or match on ####
+
+
+def node_index_pairs(nf:NodeFrame, key:str=None, lbls_col:str='labels') -> set:
+    """(label, key) pairs for every label in a NodeFrame, keyed on its id column."""
+    key = (getattr(nf, 'id_col', None) if key is None else key)
+    if key is None or lbls_col not in nf or len(nf) == 0:
+        return set()
+    counts = LabelArray.coerce(nf[lbls_col]).label_counts()
+    return {(lbl, key) for lbl in counts[counts > 0].index}
+
+def edge_index_pairs(ef:EdgeFrame) -> set:
+    """(label, key) pairs for every label on the start & end nodes of an
+    EdgeFrame, keyed on each node's identifying key (`start_id`/`end_id`)."""
+    pairs = set()
+    for nodes in ef.node_arrays():
+        codes = set(zip(nodes.label_codes.tolist(), nodes.key_codes.tolist()))
+        for code, key_code in codes:
+            if code >= 0:
+                pairs.update((lbl, nodes.key_names[key_code]) for lbl in nodes.label_sets[code])
+    return pairs
+
+def constraint_pairs(constrs, labels:str='labels', prop_name:str='property') -> set:
+    """(label, key) pairs from a frame of constraints, one row per key."""
+    pairs = set()
+    for c in df_tools.convert_to_records(constrs):
+        for lbl in df_tools.conform_to_list(c.get(labels)):
+            pairs.add((lbl, c.get(prop_name)))
+    return pairs
+
+def label_sets(frame, lbls_col:str='labels') -> set:
+    """Distinct label sets (frozensets) of the nodes a NodeFrame or
+    EdgeFrame writes: its rows, or the start & end nodes of its edges."""
+    if isinstance(frame, EdgeFrame):
+        sets = set()
+        for nodes in frame.node_arrays():
+            sets.update(nodes.label_sets[c] for c in np.unique(nodes.label_codes) if c >= 0)
+        return sets
+    if lbls_col not in frame:
+        return set()
+    return {frozenset(lbls) for lbls in LabelArray.coerce(frame[lbls_col]).set_codes()[1]}
@@ -0,0 +1,75 @@
+import pandas as pd
+from neonpandas.utils import df_tools
+from neonpandas.series.label_series import LabelArray
+from neonpandas.frames.nodeframe import NodeFrame
+from neonpandas.frames.edgeframe import EdgeFrame
+
+#### Functions for transforming DataFrames into static cypher format ####
+## Rows are grouped so that every group shares the labels (and relationship
+## type) written into its query; the payload only carries property values.
+
+
+## Static Conversion for NodeFrames -----
+def group_nodes(nf:NodeFrame, lbls_col:str='labels') -> list:
+    """Splits a NodeFrame into (label tuple, NodeFrame) groups of nodes
+    sharing the same label set. NodeFrames reuse their label index."""
+    if isinstance(nf, NodeFrame):
+        return nf.label_groups(lbls_col)
+    return [(lbls, nf.iloc[pos]) for lbls, pos in LabelArray.coerce(nf[lbls_col]).group_indices()]
+
+def convert_nodes_to_cypher(nf:NodeFrame, lbls_col:str='labels') -> list:
+    """Converts a NodeFrame (of a single label group) to an array of
+    property dicts for the static node creation query."""
+    return df_tools.convert_to_records(nf.drop(columns=[lbls_col]))
+
+## Static Conversion for EdgeFrames -----
+def group_edges(ef:EdgeFrame) -> list:
+    """Splits an EdgeFrame into groups of edges sharing start labels, start key,
+    relationship type, end labels & end key. Returns (group key, EdgeFrame)
+    pairs where the group key is a tuple in that order."""
+    start, end = ef.node_arrays()
+    codes = pd.DataFrame({'start': start.label_codes, 'start_key': start.key_codes, 'rel': ef[ef.rel_col].to_numpy(),
+                          'end': end.label_codes, 'end_key': end.key_codes})
+    groups = []
+    for (s, sk, rel, e, ek), pos in codes.groupby(list(codes.columns), sort=False, dropna=False).indices.items():
+        group = (tuple(sorted(start.label_sets[s])), start.key_names[sk], rel,
+                 tuple(sorted(end.label_sets[e])), end.key_names[ek])
+        groups.append((group, ef.iloc[pos]))
+    return groups
+
+def convert_edges_to_cypher(ef:EdgeFrame) -> list:
+    """Converts an EdgeFrame (of a single group) to an array of dicts
+    holding endpoint key values and relationship properties."""
+    non_property_columns = [ef.start_col, ef.end_col, ef.rel_col]
+    properties = df_tools.iter_records(ef, [c for c in ef.columns if c not in non_property_columns])
+    start, end = ef.node_arrays()
+    return [
+        {'start_id': s, 'end_id': e, 'properties': props}
+        for s, e, props in zip(start.key_values.tolist(), end.key_values.tolist(), properties)
+    ]
+
+def convert_edge_keys_to_cypher(ef:EdgeFrame) -> list:
+    """Converts an EdgeFrame (of a single group) to an array of dicts
+    holding only endpoint key values, for the static delete query."""
+    start, end = ef.node_arrays()
+    return [{'start_id': s, 'end_id': e} for s, e in zip(start.key_values.tolist(), end.key_values.tolist())]
+
+## Distinct endpoint nodes of EdgeFrames -----
+def group_endpoints(ef:EdgeFrame) -> list:
+    """Splits the unique start & end nodes of an EdgeFrame into
+    ((label tuple, key), DataFrame) groups, each frame holding a single
+    column of key values."""
+    nodes = ef.to_nodeframe()
+    keys = [c for c in nodes.columns if c != 'labels']
+    groups = []
+    for lbls, pos in LabelArray.coerce(nodes['labels']).group_indices():
+        group = nodes.iloc[pos]
+        for key in keys:
+            values = group.loc[group[key].notna(), [key]]
+            if len(values) > 0:
+                groups.append(((lbls, key), values))
+    return groups
+
+def convert_endpoints_to_cypher(nodes:pd.DataFrame) -> list:
+    """Converts a single-column frame of key values to a list of values."""
+    return nodes.iloc[:, 0].tolist()
@@ -0,0 +1,144 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from neonpandas.series.label_series import LabelArray, LabelDtype
+from neonpandas.series.node_series import NodeArray, NodeDtype
+from neonpandas.frames.nodeframe import NodeFrame
+from neonpandas.frames.edgeframe import EdgeFrame
+
+#### Functions for incremental syncs: per-row hashes & a local manifest ####
+## Each row gets an identity hash (what it is: labels + key value, or the
+## endpoints + type of an edge) and a content hash (all of its values).
+## Comparing both against the hashes of the last successful sync tells
+## which rows were inserted, changed or removed.
+
+# separator of label names in canonical label strings
+LABEL_SEP = ':'
+
+
+## Hashing -----
+def canonical_labels(col) -> np.ndarray:
+    """Label sets as sorted, joined strings (independent of set order)."""
+    return np.array([LABEL_SEP.join(lbls) for lbls in LabelArray.coerce(col).to_lists()], dtype=object)
+
+def canonical_nodes(col) -> DataFrame:
+    """Node references as (sorted labels, key, value) columns."""
+    nodes = NodeArray.coerce(col)
+    lookup = np.array([LABEL_SEP.join(sorted(s)) for s in nodes.label_sets] + [''], dtype=object)
+    return DataFrame({'labels': lookup[nodes.label_codes], 'key': nodes.row_keys(), 'value': nodes.key_values})
+
+def _canonical_frame(df:DataFrame) -> DataFrame:
+    columns = {}
+    for c in sorted(df.columns, key=str):
+        if isinstance(df[c].dtype, LabelDtype):
+            columns[c] = canonical_labels(df[c])
+        elif isinstance(df[c].dtype, NodeDtype):
+            for part, values in canonical_nodes(df[c]).items():
+                columns['{}.{}'.format(c, part)] = values.to_numpy()
+        else:
+            columns[c] = df[c].to_numpy()
+    return DataFrame(columns)
+
+def row_hashes(df:DataFrame, columns:list=None) -> np.ndarray:
+    """Vectorized 64-bit content hash per row over the given columns (all by
+    default, in name order). Returned as int64 so hashes fit in SQLite."""
+    df = (df if columns is None else df[list(columns)])
+    frame = _canonical_frame(df)
+    if len(frame.columns) == 0:
+        return np.zeros(len(df), dtype=np.int64)
+    hashes = pd.util.hash_pandas_object(frame, index=False, categorize=False).to_numpy()
+    return hashes.view(np.int64)
+
+def node_identities(nf:NodeFrame, key:str, lbls_col:str='labels') -> DataFrame:
+    """Identity columns (labels, key, value) of each node in a NodeFrame."""
+    return DataFrame({'labels': canonical_labels(nf[lbls_col]), 'key': key,
+                      'value': nf[key].to_numpy(dtype=object)})
+
+def edge_identities(ef:EdgeFrame) -> DataFrame:
+    """Identity columns of each edge in an EdgeFrame: start node, type, end node."""
+    start, end = [canonical_nodes(nodes) for nodes in ef.node_arrays()]
+    return DataFrame({'start_labels': start['labels'].to_numpy(), 'start_key': start['key'].to_numpy(),
+                      'start_value': start['value'].to_numpy(), 'rel': ef[ef.rel_col].to_numpy(dtype=object),
+                      'end_labels': end['labels'].to_numpy(), 'end_key': end['key'].to_numpy(),
+                      'end_value': end['value'].to_numpy()})
+
+def split_labels(labels:str) -> tuple:
+    """Label tuple of a canonical label string."""
+    return (tuple(labels.split(LABEL_SEP)) if labels else ())
+
+
+## Change detection -----
+class SyncDiff:
+    """Rows inserted, changed & removed since the last sync. `inserted` and
+    `changed` are boolean masks over the current rows; `removed` holds the
+    manifest rows (`id`, `hash` & identity columns) no longer present."""
+    def __init__(self, inserted:np.ndarray, changed:np.ndarray, removed:DataFrame):
+        self.inserted = inserted
+        self.changed = changed
+        self.removed = removed
+
+    def __repr__(self):
+        return '<SyncDiff {} inserted, {} changed, {} unchanged, {} removed>'.format(
+            self.inserted.sum(), self.changed.sum(), self.unchanged().sum(), len(self.removed))
+
+    def upserts(self) -> np.ndarray:
+        return self.inserted | self.changed
+
+    def unchanged(self) -> np.ndarray:
+        return ~self.upserts()
+
+def diff_hashes(ids:np.ndarray, hashes:np.ndarray, previous:DataFrame) -> SyncDiff:
+    """Compares identity & content hashes of current rows against a manifest
+    frame (with `id` and `hash` columns)."""
+    positions = pd.Index(previous['id'].to_numpy()).get_indexer(ids)
+    inserted = positions < 0
+    changed = np.zeros(len(ids), dtype=bool)
+    if len(previous) > 0:
+        previous_hashes = previous['hash'].to_numpy(dtype=np.int64)
+        changed = ~inserted & (previous_hashes[np.maximum(positions, 0)] != hashes)
+    removed = previous.loc[~np.isin(previous['id'].to_numpy(), ids)]
+    return SyncDiff(inserted, changed, removed.reset_index(drop=True))
+
+
+## Manifest -----
+class SyncManifest:
+    """Identity & content hashes of the last successful sync, kept in a
+    table of a SQLite file. Identity columns are stored untyped, so key
+    values round-trip with their original (int, float or str) type."""
+    def __init__(self, path:str, table:str='nodes'):
+        self.path = path
+        self.table = table
+
+    def __repr__(self):
+        return "<SyncManifest '{}' table '{}'>".format(self.path, self.table)
+
+    def _table(self) -> str:
+        return '"{}"'.format(self.table.replace('"', '""'))
+
+    def load(self) -> DataFrame:
+        """Rows of the last sync, with `id`, `hash` & identity columns."""
+        conn = sqlite3.connect(self.path)
+        try:
+            exists = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                                  (self.table,)).fetchone()
+            if exists is None:
+                return DataFrame({'id': np.array([], dtype=np.int64), 'hash': np.array([], dtype=np.int64)})
+            return pd.read_sql_query('SELECT * FROM {}'.format(self._table()), conn)
+        finally:
+            conn.close()
+
+    def save(self, ids:np.ndarray, hashes:np.ndarray, identities:DataFrame):
+        """Replaces the manifest with the given rows in a single transaction."""
+        columns = list(identities.columns)
+        rows = zip(ids.tolist(), hashes.tolist(), *[identities[c].tolist() for c in columns])
+        quoted = ', '.join('"{}"'.format(c) for c in columns)
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.execute('DROP TABLE IF EXISTS {}'.format(self._table()))
+                conn.execute('CREATE TABLE {} (id INTEGER PRIMARY KEY, hash INTEGER, {})'.format(self._table(), quoted))
+                conn.executemany('INSERT INTO {} VALUES ({})'.format(self._table(), ', '.join(['?'] * (len(columns) + 2))),
+                                 rows)
+        finally:
+            conn.close()
@@ -7,7 +7,7 @@ setup(name="neonpandas",
       author="CL Dixon",
       author_email="cl_dixon@icloud.com",
       description="A Pandas-Centric Interface to Neo4j",
-      packages=find_packages(exclude=['test']),
+      packages=find_packages(exclude=['test', 'tests', 'tests.*', 'benchmarks']),
       long_description=open('README.md').read(),
       zip_safe=False
 )
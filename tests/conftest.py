@@ -0,0 +1,39 @@
+import os
+import pandas as pd
+import pytest
+import neonpandas as npd
+from benchmarks.fake_driver import FakeDriver
+
+## Shared fixtures: the bundled pets sample and a Graph on the in-process
+## fake driver (see `benchmarks.fake_driver`), so no database is needed. -----
+
+DATASETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasets')
+
+
+def fake_graph(driver:FakeDriver=None, **kwargs) -> npd.Graph:
+    graph = npd.Graph('bolt://localhost:7687', None, driver=(driver or FakeDriver(keep_params=True)), **kwargs)
+    # no index lookups unless a test asks for them
+    graph._indexed = set()
+    graph._constrained = set()
+    return graph
+
+
+@pytest.fixture
+def pets() -> npd.NodeFrame:
+    """Pets labelled with their species and `Pet`, keyed on name."""
+    return npd.NodeFrame(pd.read_csv(os.path.join(DATASETS, 'pets.csv')),
+                         id_col='name', lbl_col='species', labels={'Pet'})
+
+@pytest.fixture
+def pet_edges() -> npd.EdgeFrame:
+    """Relationships between pets, whose endpoints are matched as `Pet`."""
+    return npd.EdgeFrame(pd.read_csv(os.path.join(DATASETS, 'edges.csv')), rel_col='rel_type',
+                         start_col='src', end_col='dest', start_id='name', end_id='name', labels={'Pet'})
+
+@pytest.fixture
+def driver() -> FakeDriver:
+    return FakeDriver(keep_params=True)
+
+@pytest.fixture
+def graph(driver) -> npd.Graph:
+    return fake_graph(driver)
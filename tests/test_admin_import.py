@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+import neonpandas as npd
+from neonpandas.utils import admin_tools
+
+
+def people_and_pets() -> npd.NodeFrame:
+    """A Dog and a Person sharing the name "Max"."""
+    return npd.NodeFrame(pd.DataFrame({'name': ['Max', 'Max', 'Ann'], 'kind': ['Dog', 'Person', 'Person']}),
+                         id_col='name', lbl_col='kind')
+
+
+def test_endpoint_id_spaces_resolve_to_node_files(tmp_path, pets, pet_edges):
+    files = pets.to_admin_import(str(tmp_path)) + pet_edges.to_admin_import(str(tmp_path))
+    assert files.id_spaces() == {'Pet'}
+    assert files.endpoint_spaces() <= files.id_spaces()
+    files.check()
+
+def test_endpoint_nodes_share_id_space(tmp_path, pet_edges):
+    files = pet_edges.to_admin_import(str(tmp_path), include_nodes=True)
+    assert files.endpoint_spaces() == files.id_spaces()
+    files.check()
+
+def test_configured_id_space(tmp_path, pets, pet_edges):
+    files = (pets.to_admin_import(str(tmp_path), space='Pet')
+             + pet_edges.to_admin_import(str(tmp_path), space='Pet'))
+    assert files.id_spaces() == files.endpoint_spaces() == {'Pet'}
+
+def test_check_reports_unresolved_endpoints(tmp_path, pets, pet_edges):
+    files = pets.to_admin_import(str(tmp_path), space='Animal') + pet_edges.to_admin_import(str(tmp_path))
+    try:
+        files.check()
+    except ValueError as e:
+        assert 'Pet' in str(e)
+    else:
+        raise AssertionError("check() accepted an unresolved ID space")
+
+def test_node_header_fields(tmp_path, pets):
+    files = pets.to_admin_import(str(tmp_path))
+    header = open(files.nodes[0][0]).readline().strip().split(',')
+    assert header[0] == 'name:ID(Pet)'
+    assert header[-1] == ':LABEL'
+    assert admin_tools.header_id_spaces(files.nodes[0][0]) == {'Pet'}
+
+def test_labels_without_common_label_get_own_spaces(tmp_path):
+    files = people_and_pets().to_admin_import(str(tmp_path))
+    assert files.id_spaces() == {'Dog', 'Person'}
+    files.check()
+
+def test_check_rejects_duplicate_ids(tmp_path):
+    files = people_and_pets().to_admin_import(str(tmp_path), space='Node')
+    with pytest.raises(ValueError, match=r'Node\(Max\)'):
+        files.check()
+
+def test_edges_between_labels_resolve(tmp_path):
+    ef = npd.EdgeFrame(pd.DataFrame({'src': ['Ann'], 'dest': ['Max'], 'rel': ['OWNS'],
+                                     'src_kind': ['Person'], 'dest_kind': ['Dog']}),
+                       rel_col='rel', start_col='src', end_col='dest', start_id='name', end_id='name',
+                       start_lbl_col='src_kind', end_lbl_col='dest_kind')
+    files = people_and_pets().to_admin_import(str(tmp_path)) + ef.to_admin_import(str(tmp_path))
+    header = open(files.relationships[0][0]).readline().strip().split(',')
+    assert header[:2] == [':START_ID(Person)', ':END_ID(Dog)']
+    files.check()
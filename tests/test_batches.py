@@ -0,0 +1,26 @@
+import pytest
+pytest.importorskip('benchmarks.fake_driver')  # the offline driver ships with the benchmark suite
+from benchmarks.fake_driver import FakeDriver
+from neonpandas.utils import batch_tools
+from tests.conftest import fake_graph
+
+## Chunked, transaction-per-batch uploads -----
+
+def test_nodes_are_sent_in_batches(driver, graph, pets):
+    progress = graph.create_nodes(pets, batch_size=2, create_indexes=False)
+    assert [s.rows for s in driver.statements] == [2, 2, 1]
+    assert progress.rows() == len(pets)
+
+def test_start_batch_skips_committed_batches(driver, graph, pets):
+    graph.create_nodes(pets, batch_size=2, start_batch=1, create_indexes=False)
+    assert [s.rows for s in driver.statements] == [2, 1]
+
+def test_failed_batch_reports_resume_point(pets):
+    def respond(query, params):
+        if 'Bubbles' in str(params):
+            raise RuntimeError('boom')
+    graph = fake_graph(FakeDriver(respond=respond))
+    with pytest.raises(batch_tools.BatchUploadError) as info:
+        graph.create_nodes(pets, batch_size=2, create_indexes=False)
+    assert info.value.batch == 1
+    assert 'start_batch=1' in str(info.value)
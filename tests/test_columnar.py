@@ -0,0 +1,24 @@
+from benchmarks.generators import make_nodeframe
+from neonpandas.utils import columnar_tools
+
+## Columnar upload payloads -----
+
+def test_node_payload_has_one_column_per_property(pets):
+    payload = columnar_tools.convert_nodes_to_columns(pets)
+    assert payload['keys'] == [c for c in pets.columns if c != 'labels']
+    assert all(len(col) == len(pets) for col in payload['columns'])
+    assert [payload['labels'][c] for c in payload['label_codes']] == [sorted(s) for s in pets['labels']]
+
+def test_edge_payload_shares_vocabularies(pet_edges):
+    payload = columnar_tools.convert_edges_to_columns(pet_edges)
+    assert payload['labels'] == [['Pet']]
+    assert payload['id_keys'] == ['name']
+    assert [payload['types'][c] for c in payload['type_codes']] == pet_edges['rel_type'].tolist()
+
+def test_columnar_engine_sends_a_statement_per_batch(driver, graph, pets):
+    graph.create_nodes(pets, batch_size=2, engine='columnar', create_indexes=False)
+    assert [len(s.params['nodes']['label_codes']) for s in driver.statements] == [2, 2, 1]
+
+def test_columnar_payload_is_smaller(graph):
+    sizes = graph.payload_sizes(make_nodeframe(1000))
+    assert sizes['payload_bytes'].iloc[1] < sizes['payload_bytes'].iloc[0]
@@ -0,0 +1,70 @@
+import datetime
+import pytest
+import pandas as pd
+from neo4j.time import DateTime, Duration
+from neonpandas.utils import datetimes
+
+## Temporal columns: encoding for upload & decoding of results -----
+
+def round_trip(s:pd.Series) -> pd.Series:
+    return datetimes.decode_temporal(list(datetimes.encode_temporal(s)))
+
+
+def test_naive_datetimes_round_trip():
+    s = pd.Series(pd.to_datetime(['2024-01-02 03:04:05.123456', None]))
+    values = datetimes.encode_temporal(s)
+    assert values.tolist() == [datetime.datetime(2024, 1, 2, 3, 4, 5, 123456), None]
+    decoded = round_trip(s)
+    assert decoded.dt.tz is None
+    assert decoded.tolist()[0] == s[0] and pd.isna(decoded[1])
+
+def test_aware_datetimes_round_trip_as_utc():
+    s = pd.Series(pd.to_datetime(['2024-01-02 03:04:05', None])).dt.tz_localize('Europe/Berlin')
+    values = datetimes.encode_temporal(s)
+    assert values[0].tzinfo is not None and values[1] is None
+    decoded = round_trip(s)
+    assert str(decoded.dt.tz) == 'UTC'
+    assert decoded[0] == s[0] and pd.isna(decoded[1])
+
+@pytest.mark.parametrize('tz', [None, 'UTC'])
+def test_nanosecond_datetimes_use_neo4j_datetime(tz):
+    s = pd.Series(pd.to_datetime(['2024-01-02 03:04:05.123456789', None]))
+    if tz is not None:
+        s = s.dt.tz_localize(tz)
+    values = datetimes.encode_temporal(s)
+    assert isinstance(values[0], DateTime) and values[0].nanosecond == 123456789
+    assert values[1] is None
+    assert round_trip(s)[0] == s[0]
+
+def test_timedeltas_round_trip():
+    s = pd.Series(pd.to_timedelta(['1 day 02:00:00.5', None]))
+    assert datetimes.encode_temporal(s).tolist() == [datetime.timedelta(days=1, hours=2, milliseconds=500), None]
+    decoded = round_trip(s)
+    assert decoded[0] == s[0] and pd.isna(decoded[1])
+
+def test_nanosecond_timedeltas_use_neo4j_duration():
+    s = pd.Series(pd.to_timedelta(['1 day 00:00:00.000000001', None]))
+    values = datetimes.encode_temporal(s)
+    assert values[0] == Duration(seconds=86400, nanoseconds=1) and values[1] is None
+    assert round_trip(s)[0] == s[0]
+
+def test_daily_periods_encode_as_dates():
+    s = pd.Series(pd.PeriodIndex(['2024-01-01', None], freq='D'))
+    assert datetimes.encode_temporal(s).tolist() == [datetime.date(2024, 1, 1), None]
+    decoded = round_trip(s)
+    assert decoded[0] == pd.Timestamp('2024-01-01') and pd.isna(decoded[1])
+
+def test_other_columns_are_not_encoded():
+    assert datetimes.encode_temporal(pd.Series([1, 2])) is None
+    assert datetimes.encode_temporal(pd.Series(pd.period_range('2024-01', periods=2, freq='M'))) is None
+    assert datetimes.decode_temporal([None, 'Bella']) is None
+
+def test_durations_with_months_are_not_decoded():
+    with pytest.raises(ValueError):
+        datetimes._native_duration(Duration(months=1))
+    assert datetimes.decode_temporal([Duration(months=1, days=2)]) is None
+
+def test_to_datetime_returns_native_datetimes():
+    s = datetimes.to_datetime(pd.Series(['2024-01-01', None], index=[3, 4], name='born'))
+    assert s.dtype == object and s.name == 'born' and s.index.tolist() == [3, 4]
+    assert s.tolist() == [datetime.datetime(2024, 1, 1), None]
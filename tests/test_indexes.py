@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+import pandas as pd
+import neonpandas as npd
+from benchmarks.fake_driver import FakeDriver, AsyncFakeDriver
+from tests.conftest import fake_graph
+
+## Index & uniqueness constraint bookkeeping -----
+
+def index(label:str, key:str, constraint:str=None) -> dict:
+    return {'name': 'index_{}_{}'.format(label, key), 'type': 'RANGE', 'entityType': 'NODE',
+            'labelsOrTypes': [label], 'properties': [key], 'state': 'ONLINE', 'owningConstraint': constraint}
+
+def schema_driver(*records) -> FakeDriver:
+    return FakeDriver(respond=lambda q, p: list(records) if q.strip().startswith('SHOW INDEXES') else None)
+
+def constraints_frame(*pairs) -> pd.DataFrame:
+    return pd.DataFrame({'labels': [lbl for lbl, _ in pairs], 'property': [key for _, key in pairs]})
+
+def created(driver:FakeDriver) -> list:
+    return [s.query for s in driver.statements if s.query.lstrip().startswith('CREATE')]
+
+
+def test_index_pairs_track_constraints():
+    graph = fake_graph(schema_driver(index('Pet', 'name'), index('Person', 'id', 'person_id')))
+    assert graph.indexes(refresh=True) == {('Pet', 'name'), ('Person', 'id')}
+    assert graph.constraints() == {('Person', 'id')}
+
+def test_existing_constraint_is_skipped():
+    driver = schema_driver(index('Person', 'id', 'person_id'))
+    graph = fake_graph(driver)
+    graph.indexes(refresh=True)
+    assert graph.create_node_constraints(constraints_frame(('Person', 'id'))) == set()
+    assert created(driver) == []
+
+def test_plain_index_does_not_satisfy_unique():
+    driver = schema_driver(index('Pet', 'name'))
+    graph = fake_graph(driver)
+    graph.indexes(refresh=True)
+    with pytest.raises(RuntimeError, match=r':Pet\(name\)'):
+        graph.create_node_constraints(constraints_frame(('Pet', 'name')))
+    assert created(driver) == []
+    # a plain index is still enough when uniqueness isn't asked for
+    assert graph.ensure_indexes({('Pet', 'name')}) == set()
+
+def test_constraint_created_when_missing():
+    driver = schema_driver()
+    graph = fake_graph(driver)
+    graph.indexes(refresh=True)
+    assert graph.create_node_constraints(constraints_frame(('Pet', 'name'))) == {('Pet', 'name')}
+    assert len(created(driver)) == 1 and 'IS UNIQUE' in created(driver)[0]
+    assert graph.constraints() == {('Pet', 'name')}
+
+def test_async_plain_index_does_not_satisfy_unique():
+    graph = npd.AsyncGraph('bolt://localhost:7687', None, driver=AsyncFakeDriver(schema_driver(index('Pet', 'name'))))
+    with pytest.raises(RuntimeError, match=r':Pet\(name\)'):
+        asyncio.run(graph.ensure_indexes({('Pet', 'name')}, unique=True))
+    assert asyncio.run(graph.ensure_indexes({('Pet', 'name')})) == set()
@@ -0,0 +1,23 @@
+import pytest
+pytest.importorskip('benchmarks.fake_driver')  # the offline driver ships with the benchmark suite
+from benchmarks.fake_driver import FakeDriver
+from tests.conftest import fake_graph
+
+## Key-only joins against the graph -----
+
+def existing(*names):
+    """respond returning the sent keys found among `names`."""
+    return lambda query, params: [{'key': k} for k in params.get('keys', []) if k in names]
+
+
+def test_semi_and_anti_join(pets):
+    graph = fake_graph(FakeDriver(respond=existing('Ralph', 'Pip')))
+    assert sorted(graph.semi_join(pets, on='name', labels={'Pet'})['name']) == ['Pip', 'Ralph']
+    assert 'Ralph' not in graph.anti_join(pets, on='name', labels={'Pet'})['name'].tolist()
+
+def test_only_distinct_keys_are_sent(pets):
+    driver = FakeDriver(respond=existing('Ralph'), keep_params=True)
+    graph = fake_graph(driver)
+    keys = list(pets['name']) * 3 + [None]
+    assert graph.existing_keys(keys, on='name', batch_size=2) == ['Ralph']
+    assert [len(s.params['keys']) for s in driver.statements] == [2, 2, 1]
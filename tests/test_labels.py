@@ -0,0 +1,77 @@
+import pandas as pd
+import neonpandas as npd
+from neonpandas.frames import styling
+from neonpandas.series.label_series import LabelArray, LabelSeries
+
+## Label set columns -----
+
+def labels() -> pd.Series:
+    return LabelSeries([{'Pet', 'Dog'}, {'Pet'}, {'Dog', 'Pet'}, None])
+
+
+def test_unique_label_sets():
+    uniques = labels().unique()
+    assert isinstance(uniques, LabelArray)
+    assert list(uniques) == [{'Pet', 'Dog'}, {'Pet'}, set()]
+
+def test_nunique_and_value_counts():
+    s = labels()
+    assert s.nunique() == 3
+    counts = s.value_counts()
+    assert counts.iloc[0] == 2 and counts.sum() == 4
+
+def test_unique_beyond_uint_masks():
+    s = LabelSeries([{'L{}'.format(i)} for i in range(70)] + [{'L1'}])
+    assert s.nunique() == 70
+    assert s.value_counts().iloc[0] == 2
+
+def test_drop_duplicates_and_groupby():
+    df = pd.DataFrame({'labels': labels(), 'x': [1, 2, 3, 4]})
+    assert len(df.drop_duplicates('labels')) == 3
+    sums = df.groupby('labels')['x'].sum()
+    assert sorted(sums.tolist()) == [2, 4, 4]
+
+
+## NodeFrame label index & colors -----
+
+def test_label_index_rebuilds_after_at_assignment(pets):
+    assert pets.by_label('Cat')['name'].tolist() == ['Pip']
+    pets.at[0, 'labels'] = {'Pet', 'Cat'}
+    assert pets.by_label('Cat')['name'].tolist() == ['Ralph', 'Pip']
+    assert pets.label_counts()[['Dog', 'Cat']].tolist() == [0, 2]
+
+def test_label_index_rebuilds_after_inplace_drop(pets):
+    assert pets.label_counts()['Pet'] == 5
+    pets.drop(index=1, inplace=True)
+    assert pets.label_counts()[['Pet', 'Cat']].tolist() == [4, 0]
+    assert 'Pip' not in pets.by_label('Pet')['name'].tolist()
+
+def test_label_index_rebuilds_after_inplace_sort(pets):
+    pets.label_groups()
+    pets.sort_values('name', inplace=True)
+    assert pets.by_label('Pet')['name'].tolist() == sorted(pets['name'])
+    assert [frame['name'].tolist() for _, frame in pets.label_groups()] == [[n] for n in sorted(pets['name'])]
+
+def test_label_colors_are_stable(pets):
+    colors = pets.label_colors()
+    assert pets.label_colors() is colors
+    assert npd.NodeFrame(pets.iloc[::-1]).label_colors() == colors
+    pets.at[0, 'labels'] = {'Pet', 'Cat'}
+    assert pets.label_colors() is not colors
+
+def test_edgeframe_colors_shared_by_node_columns():
+    ef = npd.EdgeFrame(pd.DataFrame({'rel': ['OWNS', 'OWNS'], 'src': ['Jenny', 'Frank'], 'dest': ['Ralph', 'Max']}),
+                       rel_col='rel', start_col='src', end_col='dest', start_id='name', end_id='name',
+                       start_lbls={'Person'}, end_lbls={'Dog'})
+    colors = ef.label_colors()
+    assert ef.label_colors() == colors and set(colors) == {'Dog', 'Person'}
+    start = styling.color_edgeframe_nodes(ef['src'], color_map=colors)
+    end = styling.color_edgeframe_nodes(ef['dest'], color_map=colors)
+    assert all(colors['Person'] in css for css in start)
+    assert all(colors['Dog'] in css for css in end)
+    assert colors['Person'] != colors['Dog']
+
+def test_ready_for_upload_needs_label_sets(pets):
+    assert pets.ready_for_upload()
+    assert not pets.assign(labels=[{'Pet'}] * len(pets)).ready_for_upload()
+    assert not npd.NodeFrame(pets.drop(columns=['labels'])).ready_for_upload()
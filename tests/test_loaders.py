@@ -0,0 +1,60 @@
+import pytest
+pytest.importorskip('benchmarks.fake_driver')  # the offline driver ships with the benchmark suite
+import os
+from neonpandas.utils import io_tools
+from tests.conftest import DATASETS
+
+## Streaming loaders -----
+
+def test_load_nodes_in_chunks(driver, graph):
+    progress = graph.load_nodes(os.path.join(DATASETS, 'pets.csv'), chunksize=2, create_indexes=False,
+                                frame_kwargs={'id_col': 'name', 'lbl_col': 'species', 'labels': {'Pet'}})
+    assert [s.rows for s in driver.statements] == [2, 2, 1]
+    assert progress.rows() == 5
+
+def test_load_nodes_resumes_from_chunk(driver, graph):
+    graph.load_nodes(os.path.join(DATASETS, 'pets.csv'), chunksize=2, start_chunk=2, create_indexes=False,
+                     frame_kwargs={'id_col': 'name', 'lbl_col': 'species', 'labels': {'Pet'}})
+    assert [s.rows for s in driver.statements] == [1]
+
+## Chunked readers -----
+
+def chunk_rows(chunks) -> list:
+    return [chunk.values.tolist() for chunk in chunks]
+
+def test_csv_resume_without_header(tmp_path):
+    path = tmp_path / 'values.csv'
+    path.write_text('a\n4\n5\n6\n7\n8\n')
+    assert chunk_rows(io_tools.read_chunks(str(path), 2, start_chunk=1, header=None)) == [[[5], [6]], [[7], [8]]]
+
+def test_csv_resume_keeps_caller_skiprows(tmp_path):
+    path = tmp_path / 'values.csv'
+    path.write_text('a,b\n1,2\n3,4\n5,6\n7,8\n9,10\n')
+    assert chunk_rows(io_tools.read_chunks(str(path), 2, start_chunk=1, skiprows=[2])) == [[[7, 8], [9, 10]]]
+    assert chunk_rows(io_tools.read_chunks(str(path), 2, start_chunk=1, skiprows=1, header=None)) == \
+        [[[5, 6], [7, 8]], [[9, 10]]]
+
+def test_csv_resume_rejects_callable_skiprows(tmp_path):
+    path = tmp_path / 'values.csv'
+    path.write_text('a\n1\n2\n')
+    with pytest.raises(ValueError):
+        list(io_tools.read_chunks(str(path), 1, start_chunk=1, skiprows=lambda i: False))
+
+def test_parquet_chunks_across_row_groups(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    pa = pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'values.parquet')
+    pq.write_table(pa.table({'a': list(range(10))}), path, row_group_size=3)
+    assert [c['a'].tolist() for c in io_tools.read_chunks(path, 4)] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert [c['a'].tolist() for c in io_tools.read_chunks(path, 4, start_chunk=1)] == [[4, 5, 6, 7], [8, 9]]
+
+def test_parquet_resume_skips_row_groups(tmp_path, monkeypatch):
+    pq = pytest.importorskip('pyarrow.parquet')
+    pa = pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'values.parquet')
+    pq.write_table(pa.table({'a': list(range(10))}), path, row_group_size=3)
+    read, read_row_group = [], pq.ParquetFile.read_row_group
+    monkeypatch.setattr(pq.ParquetFile, 'read_row_group',
+                        lambda self, i, **kwargs: read.append(i) or read_row_group(self, i, **kwargs))
+    assert [c['a'].tolist() for c in io_tools.read_chunks(path, 3, start_chunk=2)] == [[6, 7, 8], [9]]
+    assert read == [2, 3]
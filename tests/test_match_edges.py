@@ -0,0 +1,30 @@
+from neo4j import Record
+import neonpandas as npd
+from benchmarks.fake_driver import FakeDriver
+from tests.conftest import fake_graph
+
+## Relationship matching -----
+
+def edge_record(**properties) -> Record:
+    return Record(dict(start_labels=['Pet'], start_id='Bella', rel_type='LIKES',
+                       end_labels=['Pet'], end_id='Max', **properties))
+
+
+def test_match_edges_returns_edges():
+    graph = fake_graph(FakeDriver(respond=lambda q, p: [edge_record(since=2020)]))
+    ef = graph.match_edges(rel_type='LIKES', start_key='name', end_key='name', rel_properties=['since'])
+    assert isinstance(ef, npd.EdgeFrame)
+    assert list(ef.columns) == ['rel_type', 'start', 'end', 'since']
+    assert ef['rel_type'].tolist() == ['LIKES']
+
+def test_match_edges_without_matches_is_empty():
+    graph = fake_graph(FakeDriver())
+    ef = graph.match_edges(rel_type='LIKES', start_key='name', end_key='name')
+    assert isinstance(ef, npd.EdgeFrame)
+    assert len(ef) == 0
+    assert list(ef.columns) == ['rel_type', 'start', 'end']
+
+def test_match_edges_without_matches_keeps_rel_properties():
+    ef = fake_graph(FakeDriver()).match_edges(rel_type='LIKES', rel_properties=['since'])
+    assert len(ef) == 0
+    assert list(ef.columns) == ['rel_type', 'start', 'end', 'since']
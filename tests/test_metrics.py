@@ -0,0 +1,70 @@
+from neo4j import Record
+from benchmarks.fake_driver import FakeDriver, FakeTransaction
+from neonpandas.utils import batch_tools
+from neonpandas.utils import metrics_tools
+from tests.conftest import fake_graph
+
+## Instrumentation: metrics callback, payload sizes & profiling -----
+
+class TrackedTransactions(FakeDriver):
+    """Records how each explicit transaction ended ('commit', 'rollback', 'close')."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.endings = []
+
+    def session(self, **config):
+        session = super().session(**config)
+        driver = self
+        class Tracked(FakeTransaction):
+            def commit(self):
+                driver.endings.append('commit')
+            def rollback(self):
+                driver.endings.append('rollback')
+            def close(self):
+                driver.endings.append('close')
+        session.begin_transaction = lambda **config: Tracked(self)
+        return session
+
+
+def test_upload_metrics_keys_and_counters(pets):
+    log = metrics_tools.MetricsLog()
+    fake_graph(metrics=log).create_nodes(pets, batch_size=2, create_indexes=False)
+    assert len(log) == 1
+    metrics = log.records[0]
+    expected = ({'operation', 'rows', 'batches', 'seconds', 'payload_bytes'}
+                | {'{}_seconds'.format(p) for p in batch_tools.PHASES} | set(batch_tools.COUNTERS))
+    assert set(metrics) == expected
+    assert metrics['operation'] == 'create_nodes'
+    assert (metrics['rows'], metrics['batches'], metrics['nodes_created']) == (len(pets), 3, len(pets))
+    assert metrics['payload_bytes'] == 0
+
+def test_query_metrics():
+    log = metrics_tools.MetricsLog()
+    graph = fake_graph(FakeDriver(respond=lambda q, p: [Record({'n': 1}), Record({'n': 2})],
+                                  counters=lambda q, rows: {}), metrics=log)
+    graph.read('MATCH (n) RETURN n')
+    frame = log.to_frame()
+    assert frame[['operation', 'query', 'rows']].values.tolist() == [['read', 'MATCH (n) RETURN n', 2]]
+    assert {'seconds', 'server_seconds', *batch_tools.COUNTERS} <= set(frame.columns)
+    assert frame['nodes_created'].tolist() == [0]
+
+def test_measured_payload_matches_sent_params(pets, driver):
+    log = metrics_tools.MetricsLog()
+    fake_graph(driver, metrics=log, measure_payload=True).create_nodes(pets, batch_size=2, create_indexes=False)
+    sent = sum(metrics_tools.payload_size(s.params) for s in driver.statements)
+    assert log.records[0]['payload_bytes'] == sent > 0
+
+def test_payload_size_encoding():
+    assert [metrics_tools.payload_size(v) for v in (None, True, 1, 200, 70000, 1.5)] == [1, 1, 1, 3, 5, 9]
+    assert metrics_tools.payload_size('Bella') == 6
+    assert metrics_tools.payload_size({'name': 'Max'}) == 1 + 5 + 4
+    assert metrics_tools.payload_size(list(range(16))) == 2 + 16
+
+def test_profile_upload_is_rolled_back(pets):
+    driver = TrackedTransactions(keep_params=True)
+    profile = fake_graph(driver).profile_upload(pets, batch_size=2, batch=1)
+    assert driver.query_count == 1 and driver.statements[0].query.startswith('PROFILE ')
+    # closing an open transaction rolls it back
+    assert driver.endings == ['close']
+    assert profile.rows == 2
+    assert profile.operators()['operator'].tolist() == ['ProduceResults']
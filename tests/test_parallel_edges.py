@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from benchmarks.fake_driver import FakeDriver
+from benchmarks.generators import make_edgeframe
+from neonpandas.utils import batch_tools
+from tests.conftest import fake_graph
+
+## Concurrent edge uploads: node-disjoint lanes of coalesced statements -----
+
+@pytest.fixture(scope='module')
+def edges():
+    return make_edgeframe(10000)
+
+def statements(ef, **kwargs) -> int:
+    driver = FakeDriver()
+    fake_graph(driver).create_edges(ef, create_indexes=False, **kwargs)
+    assert driver.row_count >= len(ef)
+    return driver.query_count
+
+
+def test_edge_slots_are_node_disjoint(edges):
+    start, end = edges.node_arrays()
+    slots = batch_tools.edge_slots(edges, 4)
+    assert slots.max() < 2 * 4 * 4
+    nodes = [{(s, e) for s, e in zip(start.key_values[slots == slot], end.key_values[slots == slot])}
+             for slot in range(2 * 4 * 4)]
+    for r in range(2 * 4):
+        lanes = [{n for pair in nodes[r * 4 + lane] for n in pair} for lane in range(4)]
+        for a in range(4):
+            for b in range(a + 1, 4):
+                assert not lanes[a] & lanes[b]
+
+def test_rounds_have_at_most_one_lane_per_worker(edges):
+    rounds, total = fake_graph(FakeDriver())._edge_rounds(edges, 4, batch_size=500)
+    assert all(len(lanes) <= 4 for lanes in rounds)
+    rows = sum(r for lanes in rounds for lane in lanes for _, _, _, r in lane)
+    assert rows == len(edges)
+    assert total <= 4 * np.ceil(len(edges) / 500)
+
+@pytest.mark.parametrize('kwargs', [{'engine': 'cypher'}, {'engine': 'cypher', 'two_phase': True}])
+def test_parallel_static_edges_send_no_more_statements(edges, kwargs):
+    assert statements(edges, workers=4, **kwargs) <= 4 * statements(edges, **kwargs)
+
+def test_parallel_apoc_edges_fill_batches(edges):
+    assert statements(edges, workers=4, engine='apoc', batch_size=500) <= 2 * statements(edges, engine='apoc', batch_size=500)
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import neonpandas as npd
+from neonpandas.utils import batch_tools
+from benchmarks.fake_driver import FakeDriver, AsyncFakeDriver
+from tests.conftest import fake_graph
+
+## A failed batch in one lane must not lead to duplicates on resume:
+## batches other lanes committed are reported and skipped. -----
+
+
+class FlakyWrites:
+    """Fake driver `respond` failing the first write of the batch holding
+    `fail_id` (after a delay, so the other lanes commit later batches
+    meanwhile), and recording the ids of every other committed write."""
+    def __init__(self, fail_id:int):
+        self.fail_id = fail_id
+        self.failed = False
+        self.created = []
+        self._lock = threading.Lock()
+
+    def __call__(self, query, params):
+        ids = [n['properties']['id'] for n in params.get('nodes', [])]
+        if self.fail_id in ids and not self.failed:
+            self.failed = True
+            time.sleep(0.05)
+            raise RuntimeError('connection reset')
+        with self._lock:
+            self.created += ids
+
+
+def nodes(n:int=200) -> npd.NodeFrame:
+    return npd.NodeFrame(pd.DataFrame({'id': np.arange(n)}), id_col='id', labels={'Thing'})
+
+
+def test_parallel_failure_reports_committed_batches():
+    writes = FlakyWrites(fail_id=10)
+    graph = fake_graph(FakeDriver(respond=writes))
+    nf = nodes()
+    with pytest.raises(batch_tools.BatchUploadError) as info:
+        graph.create_nodes(nf, batch_size=10, workers=4, create_indexes=False)
+    error = info.value
+    assert error.failed == 1
+    committed = set(np.array(writes.created) // 10)
+    assert error.batch == min(set(range(20)) - committed)
+    assert error.skip and set(error.skip) == {b for b in committed if b > error.batch}
+
+    graph.create_nodes(nf, batch_size=10, workers=4, create_indexes=False,
+                       start_batch=error.batch, skip_batches=error.skip)
+    assert sorted(writes.created) == list(range(len(nf)))
+
+def test_serial_failure_has_nothing_to_skip():
+    writes = FlakyWrites(fail_id=10)
+    graph = fake_graph(FakeDriver(respond=writes))
+    with pytest.raises(batch_tools.BatchUploadError) as info:
+        graph.create_nodes(nodes(), batch_size=10, create_indexes=False)
+    assert (info.value.batch, info.value.skip) == (1, [])
+    assert 'start_batch=1.' in str(info.value)
+
+def test_async_failure_reports_committed_batches():
+    writes = FlakyWrites(fail_id=10)
+    nf = nodes()
+
+    async def upload(**kwargs):
+        graph = npd.AsyncGraph('bolt://localhost:7687', None, concurrency=4,
+                               driver=AsyncFakeDriver(FakeDriver(respond=writes)))
+        graph._indexed = set()
+        graph._constrained = set()
+        return await graph.create_nodes(nf, batch_size=10, create_indexes=False, **kwargs)
+
+    with pytest.raises(batch_tools.BatchUploadError) as info:
+        asyncio.run(upload())
+    error = info.value
+    assert error.skip
+    asyncio.run(upload(start_batch=error.batch, skip_batches=error.skip))
+    assert sorted(writes.created) == list(range(len(nf)))
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+import neonpandas as npd
+from neo4j import Record
+from neo4j.exceptions import TransientError
+from neo4j.graph import Graph as Neo4jGraph, Node
+from benchmarks.fake_driver import FakeDriver, AsyncFakeDriver
+from neonpandas.utils import df_tools
+from tests.conftest import fake_graph
+
+## Read paths: managed read transactions & retries -----
+
+class ReadCalls(FakeDriver):
+    """Counts managed read transactions opened on its sessions."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+
+    def session(self, **config):
+        session = super().session(**config)
+        execute_read = session.execute_read
+        def counted(work, *args, **kwargs):
+            self.reads += 1
+            return execute_read(work, *args, **kwargs)
+        session.execute_read = counted
+        return session
+
+class AsyncReadCalls(AsyncFakeDriver):
+    """Counts managed read transactions opened on its async sessions."""
+    reads = 0
+
+    def session(self, **config):
+        session = super().session(**config)
+        execute_read = session.execute_read
+        async def counted(work, *args, **kwargs):
+            self.reads += 1
+            return await execute_read(work, *args, **kwargs)
+        session.execute_read = counted
+        return session
+
+def failing_once(records:list):
+    """respond raising a TransientError on the first statement only."""
+    calls = []
+    def respond(query, params):
+        calls.append(query)
+        if len(calls) == 1:
+            raise TransientError('deadlock')
+        return records
+    return respond
+
+
+def test_query_frame_uses_read_transaction():
+    driver = ReadCalls(respond=lambda q, p: [Record({'name': 'Bella', 'age': 3})])
+    df = fake_graph(driver).query_frame('MATCH (n) RETURN n.name AS name, n.age AS age')
+    assert driver.reads == 1
+    assert df.to_dict('records') == [{'name': 'Bella', 'age': 3}]
+
+def test_query_frame_retries_transient_errors():
+    driver = FakeDriver(respond=failing_once([Record({'name': 'Bella'})]))
+    df = fake_graph(driver).query_frame('MATCH (n) RETURN n.name AS name')
+    assert df['name'].tolist() == ['Bella']
+
+def test_iter_nodes_retries_before_first_chunk():
+    records = [{'labels': ['Pet'], 'properties': {'name': n}} for n in ('Bella', 'Max')]
+    driver = FakeDriver(respond=failing_once(records))
+    chunks = list(fake_graph(driver).iter_nodes({'Pet'}, chunk_size=1))
+    assert [c['name'].tolist() for c in chunks] == [['Bella'], ['Max']]
+
+def test_iter_nodes_raises_after_max_retries():
+    def respond(query, params):
+        raise TransientError('deadlock')
+    graph = fake_graph(FakeDriver(respond=respond), max_retries=1)
+    with pytest.raises(TransientError):
+        list(graph.iter_nodes({'Pet'}))
+
+def test_async_match_nodes_retries_in_read_transaction():
+    records = [{'labels': ['Pet'], 'properties': {'name': n}} for n in ('Bella', 'Max')]
+    driver = AsyncReadCalls(FakeDriver(respond=failing_once(records)))
+    graph = npd.AsyncGraph('bolt://localhost:7687', None, driver=driver)
+    frame = asyncio.run(graph.match_nodes({'Pet'}))
+    assert frame['name'].tolist() == ['Bella', 'Max']
+    assert driver.reads == 2
+
+def test_async_existing_keys_retry_in_read_transaction():
+    driver = AsyncReadCalls(FakeDriver(respond=failing_once([Record({'key': 'Ralph'})])))
+    graph = npd.AsyncGraph('bolt://localhost:7687', None, driver=driver)
+    assert asyncio.run(graph.existing_keys(['Ralph', 'Max'], on='name')) == ['Ralph']
+    assert driver.reads == 2
+
+def test_neo_nodes_to_df_accepts_records():
+    graph = Neo4jGraph()
+    bella = Node(graph, '4:x:1', 1, {'Pet', 'Dog'}, {'name': 'Bella'})
+    max_ = Node(graph, '4:x:2', 2, {'Pet'}, {'name': 'Max'})
+    records = [Record({'n': bella, 'm': max_}), Record({'n': bella, 'm': max_})]
+    df = df_tools.neo_nodes_to_df(records)
+    assert sorted(df['name']) == ['Bella', 'Max']
+    assert set(df.loc[df['name'] == 'Bella', 'labels'].iloc[0]) == {'Pet', 'Dog'}
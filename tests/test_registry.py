@@ -0,0 +1,32 @@
+import pandas as pd
+from neonpandas.graph.node import Node
+from neonpandas.series.node_series import NodeRegistry
+
+## Interned node identities -----
+
+def test_registry_dedups_endpoints(pet_edges):
+    registry = NodeRegistry()
+    start, end = pet_edges.node_arrays()
+    start_ids, end_ids = registry.register(start), registry.register(end)
+    names = set(start.key_values) | set(end.key_values)
+    assert len(registry) == len(names)
+    assert (registry.ids(start) == start_ids).all()
+    assert (registry.ids(end) == end_ids).all()
+
+def test_nodes_are_interned(pet_edges):
+    registry = NodeRegistry()
+    ids = registry.register(pet_edges.node_arrays()[0])
+    assert registry.node(ids[0]) is registry.node(ids[0])
+    assert registry.find(Node({'Pet'}, 'name', registry.node(ids[0]).value)) is registry.node(ids[0])
+    assert registry.find(Node({'Pet'}, 'name', 'Nobody')) is None
+
+def test_factorize_all_missing_nodes(pet_edges):
+    src = pet_edges.reindex([len(pet_edges), len(pet_edges) + 1])[pet_edges.start_col]
+    codes, uniques = pd.factorize(src)
+    assert codes.tolist() == [-1, -1] and len(uniques) == 0
+    assert src.to_frame().assign(x=1).groupby(pet_edges.start_col)['x'].sum().empty
+
+def test_factorize_with_missing_nodes(pet_edges):
+    src = pet_edges.reindex([0, len(pet_edges), 0])[pet_edges.start_col]
+    codes, uniques = pd.factorize(src)
+    assert codes.tolist() == [0, -1, 0] and len(uniques) == 1
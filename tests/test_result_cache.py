@@ -0,0 +1,80 @@
+import time
+import pytest
+import neonpandas as npd
+from benchmarks.fake_driver import FakeDriver
+from neonpandas.series.label_series import LabelArray
+from tests.conftest import fake_graph
+
+## `Graph.match_nodes` result cache: hits, bounds and invalidation by the
+## Graph's own writes. -----
+
+
+def dogs(query, params):
+    if query.startswith('MATCH (n'):
+        return [{'labels': ['Dog', 'Pet'], 'properties': {'name': 'Ralph'}}]
+
+@pytest.fixture
+def cached():
+    driver = FakeDriver(respond=dogs)
+    return fake_graph(driver, result_cache=npd.ResultCache()), driver
+
+
+def test_repeated_match_is_a_hit(cached):
+    graph, driver = cached
+    graph.match_nodes({'Dog'})
+    frame = graph.match_nodes(['Dog'])
+    assert isinstance(frame, npd.NodeFrame) and len(frame) == 1
+    assert driver.query_count == 1
+    assert graph.result_cache.stats()['hits'] == 1
+
+def test_cached_frames_are_copies(cached):
+    graph, _ = cached
+    frame = graph.match_nodes({'Dog'})
+    frame['name'] = 'Changed'
+    assert graph.match_nodes({'Dog'})['name'].tolist() == ['Ralph']
+
+@pytest.mark.parametrize('write', ['delete_nodes', 'update_nodes', 'upsert_nodes'])
+def test_writes_to_existing_nodes_clear_other_labels(cached, pets, write):
+    graph, driver = cached
+    graph.match_nodes({'Dog'})
+    # a Pet frame without the Dog label still touches (:Pet:Dog) nodes
+    getattr(graph, write)(pets.assign(labels=LabelArray.from_sets([{'Pet'}] * len(pets))), create_indexes=False)
+    graph.match_nodes({'Dog'})
+    assert graph.result_cache.stats()['hits'] == 0
+    assert graph.result_cache.stats()['invalidations'] == 1
+
+def test_sync_nodes_clears_cache(cached, pets, tmp_path):
+    graph, _ = cached
+    graph.match_nodes({'Dog'})
+    graph.sync_nodes(pets.assign(labels=LabelArray.from_sets([{'Pet'}] * len(pets))), str(tmp_path / 'manifest.db'),
+                     create_indexes=False)
+    assert len(graph.result_cache) == 0
+
+def test_create_nodes_invalidates_matching_subsets_only(cached, pets):
+    graph, _ = cached
+    for labels in ({'Dog'}, {'Cat', 'Pet'}, set(), {'Robot'}):
+        graph.match_nodes(labels)
+    graph.create_nodes(pets.loc[pets['name'] == 'Ralph'], create_indexes=False)
+    assert [key[1] for key in graph.result_cache._entries] == [('Cat', 'Pet'), ('Robot',)]
+
+def test_new_constraint_invalidates_its_label(cached):
+    graph, _ = cached
+    graph.match_nodes({'Dog'})
+    graph.match_nodes({'Cat'})
+    graph.ensure_indexes({('Dog', 'name')}, unique=True, wait=False)
+    assert [key[1] for key in graph.result_cache._entries] == [('Cat',)]
+
+def test_size_and_ttl_bounds():
+    cache = npd.ResultCache(maxsize=2, ttl=0.05)
+    graph = fake_graph(FakeDriver(respond=dogs), result_cache=cache)
+    for labels in ('A', 'B', 'C'):
+        graph.match_nodes({labels})
+    assert cache.stats()['evictions'] == 1 and len(cache) == 2
+    time.sleep(0.06)
+    graph.match_nodes({'C'})
+    assert cache.stats()['expirations'] == 1
+
+def test_results_read_before_a_write_are_not_stored():
+    cache = npd.ResultCache()
+    frame = cache.get('match_nodes', {'Dog'}, build=lambda: (cache.invalidate(), npd.NodeFrame({'x': [1]}))[1])
+    assert len(frame) == 1 and len(cache) == 0
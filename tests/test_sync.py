@@ -0,0 +1,46 @@
+from benchmarks.fake_driver import FakeDriver
+from neonpandas.utils import sync_tools
+from tests.conftest import fake_graph
+
+## Incremental syncs & the manifest -----
+
+def deletes(driver:FakeDriver) -> list:
+    return [v for s in driver.statements if 'DELETE' in s.query for v in s.params['nodes']]
+
+
+def test_removed_nodes_are_kept_until_deleted(pets, tmp_path):
+    manifest = str(tmp_path / 'manifest.db')
+    driver = FakeDriver(keep_params=True)
+    graph = fake_graph(driver)
+    graph.sync_nodes(pets, manifest)
+    removed = pets['name'].iloc[0]
+
+    report = graph.sync_nodes(pets.iloc[1:], manifest).report
+    assert report['removed'] == 1 and report['deleted'] == 0
+    assert deletes(driver) == []
+    assert removed in sync_tools.SyncManifest(manifest).load()['value'].tolist()
+
+    driver.reset()
+    report = graph.sync_nodes(pets.iloc[1:], manifest, delete=True).report
+    assert report['deleted'] == 1
+    assert deletes(driver) == [removed]
+    assert removed not in sync_tools.SyncManifest(manifest).load()['value'].tolist()
+
+def test_removed_node_coming_back_is_unchanged(pets, tmp_path):
+    manifest = str(tmp_path / 'manifest.db')
+    graph = fake_graph()
+    graph.sync_nodes(pets, manifest)
+    graph.sync_nodes(pets.iloc[1:], manifest)
+    report = graph.sync_nodes(pets, manifest).report
+    assert report['inserted'] == 0 and report['changed'] == 0 and report['removed'] == 0
+
+def test_removed_edges_are_kept_until_deleted(pet_edges, tmp_path):
+    manifest = str(tmp_path / 'manifest.db')
+    driver = FakeDriver(keep_params=True)
+    graph = fake_graph(driver)
+    graph.sync_edges(pet_edges, manifest)
+    graph.sync_edges(pet_edges.iloc[1:], manifest)
+    driver.reset()
+    report = graph.sync_edges(pet_edges.iloc[1:], manifest, delete=True).report
+    assert report['inserted'] == 0 and report['deleted'] == 1
+    assert sum(s.rows for s in driver.statements if 'DELETE' in s.query) == 1
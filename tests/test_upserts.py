@@ -0,0 +1,19 @@
+from tests.conftest import fake_graph
+
+## Keyed upserts & deletes -----
+
+def test_upsert_merges_per_label_group(driver, graph, pets):
+    graph.upsert_nodes(pets, create_indexes=False)
+    assert len(driver.statements) == len(set(map(frozenset, pets['labels'])))
+    assert all('MERGE' in s.query for s in driver.statements)
+    assert sum(s.rows for s in driver.statements) == len(pets)
+
+def test_delete_sends_only_keys(driver, graph, pets):
+    graph.delete_nodes(pets, create_indexes=False)
+    sent = [v for s in driver.statements for v in s.params['nodes']]
+    assert sorted(sent) == sorted(pets['name'])
+
+def test_upsert_indexes_the_key(driver, pets):
+    graph = fake_graph(driver)
+    graph.upsert_nodes(pets)
+    assert ('Pet', 'name') in graph.indexes()